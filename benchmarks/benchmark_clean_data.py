@@ -0,0 +1,48 @@
+"""
+Benchmark: row-wise NaN filling in `clean_data`.
+
+Compares the previous row-by-row implementation, 
+`data.apply(lambda row: row.fillna(row.mean()), axis=1)`, with the 
+vectorized path now used by `clean_data(..., fill_with="mean", apply_to="rows")`
+across frame sizes, and checks that both give the same result.
+
+Run from the repository root after `pip install -e .`:
+    python benchmarks/benchmark_clean_data.py
+"""
+
+import time
+import numpy as np
+import pandas as pd
+from vistool.wrangle import _fill_rows
+
+
+def make_frame(n_rows: int, n_cols: int = 10, missing: float = 0.2) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    values = rng.normal(50, 10, (n_rows, n_cols))
+    values[rng.random(values.shape) < missing] = np.nan
+    return pd.DataFrame(values, columns=[f"c{i}" for i in range(n_cols)])
+
+
+def time_call(func, *args) -> tuple:
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def row_by_row(data: pd.DataFrame) -> pd.DataFrame:
+    return data.apply(lambda row: row.fillna(row.mean()), axis=1)
+
+
+if __name__ == "__main__":
+    print(f"{'rows':>10} {'row-by-row (s)':>16} {'vectorized (s)':>16} {'speed-up':>10}")
+    for n_rows in [1_000, 10_000, 100_000]:
+        data = make_frame(n_rows)
+        expected, slow = time_call(row_by_row, data)
+        result, fast = time_call(_fill_rows, data.copy(deep=False), "mean")
+        pd.testing.assert_frame_equal(result, expected)
+        print(f"{n_rows:>10} {slow:>16.3f} {fast:>16.4f} {slow / fast:>9.0f}x")
+
+    # The row-by-row version is too slow to run at this size
+    data = make_frame(5_000_000)
+    _, fast = time_call(_fill_rows, data.copy(deep=False), "mean")
+    print(f"{5_000_000:>10} {'-':>16} {fast:>16.4f}")
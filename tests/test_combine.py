@@ -1,5 +1,9 @@
+import warnings
+import pytest
+import numpy as np
 import pandas as pd
-from vistool.combine import merge_datasets, concat_datasets
+from vistool.combine import merge_datasets, concat_datasets, concat_files, merge_many, JoinIndex
+
 
 def test_merge_datasets():
     data1 = pd.DataFrame({"id": [1, 2, 3], "value1": [10, 20, 30]})
@@ -8,9 +12,113 @@ def test_merge_datasets():
     assert len(merged) == 2  # Only rows with matching `id` values should remain
     assert "value2" in merged.columns
 
+
 def test_concat_datasets():
     data1 = pd.DataFrame({"A": [1, 2]})
     data2 = pd.DataFrame({"B": [3, 4]})
     concatenated = concat_datasets([data1, data2], axis=1)
     assert concatenated.shape == (2, 2)  # 2 rows, 2 columns
-    assert "B" in concatenated.columns
\ No newline at end of file
+    assert "B" in concatenated.columns
+
+
+def test_merge_datasets_with_join_index():
+    dimension = pd.DataFrame({"id": ["b", "a", "c", None], "name": ["B", "A", "C", "missing"]})
+    index = JoinIndex(dimension, "id")
+    for facts in [
+        pd.DataFrame({"id": ["a", "a", "z", None, "c"], "value": [1, 2, 3, 4, 5]}),
+        pd.DataFrame({"id": ["c", "b"], "name": ["x", "y"]}),
+    ]:
+        for how in ["inner", "left"]:
+            expected = pd.merge(facts, dimension, on="id", how=how)
+            pd.testing.assert_frame_equal(merge_datasets(facts, index, "id", how), expected)
+
+    with pytest.raises(ValueError):
+        merge_datasets(facts, index, "name")
+
+
+def test_merge_datasets_warns_on_many_to_many():
+    data1 = pd.DataFrame({"id": [1, 1, 2], "value1": [10, 20, 30]})
+    data2 = pd.DataFrame({"id": [1, 1, 1, 3], "value2": [40, 50, 60, 70]})
+    with pytest.warns(UserWarning, match="6 rows"):
+        merged = merge_datasets(data1, data2, on="id")
+    assert len(merged) == 6
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        merge_datasets(data1, data2.drop_duplicates("id"), on="id")
+
+
+def test_merge_many_orders_joins_and_prunes_columns():
+    rng = np.random.default_rng(0)
+    orders = pd.DataFrame({"cid": rng.integers(0, 1_000, 20_000), "amount": rng.random(20_000), "note": "x"})
+    customers = pd.DataFrame({"cid": np.arange(1_000), "segment": rng.choice(["a", "b"], 1_000)})
+    vip = pd.DataFrame({"cid": np.arange(0, 1_000, 100), "tier": "gold"})
+    frames = {"orders": orders, "customers": customers, "vip": vip}
+
+    merged = merge_many(frames, on="cid", columns=["amount", "segment", "tier"])
+    expected = orders.merge(customers, on="cid").merge(vip, on="cid")[["cid", "amount", "segment", "tier"]]
+    sort = lambda df: df.sort_values(["cid", "amount"]).reset_index(drop=True)
+    pd.testing.assert_frame_equal(sort(merged), sort(expected))
+
+    plan = merged.attrs["merge_plan"]
+    assert plan[0]["right"] != "orders" and plan[0]["left"] != "orders"  # selective pair first
+    assert plan[-1]["rows"] == len(expected)
+    assert max(step["rows"] for step in plan) == len(expected)
+
+    left = merge_many([orders, vip], on="cid", how="left")
+    assert len(left) == len(orders) and list(left.columns) == ["cid", "amount", "note", "tier"]
+
+
+def test_concat_datasets_unifies_schemas():
+    data1 = pd.DataFrame({"id": [1, 2], "city": pd.Categorical(["a", "b"]), "flag": [True, False]})
+    data2 = pd.DataFrame({"city": pd.Categorical(["c"]), "flag": [1], "score": [0.5]}, index=[5])
+    concatenated = concat_datasets([data1, data2])
+    assert list(concatenated.columns) == ["id", "city", "flag", "score"]
+    assert list(concatenated.index) == [0, 1, 5]
+    assert concatenated["id"].dtype == "Int64" and concatenated["id"].isna().tolist() == [False, False, True]
+    assert isinstance(concatenated["city"].dtype, pd.CategoricalDtype)
+    assert concatenated["city"].tolist() == ["a", "b", "c"]
+    assert concatenated["flag"].tolist() == [1, 0, 1] and concatenated["flag"].dtype == np.int64
+    assert concatenated["score"].isna().sum() == 2
+
+    same = pd.DataFrame(np.arange(6.0).reshape(3, 2), columns=["x", "y"])
+    pd.testing.assert_frame_equal(concat_datasets([same, same]), pd.concat([same, same]))
+
+
+
+def test_concat_datasets_unifies_datetimes():
+    dates = pd.to_datetime(["2020-01-01", "2020-06-01"])
+    for data1, data2 in [
+        (pd.DataFrame({"t": dates}), pd.DataFrame({"t": ["unknown"]})),
+        (pd.DataFrame({"t": dates}), pd.DataFrame({"t": dates.as_unit("us")})),
+        (pd.DataFrame({"t": dates.tz_localize("UTC")}), pd.DataFrame({"t": dates})),
+        (pd.DataFrame({"t": dates.tz_localize("UTC")}), pd.DataFrame({"t": dates.tz_localize("US/Eastern")})),
+        (pd.DataFrame({"t": dates.tz_localize("UTC").as_unit("s")}), pd.DataFrame({"t": dates.tz_localize("UTC")})),
+    ]:
+        concatenated = concat_datasets([data1, data2])
+        expected = pd.concat([data1, data2])
+        assert concatenated["t"].dtype == expected["t"].dtype
+        assert concatenated["t"].tolist() == expected["t"].tolist()
+
+def test_concat_datasets_overlapping_columns():
+    data1 = pd.DataFrame({"id": [1, 2], "value": [10, 20]})
+    data2 = pd.DataFrame({"value": [30, 40]})
+    suffixed = concat_datasets({"a": data1, "b": data2}, axis=1, overlap="suffix")
+    assert list(suffixed.columns) == ["id", "value_a", "value_b"]
+    with pytest.raises(ValueError):
+        concat_datasets([data1, data2], axis=1, overlap="error")
+
+
+def test_concat_files(tmp_path):
+    pd.DataFrame({"id": [1, 2], "name": ["a", "b"], "price": [0.5, 1.5]}).to_csv(tmp_path / "a.csv", index=False)
+    pd.DataFrame({"id": [3], "name": ["c"], "region": pd.Categorical(["x"])}).to_parquet(tmp_path / "b.parquet")
+    pd.DataFrame({"region": pd.Categorical(["y", "x"]), "id": [4, 5]}).to_parquet(tmp_path / "c.parquet")
+    out_path = tmp_path / "out.parquet"
+    concat_files([tmp_path / "a.csv", tmp_path / "b.parquet", tmp_path / "c.parquet"], out_path, chunksize=1)
+
+    result = pd.read_parquet(out_path)
+    assert list(result.columns) == ["id", "name", "price", "region"]
+    assert result["id"].tolist() == [1, 2, 3, 4, 5]
+    assert result["name"].tolist()[:3] == ["a", "b", "c"]
+    assert isinstance(result["region"].dtype, pd.CategoricalDtype)
+    assert result["region"].tolist()[2:] == ["x", "y", "x"]
@@ -1,16 +1,105 @@
 import os
 import pytest
+import json
+import numpy as np
 import pandas as pd
 import warnings
+import hashlib
+import threading
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
 from vistool.download import (
     download_file,
+    download_files,
     download_csv, 
+    HTTPCache,
     load_csv,
+    iter_csv,
+    ColumnarCache,
     load_excel, 
-    summarize_data
+    load_excel_sheets,
+    summarize_data,
+    optimize_dtypes,
+    profile_data,
+    profile_chunks,
+    Profile,
+    StreamingProfiler
 )
 
 
+class RangeHandler(SimpleHTTPRequestHandler):
+    """
+    Local stand-in for a file server that honours `Range`, `If-Range` and 
+    `If-None-Match` requests and can drop the connection part way through a response.
+    """
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        server.requests_seen.append(dict(self.headers))
+        path = server.serve_dir / self.path.lstrip("/")
+        if not path.is_file():
+            self.send_error(404)
+            return
+        with open(path, "rb") as f:
+            data = f.read()
+
+        etag = f'"{hashlib.md5(data).hexdigest()}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        start = 0
+        range_header = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        if if_range is not None and if_range != etag:
+            range_header = None  # the file changed: send all of it
+        if range_header and server.supports_range:
+            start = int(range_header.split("=")[1].split("-")[0])
+            if start >= len(data):
+                self.send_error(416)
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(data) - 1}/{len(data)}")
+        else:
+            self.send_response(200)
+        body = data[start:]
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", etag)
+        self.end_headers()
+
+        if server.drop_after is not None:
+            # Send part of the body, then cut the connection once
+            self.wfile.write(body[:server.drop_after])
+            server.drop_after = None
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def local_server(tmp_path):
+    """
+    Serves a temporary directory over HTTP. The yielded server exposes 
+    `serve_dir`, `base_url`, `requests_seen`, `supports_range` and `drop_after`.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RangeHandler)
+    server.serve_dir = tmp_path / "served"
+    server.serve_dir.mkdir()
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    server.requests_seen = []
+    server.supports_range = True
+    server.drop_after = None
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
 def test_download_file(tmp_path):
     """
     Test the functionality of downloading a file and saving it locally.
@@ -52,6 +141,177 @@ def test_download_invalid_url():
     with pytest.raises(Exception):
         download_file(invalid_url, "data/fake.csv")
         
+def test_download_file_resumes_after_drop(local_server, tmp_path):
+    """
+    Test that a dropped transfer is retried and resumed with a Range request.
+    """
+    payload = os.urandom(100_000)
+    (local_server.serve_dir / "export.bin").write_bytes(payload)
+    local_server.drop_after = 60_000
+    save_path = tmp_path / "export.bin"
+
+    download_file(f"{local_server.base_url}/export.bin", save_path, 
+                  chunk_size=4096, backoff=0)
+
+    assert save_path.read_bytes() == payload, "Resumed file does not match"
+    assert not (tmp_path / "export.bin.part").exists(), "Partial file was left behind"
+    range_header = local_server.requests_seen[-1].get("Range")
+    assert range_header is not None and range_header != "bytes=0-", "Download was not resumed"
+
+def test_download_file_restarts_when_remote_file_changed(local_server, tmp_path):
+    """
+    Test that a leftover partial file of an older version is not resumed.
+    """
+    old_payload, new_payload = os.urandom(40_000), os.urandom(50_000)
+    served = local_server.serve_dir / "export.bin"
+    served.write_bytes(old_payload)
+    local_server.drop_after = 20_000
+    save_path = tmp_path / "export.bin"
+    with pytest.raises(Exception):
+        download_file(f"{local_server.base_url}/export.bin", save_path, chunk_size=4096, retries=0)
+    assert (tmp_path / "export.bin.part").stat().st_size > 0
+
+    served.write_bytes(new_payload)
+    download_file(f"{local_server.base_url}/export.bin", save_path, backoff=0)
+
+    assert save_path.read_bytes() == new_payload, "Old prefix was spliced onto the new file"
+    assert local_server.requests_seen[-1].get("If-Range") == f'"{hashlib.md5(old_payload).hexdigest()}"'
+    assert not (tmp_path / "export.bin.part.validator").exists()
+
+    # A partial file without a validator cannot be checked and is restarted
+    (tmp_path / "export.bin.part").write_bytes(old_payload[:1000])
+    download_file(f"{local_server.base_url}/export.bin", save_path, backoff=0)
+    assert save_path.read_bytes() == new_payload
+    assert "Range" not in local_server.requests_seen[-1]
+
+def test_download_file_restarts_without_range_support(local_server, tmp_path):
+    """
+    Test that a server ignoring Range causes a clean restart, not a corrupt file.
+    """
+    payload = os.urandom(50_000)
+    (local_server.serve_dir / "export.bin").write_bytes(payload)
+    local_server.drop_after = 20_000
+    local_server.supports_range = False
+    save_path = tmp_path / "export.bin"
+
+    download_file(f"{local_server.base_url}/export.bin", save_path, backoff=0)
+
+    assert save_path.read_bytes() == payload, "Restarted file does not match"
+
+def test_download_file_no_retry_on_404(local_server, tmp_path):
+    """
+    Test that client errors are raised straight away rather than retried.
+    """
+    with pytest.raises(Exception):
+        download_file(f"{local_server.base_url}/missing.bin", tmp_path / "x.bin")
+    assert len(local_server.requests_seen) == 1, "A 404 should not be retried"
+
+def test_download_files(local_server, tmp_path):
+    """
+    Test concurrent downloads and that a failed URL does not abort the batch.
+    """
+    base_url = local_server.base_url
+    for i in range(5):
+        (local_server.serve_dir / f"region_{i}.csv").write_text(f"id,value\n{i},{i * 10}\n")
+    urls = [f"{base_url}/region_{i}.csv" for i in range(5)]
+    urls.append(f"{base_url}/missing.csv")
+
+    downloaded, failed = download_files(urls, tmp_path / "out", max_workers=3)
+
+    assert len(downloaded) == 5, f"Unexpected downloads: {downloaded}"
+    assert list(failed) == [f"{base_url}/missing.csv"]
+    assert (tmp_path / "out" / "region_3.csv").read_text() == "id,value\n3,30\n"
+
+def test_download_files_duplicate_names(tmp_path):
+    """
+    Test that URLs which would overwrite each other are rejected up front.
+    """
+    urls = ["https://example.com/north/data.csv", "https://example.com/south/data.csv"]
+    with pytest.raises(ValueError, match="saved as 'data.csv'"):
+        download_files(urls, tmp_path)
+
+def test_download_csv_cache_revalidates(local_server, tmp_path):
+    """
+    Test that an unchanged file is served from the cache after a 304.
+    """
+    csv_path = local_server.serve_dir / "airtravel.csv"
+    csv_path.write_text("Month,1958\nJAN,340\nFEB,318\n")
+    url = f"{local_server.base_url}/airtravel.csv"
+    cache = HTTPCache(tmp_path / "cache")
+
+    first = download_csv(url, cache=cache)
+    second = download_csv(url, cache=cache)
+
+    assert first.equals(second), "Cached DataFrame differs from the original"
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+    assert "If-None-Match" in local_server.requests_seen[-1]
+
+    # A changed upstream file is downloaded again
+    csv_path.write_text("Month,1958\nJAN,999\n")
+    third = download_csv(url, cache=cache)
+    assert third["1958"].tolist() == [999]
+    assert cache.stats()["misses"] == 2
+
+def test_http_cache_evicts_least_recently_used(local_server, tmp_path):
+    """
+    Test that the cache stays within its size bound by evicting old entries.
+    """
+    for name in ["a", "b", "c"]:
+        (local_server.serve_dir / f"{name}.csv").write_text(f"x\n{name * 40}\n")
+    cache = HTTPCache(tmp_path / "cache", max_bytes=100)
+
+    for name in ["a", "b", "a", "c"]:
+        cache.fetch(f"{local_server.base_url}/{name}.csv")
+
+    stats = cache.stats()
+    assert stats["bytes"] <= 100, f"Cache exceeded its bound: {stats}"
+    assert stats["entries"] == 2
+    # 'b' was the least recently used entry, so it is the one evicted
+    reloaded = HTTPCache(tmp_path / "cache", max_bytes=100)
+    assert f"{local_server.base_url}/b.csv" not in reloaded._index
+
+def test_http_cache_keeps_body_larger_than_bound(local_server, tmp_path):
+    """
+    Test that a body over `max_bytes` is still returned rather than evicted at once.
+    """
+    (local_server.serve_dir / "small.csv").write_text("x\n1\n")
+    (local_server.serve_dir / "big.csv").write_text("x\n" + "1\n" * 100)
+    cache = HTTPCache(tmp_path / "cache", max_bytes=50)
+
+    cache.fetch(f"{local_server.base_url}/small.csv")
+    df = download_csv(f"{local_server.base_url}/big.csv", cache=cache)
+
+    assert len(df) == 100
+    assert cache.stats()["entries"] == 1, "The older entry should make room"
+    assert f"{local_server.base_url}/big.csv" in cache._index
+
+def test_download_csv_stream_chunks(local_server):
+    """
+    Test that streaming with a chunksize yields consistent DataFrame chunks.
+    """
+    rows = "\n".join(f"{i},{i * 2}" for i in range(1000))
+    (local_server.serve_dir / "big.csv").write_text("a,b\n" + rows + "\n")
+    url = f"{local_server.base_url}/big.csv"
+
+    chunks = list(download_csv(url, chunksize=300))
+
+    assert [len(c) for c in chunks] == [300, 300, 300, 100]
+    combined = pd.concat(chunks, ignore_index=True)
+    assert combined.equals(download_csv(url)), "Streamed rows differ from a full download"
+
+@pytest.mark.parametrize("suffix", [".gz", ".zip"])
+def test_download_csv_stream_compressed(local_server, suffix):
+    """
+    Test transparent decompression of gzip and zip CSVs when streaming.
+    """
+    df = pd.DataFrame({"region": ["North", "South", "East"], "count": [1, 2, 3]})
+    df.to_csv(local_server.serve_dir / f"data.csv{suffix}", index=False)
+    url = f"{local_server.base_url}/data.csv{suffix}"
+
+    streamed = download_csv(url, stream=True)
+
+    assert streamed.equals(df), f"Decompressed {suffix} CSV does not match"
+
 # Test load_csv
 def test_load_csv(tmp_path):
     """
@@ -79,6 +339,78 @@ def test_load_csv_invalid_file():
     with pytest.raises(ValueError, match="Error loading CSV file"):
         load_csv(invalid_path)
 
+def test_iter_csv(tmp_path):
+    """
+    Test that chunks share the schema inferred from the head sample.
+    """
+    csv_path = tmp_path / "large.csv"
+    lines = ["id,price,region,note"]
+    lines += [f"{i},{i * 1.5},R{i % 3},x" for i in range(250)]
+    lines += ["250,,R1,"]  # Missing values only appear after the sample
+    csv_path.write_text("\n".join(lines) + "\n")
+
+    chunks = list(iter_csv(csv_path, chunksize=100, usecols=["id", "price", "region"], sample_rows=50))
+
+    assert [len(c) for c in chunks] == [100, 100, 51]
+    assert all(c.dtypes.equals(chunks[0].dtypes) for c in chunks), "Chunk schemas differ"
+    assert str(chunks[0]["id"].dtype) == "Int64"
+    assert chunks[-1]["price"].isna().iloc[-1]
+    assert list(chunks[0].columns) == ["id", "price", "region"]
+
+def test_iter_csv_mismatched_dtype(tmp_path):
+    """
+    Test that values that do not fit the sampled dtypes raise a clear error.
+    """
+    csv_path = tmp_path / "large.csv"
+    csv_path.write_text("id\n" + "\n".join(str(i) for i in range(20)) + "\nnot_a_number\n")
+    with pytest.raises(ValueError, match="sample_rows"):
+        list(iter_csv(csv_path, chunksize=5, sample_rows=10))
+
+def test_iter_csv_invalid_file():
+    """
+    Test that a missing file fails straight away with the usual loader error.
+    """
+    with pytest.raises(ValueError, match="Error loading CSV file"):
+        iter_csv("nonexistent.csv")
+
+def test_load_csv_columnar_cache(tmp_path):
+    """
+    Test that a parsed CSV is reused from its sidecar until the file changes.
+    """
+    csv_path = tmp_path / "data.csv"
+    csv_path.write_text("Name,Age,Score\nAlice,25,85\nBob,30,90\n")
+    cache = ColumnarCache(tmp_path / "cache")
+
+    first = load_csv(csv_path, cache=cache)
+    second = load_csv(csv_path, cache=cache)
+    ages = load_csv(csv_path, cache=cache, columns=["Age"])
+
+    assert first.equals(second), "Cached DataFrame differs from the parsed one"
+    assert list(ages.columns) == ["Age"]
+    assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 1
+
+    # Touching the file without changing it keeps the sidecar
+    os.utime(csv_path, ns=(0, 0))
+    load_csv(csv_path, cache=cache)
+    assert cache.stats()["hits"] == 3
+
+    # Changing the content invalidates it
+    csv_path.write_text("Name,Age,Score\nCarol,41,70\n")
+    changed = load_csv(csv_path, cache=cache)
+    assert changed["Name"].tolist() == ["Carol"]
+    assert cache.stats()["misses"] == 2
+
+def test_columnar_cache_evicts(tmp_path):
+    """
+    Test that sidecars beyond the size bound are evicted.
+    """
+    cache = ColumnarCache(tmp_path / "cache", max_bytes=1)
+    for name in ["a", "b"]:
+        csv_path = tmp_path / f"{name}.csv"
+        csv_path.write_text("x,y\n1,2\n")
+        load_csv(csv_path, cache=cache)
+    assert cache.stats()["entries"] == 0, "Sidecars were not evicted"
+
 # Test load_excel
 def test_load_excel(tmp_path):
     """
@@ -104,6 +436,56 @@ def test_load_excel(tmp_path):
         assert list(df.columns) == ["Name", "Age", "Score"], f"Unexpected columns: {df.columns}"
         assert df["Name"].iloc[0] == "Alice", "First row 'Name' value is incorrect"
     
+def test_load_excel_columnar_cache(tmp_path):
+    """
+    Test caching of single sheets and of the all-sheets dict.
+    """
+    excel_path = tmp_path / "workbook.xlsx"
+    with pd.ExcelWriter(excel_path) as writer:
+        pd.DataFrame({"A": [1, 2], "B": ["x", "y"]}).to_excel(writer, sheet_name="First", index=False)
+        pd.DataFrame({"C": [3.5]}).to_excel(writer, sheet_name="Second", index=False)
+    cache = ColumnarCache(tmp_path / "cache")
+
+    parsed = load_excel(excel_path, sheet_name="First", cache=cache)
+    cached = load_excel(excel_path, sheet_name="First", cache=cache, columns=["B"])
+    assert cached.equals(parsed[["B"]])
+
+    sheets = load_excel(excel_path, cache=cache)
+    sheets_again = load_excel(excel_path, cache=cache)
+    assert list(sheets_again) == ["First", "Second"]
+    assert sheets_again["Second"].equals(sheets["Second"])
+    assert cache.stats()["hits"] >= 4
+
+def test_load_excel_sheets(tmp_path):
+    """
+    Test parallel sheet loading with per-sheet options and the columnar cache.
+    """
+    excel_path = tmp_path / "finance.xlsx"
+    expected = {
+        f"Q{i}": pd.DataFrame({"Month": range(10), "Total": [i * 100.5] * 10, "Note": ["x"] * 10})
+        for i in range(1, 5)
+    }
+    with pd.ExcelWriter(excel_path) as writer:
+        for name, df in expected.items():
+            df.to_excel(writer, sheet_name=name, index=False)
+
+    sheets = load_excel_sheets(excel_path, n_jobs=2)
+    assert list(sheets) == ["Q1", "Q2", "Q3", "Q4"]
+    assert sheets["Q3"].equals(expected["Q3"])
+
+    subset = load_excel_sheets(
+        excel_path, ["Q4", "Q1"], n_jobs=2, usecols={"Q4": ["Total"]}, nrows=3
+    )
+    assert list(subset) == ["Q4", "Q1"]
+    assert list(subset["Q4"].columns) == ["Total"] and len(subset["Q4"]) == 3
+    assert len(subset["Q1"].columns) == 3
+
+    cache = ColumnarCache(tmp_path / "cache")
+    first = load_excel_sheets(excel_path, n_jobs=2, cache=cache, usecols=["Month", "Total"])
+    second = load_excel_sheets(excel_path, n_jobs=2, cache=cache, usecols=["Month", "Total"])
+    assert all(first[name].equals(second[name]) for name in expected)
+    assert cache.stats()["hits"] == 5, "Second load should come entirely from the cache"
+
 # Test invalid Excel File    
 def test_load_excel_invalid_file():
     """
@@ -135,3 +517,132 @@ def test_summarize_data(capsys):
     assert "Numeric Columns: 2 columns" in captured.out
     assert "Missing Values: 4 missing values in total" in captured.out
     assert "Duplicate Rows: 1 duplicate rows" in captured.out
+
+
+# Test optimize_dtypes
+def test_optimize_dtypes():
+    """
+    Test that dtypes shrink without changing any values.
+    """
+    n = 1_000
+    df = pd.DataFrame({
+        "pclass": np.tile([1, 2, 3], n)[:n],
+        "fare": np.linspace(0, 1, n),
+        "age": np.tile([22.0, 38.0, np.nan, 0.5], n)[:n],
+        "sex": np.tile(["male", "female"], n)[:n],
+        "name": [f"Passenger {i}" for i in range(n)],
+    })
+    compacted = optimize_dtypes(df)
+
+    assert compacted["pclass"].dtype == np.int8
+    assert compacted["fare"].dtype == np.float64, "Lossy float32 downcast"
+    assert compacted["age"].dtype == np.float32
+    assert isinstance(compacted["sex"].dtype, pd.CategoricalDtype)
+    assert compacted["name"].dtype == object
+    assert compacted.memory_usage(deep=True).sum() < df.memory_usage(deep=True).sum()
+    pd.testing.assert_frame_equal(compacted.astype(df.dtypes.to_dict()), df)
+
+def test_load_csv_compact_and_summarize(tmp_path, capsys):
+    """
+    Test the compact loader option and that summarize_data sees compacted numerics.
+    """
+    csv_path = tmp_path / "data.csv"
+    csv_path.write_text("Age,Score,Region\n25,85.5,East\n30,90.0,West\n35,95.5,East\n")
+
+    df = load_csv(csv_path, compact=True)
+    summarize_data(df)
+    captured = capsys.readouterr()
+
+    assert df["Age"].dtype == np.int8
+    assert "Memory usage reduced" in captured.out
+    assert "Numeric Columns: 2 columns" in captured.out
+    assert "Categorical Columns: 1 columns" in captured.out
+
+# Test profile_data
+def test_profile_data():
+    """
+    Test that the profile matches pandas' own statistics and round-trips through JSON.
+    """
+    df = pd.DataFrame({
+        "Age": [25, 30, 25, None],
+        "Score": [85, 90, 85, 70],
+        "Region": ["East", "West", "East", None],
+    })
+    profile = profile_data(df)
+
+    assert profile.n_rows == 4 and profile.n_cols == 3
+    assert profile.numeric_columns == ["Age", "Score"]
+    assert profile.columns["Age"].null_count == 1
+    assert profile.columns["Age"].mean == pytest.approx(df["Age"].mean())
+    assert profile.columns["Score"].min == 70 and profile.columns["Score"].max == 90
+    assert profile.columns["Region"].distinct == 2
+    assert profile.duplicate_rows == 1
+    assert profile.correlation_matrix().equals(df[["Age", "Score"]].corr())
+
+    restored = Profile.from_dict(json.loads(profile.to_json()))
+    assert restored == profile, "Profile did not survive a JSON round trip"
+
+def test_profile_data_sampled():
+    """
+    Test that sampled estimates fall within their documented error bounds.
+    """
+    rng = np.random.default_rng(0)
+    values = rng.normal(50, 10, 100_000)
+    values[rng.random(100_000) < 0.2] = np.nan
+    df = pd.DataFrame({"value": values})
+
+    profile = profile_data(df, sample=5_000)
+    col = profile.columns["value"]
+
+    assert profile.sample_rows == 5_000 and profile.duplicate_rows is None
+    assert abs(col.mean - df["value"].mean()) <= col.mean_error
+    assert abs(col.null_count - df["value"].isna().sum()) <= col.null_error
+
+def test_streaming_profiler_matches_in_memory_profile():
+    """
+    Test that chunked, merged profiles agree with the in-memory profile.
+    """
+    rng = np.random.default_rng(1)
+    n = 20_000
+    df = pd.DataFrame({
+        "x": rng.normal(1e6, 5, n),
+        "y": rng.integers(0, 5_000, n),
+        "region": rng.choice(["North", "South", "East"], n),
+    })
+    df["z"] = df["x"] * 2 + rng.normal(0, 1, n)
+    df.loc[rng.random(n) < 0.1, "x"] = np.nan
+    expected = profile_data(df)
+
+    # Two workers each stream half of the rows, then merge
+    left, right = StreamingProfiler(), StreamingProfiler()
+    for start in range(0, n // 2, 3_000):
+        left.update(df.iloc[start:min(start + 3_000, n // 2)])
+    right.update(df.iloc[n // 2:])
+    left.merge(right)
+    streamed = left.result()
+
+    assert streamed.n_rows == n and streamed.approximate
+    for name in ["x", "y", "z"]:
+        assert streamed.columns[name].null_count == expected.columns[name].null_count
+        assert streamed.columns[name].mean == pytest.approx(expected.columns[name].mean)
+        assert streamed.columns[name].std == pytest.approx(expected.columns[name].std)
+    assert streamed.columns["region"].distinct == 3
+    assert streamed.columns["y"].distinct == pytest.approx(expected.columns["y"].distinct, rel=0.03)
+    assert np.allclose(
+        streamed.correlation_matrix(), expected.correlation_matrix(), atol=1e-9
+    ), "Streamed correlation differs from DataFrame.corr"
+
+def test_profile_chunks_from_iter_csv(tmp_path, capsys):
+    """
+    Test profiling a CSV chunk by chunk and rendering it with summarize_data.
+    """
+    csv_path = tmp_path / "large.csv"
+    pd.DataFrame({"a": range(1000), "b": ["x", "y"] * 500}).to_csv(csv_path, index=False)
+
+    profile = profile_chunks(iter_csv(csv_path, chunksize=100))
+    summarize_data(profile)
+    captured = capsys.readouterr()
+
+    assert profile.columns["a"].max == 999
+    assert "Shape: 1000 rows, 2 columns" in captured.out
+    assert "Numeric Columns: 1 columns" in captured.out
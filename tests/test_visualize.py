@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import pytest
 from vistool.visualize import (
@@ -6,6 +7,8 @@ from vistool.visualize import (
     plot_correlation_matrix,
     plot_line,
     plot_overlay,
+    downsample_line,
+    density_grid,
 )
 
 
@@ -87,3 +90,58 @@ def test_plot_overlay():
         plot_overlay(data, ["A", "B"], ["line", "bar"], save_path="overlay_plot.png")
     except Exception as e:
         pytest.fail(f"plot_overlay raised an exception when saving: {e}")        
+
+
+def test_downsample_line():
+    y = np.sin(np.linspace(0, 20, 100_000))
+    y[40_000] = 5.0
+    y[70_000] = np.nan
+    x = pd.Series(pd.date_range("2024-01-01", periods=len(y), freq="s"))
+
+    for method in ["minmax", "lttb"]:
+        reduced_x, reduced_y = downsample_line(x, pd.Series(y), 1000, method)
+        assert 3 <= len(reduced_y) <= 1000
+        assert reduced_x.is_monotonic_increasing
+        assert reduced_x.iloc[0] == x.iloc[0] and reduced_x.iloc[-1] == x.iloc[-1]
+        assert reduced_y.max() == 5.0  # the spike survives
+        assert reduced_y.min() == pytest.approx(np.nanmin(y), abs=1e-3)
+
+    short_x, short_y = downsample_line([1, 2, 3], [3, 2, 1], 1000)
+    assert list(short_y) == [3, 2, 1]
+
+
+def test_plot_line_downsamples_long_series(capsys):
+    data = pd.DataFrame({"X": np.arange(50_000), "Y": np.random.default_rng(0).normal(size=50_000)})
+    plot_line(data, "X", "Y", save_path="line_chart.png", max_points=2000)
+    assert "Downsampled 'Y' from 50000 to" in capsys.readouterr().out
+
+    plot_overlay(data, ["Y"], ["line"], save_path="overlay_plot.png", downsample="lttb", max_points=2000)
+    assert "from 50000 to 2000 points (lttb)" in capsys.readouterr().out
+
+
+def test_density_grid_matches_histogram2d():
+    rng = np.random.default_rng(0)
+    x, y = rng.normal(size=10_000), rng.exponential(size=10_000)
+    x[7] = np.nan
+    counts, x_edges, y_edges = density_grid(x, y, bins=(30, 20), chunksize=999)
+    valid = ~np.isnan(x)
+    expected, expected_x, expected_y = np.histogram2d(
+        x[valid], y[valid], bins=(30, 20), 
+        range=((x[valid].min(), x[valid].max()), (y.min(), y.max()))
+    )
+    np.testing.assert_array_equal(counts, expected)
+    np.testing.assert_allclose(x_edges, expected_x)
+    np.testing.assert_allclose(y_edges, expected_y)
+
+
+def test_plot_scatter_density_mode(capsys):
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame({"X": rng.normal(size=5000), "Y": rng.normal(size=5000), "label": "a"})
+    plot_scatter(data, "X", "Y", save_path="scatter.png", max_points=1000)
+    assert "Density mode: 5000 points counted on a 800x500 grid." in capsys.readouterr().out
+
+    plot_scatter(data, "X", "Y", save_path="scatter.png", mode="points", max_points=1000)
+    assert "Density mode" not in capsys.readouterr().out
+
+    with pytest.raises(ValueError):
+        plot_scatter(data, "X", "label", mode="density")
@@ -1,10 +1,20 @@
 import pytest
+import warnings
+import numpy as np
 import pandas as pd
+import vistool.wrangle as wrangle
 from vistool.wrangle import(
     clean_data, 
     filter_data, 
+    create_index,
     rename_columns,
-    label_encode
+    label_encode,
+    LabelEncoder,
+    ResultCache,
+    Scaler,
+    SCALER_METHODS,
+    OneHotEncoder,
+    Pipeline
 )
 
 def test_clean_data():
@@ -20,6 +30,57 @@ def test_clean_data():
     with pytest.raises(ValueError):
         clean_data(data, apply_to="invalid")    
         
+
+def test_clean_data_rows_matches_row_by_row_fill():
+    rng = np.random.default_rng(0)
+    values = rng.normal(10, 3, (200, 6))
+    values[rng.random(values.shape) < 0.3] = np.nan
+    values[5] = np.nan  # A row with nothing to fill from
+    data = pd.DataFrame(values, columns=list("ABCDEF"))
+    data["G"] = rng.integers(0, 100, 200)
+
+    # The previous row-by-row implementation
+    expected = data.apply(lambda row: row.fillna(row.mean()), axis=1)
+    expected = expected.astype(float).round(1)
+
+    cleaned = clean_data(data, fill_with="mean", apply_to="rows")
+    pd.testing.assert_frame_equal(cleaned, expected)
+
+    median = clean_data(data, fill_with="median", apply_to="rows")
+    expected_median = data.apply(lambda row: row.fillna(row.median()), axis=1)
+    pd.testing.assert_frame_equal(median, expected_median.astype(float).round(1))
+
+    ffill = clean_data(data, fill_with="ffill", apply_to="rows")
+    pd.testing.assert_frame_equal(ffill, data.ffill(axis=1).astype(float).round(1))
+
+
+def test_clean_data_preserve_dtypes():
+    data = pd.DataFrame({
+        "id": [101, 102, 103],
+        "count": pd.array([1, None, 4], dtype="Int64"),
+        "score": [1.234, None, 3.458],
+        "name": ["a", "b", "c"],
+    })
+    original = data.copy()
+
+    cleaned = clean_data(data, fill_with="mean", preserve_dtypes=True)
+    assert cleaned["id"].dtype == "int64"
+    assert cleaned["count"].tolist() == [1, 2, 4]  # Integer mean is rounded
+    assert cleaned.loc[1, "score"] == pytest.approx(2.346)  # No rounding by default
+    assert np.shares_memory(cleaned["id"].to_numpy(), data["id"].to_numpy())
+    pd.testing.assert_frame_equal(data, original)  # Input is left untouched
+
+    rounded = clean_data(data, fill_with="mean", preserve_dtypes=True, decimals=2)
+    assert rounded["score"].tolist() == [1.23, 2.35, 3.46]
+    assert rounded["id"].dtype == "int64"
+
+    # The default keeps casting to float and rounding to one decimal place
+    assert clean_data(data, fill_with="mean")["id"].dtype == "float64"
+
+    result = clean_data(data, remove_columns=["score"], preserve_dtypes=True, inplace=True)
+    assert result is data
+    assert len(data) == 2 and data["id"].tolist() == [101, 103]
+        
         
 def test_filter_data():
     data = pd.DataFrame({"A": [1, 2, 3], "B": [4, 5, 6]})
@@ -59,3 +120,363 @@ def test_label_encode():
     # Test: Apply label encoding on 'Color' column
     encoded_data = label_encode(data, 'Color')
     assert set(encoded_data['Color'].unique()) == {0, 1, 2}, "Label encoding failed"   
+
+
+def test_pipeline_matches_eager_chain():
+    rng = np.random.default_rng(0)
+    n = 500
+    data = pd.DataFrame({
+        "id": np.arange(n),
+        "region_id": rng.integers(0, 8, n),
+        "age": np.where(rng.random(n) < 0.1, np.nan, rng.integers(18, 90, n)),
+        "sex": rng.choice(["male", "female", None], n),
+        "unused": rng.normal(size=n),
+    })
+    regions = pd.DataFrame({
+        "region_id": [0, 1, 2, 3, 3, 5, 6],
+        "region_name": list("ABCDEFG"),
+        "population": rng.integers(1_000, 5_000, 7),
+    })
+
+    pipeline = (
+        Pipeline(data)
+        .clean(remove_columns=["age"])
+        .merge(regions, on="region_id", how="left")
+        .filter("sex == 'female'")
+        .rename({"age": "years"})
+        .rename({"years": "age_years", "sex": "gender"})
+        .select(["id", "age_years", "gender", "region_name"])
+    )
+    eager = pipeline.collect(optimize=False)
+    optimized = pipeline.collect()
+    pd.testing.assert_frame_equal(optimized, eager)
+
+    plan = pipeline.explain()
+    assert "on rows where \"sex == 'female'\"" in plan  # Filter fused into the clean
+    assert "unused" not in plan.splitlines()[0]  # Unused columns pruned at the source
+    assert "population" not in plan  # Unused merge columns pruned
+    assert plan.count("rename") == 1  # Adjacent renames merged
+
+
+def test_pipeline_filter_fused_into_merge():
+    left = pd.DataFrame({"k": [3, 1, np.nan, 3, 2, 1], "a": range(6)})
+    right = pd.DataFrame({"k": [1, 3, 3, np.nan, 5, 1], "b": range(6)})
+    for how in ["inner", "left"]:
+        pipeline = Pipeline(left).merge(right, on="k", how=how).filter("a != 3")
+        assert "filter" not in pipeline.explain()
+        pd.testing.assert_frame_equal(pipeline.collect(), pipeline.collect(optimize=False))
+
+
+def test_pipeline_keeps_filters_that_depend_on_earlier_steps():
+    data = pd.DataFrame({"A": [1.0, None, 3.0, 10.0], "B": ["x", "y", "x", "y"]})
+
+    # The column mean fill changes A, so the filter must run after it
+    pipeline = Pipeline(data).clean(fill_with="mean").filter("A > 4")
+    assert pipeline.explain().splitlines()[-1].startswith("filter")
+    pd.testing.assert_frame_equal(pipeline.collect(), pipeline.collect(optimize=False))
+
+    # A filter fused into a drop-NaN clean does not write into a slice
+    for kwargs in [{}, {"remove_columns": ["A"]}, {"preserve_dtypes": True}]:
+        pipeline = Pipeline(data).clean(**kwargs).filter("B != 'y'")
+        assert "filter" not in pipeline.explain()
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", pd.errors.SettingWithCopyWarning)
+            pd.testing.assert_frame_equal(pipeline.collect(), pipeline.collect(optimize=False))
+
+    # Conditions that look at other rows are not moved either
+    pipeline = Pipeline(data).clean().filter("A > A.mean()")
+    assert pipeline.explain().splitlines()[-1].startswith("filter")
+
+
+def test_pipeline_optimized_matches_unoptimized_with_duplicate_keys():
+    rng = np.random.default_rng(5)
+    for _ in range(20):
+        left = pd.DataFrame({"k": rng.integers(0, 4, 12), "a": rng.normal(size=12), "b": rng.integers(0, 50, 12)})
+        right = pd.DataFrame({"k": rng.integers(0, 4, 6), "a": rng.normal(size=6), "t": rng.choice(["x", "y"], 6)})
+        pipeline = Pipeline(left).merge(right, on="k", how="left").merge(right, on="k", how="inner").filter("b < 25")
+        assert "filter" not in pipeline.explain()
+        pd.testing.assert_frame_equal(pipeline.collect(), pipeline.collect(optimize=False))
+
+    # The unused right 'a' is kept so the second merge suffixes the same columns
+    pipeline = (
+        Pipeline(left).clean(remove_columns=["a"])
+        .merge(right, on="k").merge(right, on="k")
+        .label_encode(["t_x", "t_y"]).select(["k", "a", "t_x"])
+    )
+    pd.testing.assert_frame_equal(pipeline.collect(), pipeline.collect(optimize=False))
+
+
+def test_filter_data_compiled_and_indexed():
+    rng = np.random.default_rng(0)
+    n = 2_000
+    data = pd.DataFrame({
+        "age": np.where(rng.random(n) < 0.05, np.nan, rng.integers(0, 100, n)),
+        "region": rng.choice(["North", "South", "East", None], n),
+        "score": rng.normal(size=n),
+    })
+    conditions = [
+        "age > 30",
+        "age == 42",
+        "18 <= age < 65",
+        "region == 'East'",
+        "region in ['North', 'East']",
+        "age >= 65 and region == 'North' and score > 0",
+        "age < 10 or region == 'South'",
+        "not (age > 50)",
+        "region != 'East' & score < -1",
+    ]
+    expected = {condition: data.query(condition) for condition in conditions}
+
+    create_index(data, "age")
+    create_index(data, "region")
+    for condition in conditions:
+        pd.testing.assert_frame_equal(filter_data(data, condition), expected[condition])
+
+    # Replacing an indexed column invalidates its index
+    data["age"] = data["age"] + 1
+    pd.testing.assert_frame_equal(filter_data(data, "age > 30"), data.query("age > 30"))
+
+    # Conditions the compiled evaluator does not handle still go to query
+    filtered = filter_data(data, "age + score > 50", engine="python")
+    pd.testing.assert_frame_equal(filtered, data.query("age + score > 50"))
+
+    with pytest.raises(ValueError):
+        create_index(data, "region", kind="sorted")
+
+
+def test_filter_data_uses_index_under_copy_on_write(monkeypatch):
+    lookups = []
+    lookup = wrangle._ColumnIndex.lookup
+
+    def counting_lookup(self, op, value):
+        lookups.append((op, value))
+        return lookup(self, op, value)
+
+    monkeypatch.setattr(wrangle._ColumnIndex, "lookup", counting_lookup)
+
+    with pd.option_context("mode.copy_on_write", True):
+        data = pd.DataFrame({"age": np.arange(100.0), "region": ["North", "South"] * 50})
+        create_index(data, "age")
+        create_index(data, "region")
+        for condition in ["age > 90", "region == 'South'"]:
+            pd.testing.assert_frame_equal(filter_data(data, condition), data.query(condition))
+        assert len(lookups) == 2, "The indexes were not used"
+
+        data["age"] = data["age"] + 1
+        pd.testing.assert_frame_equal(filter_data(data, "age > 90"), data.query("age > 90"))
+        assert len(lookups) == 2, "A replaced column's index was used"
+
+
+def test_label_encoder_consistent_across_frames(tmp_path):
+    train = pd.DataFrame({"Color": ["Red", "Blue", "Green", None], "Size": ["S", "M", "L", "M"], "n": [1, 2, 3, 4]})
+    encoder = LabelEncoder().fit(train)
+    assert list(encoder.vocabulary) == ["Color", "Size"]
+
+    encoded = encoder.transform(train)
+    expected = label_encode(train.copy(), "Color")["Color"]
+    assert encoded["Color"].tolist() == expected.tolist() == [2, 0, 1, -1]
+    assert encoded["Color"].dtype == np.int8
+    assert train["Color"].tolist() == ["Red", "Blue", "Green", None]  # input untouched
+
+    # A later chunk without "Blue" keeps the same codes
+    chunk = pd.DataFrame({"Color": ["Green", "Red"], "Size": ["L", "S"]})
+    assert encoder.transform(chunk)["Color"].tolist() == [1, 2]
+
+    unseen = pd.DataFrame({"Color": ["Purple"], "Size": ["S"]})
+    with pytest.raises(ValueError):
+        encoder.transform(unseen)
+    path = tmp_path / "encoder.json"
+    encoder.save(path)
+    loaded = LabelEncoder.load(path)
+    loaded.handle_unknown = "missing"
+    assert loaded.transform(unseen)["Color"].tolist() == [-1]
+
+    loaded.partial_fit(unseen, ["Color"])
+    assert loaded.transform(unseen)["Color"].tolist() == [3]
+    decoded = loaded.inverse_transform(loaded.transform(chunk))
+    assert decoded["Color"].tolist() == ["Green", "Red"]
+
+    many = pd.DataFrame({"id": [f"id{i}" for i in range(300)]})
+    assert LabelEncoder().fit_transform(many)["id"].dtype == np.int16
+
+
+def test_pipeline_scan_matches_in_memory(tmp_path):
+    rng = np.random.default_rng(1)
+    n = 1_000
+    data = pd.DataFrame({
+        "age": np.where(rng.random(n) < 0.1, np.nan, rng.integers(0, 90, n)),
+        "score": np.where(rng.random(n) < 0.1, np.nan, rng.normal(size=n)),
+        "region": rng.choice(["North", "South", "East", "West"], n),
+    })
+    source = tmp_path / "data.csv"
+    data.to_csv(source, index=False)
+
+    def build(pipeline):
+        return (
+            pipeline
+            .filter("age > 20")
+            .clean(fill_with="mean")
+            .label_encode("region")
+            .rename({"score": "points"})
+        )
+
+    expected = build(Pipeline(pd.read_csv(source))).collect().reset_index(drop=True)
+    scanned = build(Pipeline.scan(source, chunksize=128))
+    pd.testing.assert_frame_equal(scanned.collect(), expected, check_dtype=False)
+
+    out_path = tmp_path / "clean.parquet"
+    scanned.sink_parquet(out_path)
+    pd.testing.assert_frame_equal(pd.read_parquet(out_path), expected, check_dtype=False)
+
+    with pytest.raises(ValueError):
+        Pipeline.scan(source).filter("age > age.mean()").collect()
+    with pytest.raises(ValueError):
+        Pipeline(data).sink_parquet(out_path)
+
+
+def test_parallel_column_cleaning_matches_serial():
+    rng = np.random.default_rng(2)
+    data = pd.DataFrame(rng.normal(size=(500, 40))).add_prefix("s")
+    data = data.mask(rng.random(data.shape) < 0.1)
+    data["count"] = rng.integers(0, 10, len(data))
+    data["label"] = rng.choice(["a", "b", "c", None], len(data))
+
+    for kwargs in [
+        {"fill_with": "mean"}, 
+        {"fill_with": "mean", "preserve_dtypes": True, "decimals": 2}, 
+        {"remove_columns": ["s0"]},
+        {"fill_with": {"s1": 0.0, "count": 1, "label": "unknown"}},
+    ]:
+        serial = clean_data(data, **kwargs)
+        parallel = clean_data(data, n_jobs=3, **kwargs)
+        pd.testing.assert_frame_equal(parallel, serial)
+        assert list(parallel.columns) == list(data.columns)
+
+    labels = pd.DataFrame({f"c{i}": rng.choice(["x", "y", "z"], 50) for i in range(6)})
+    serial = label_encode(labels.copy(), list(labels.columns))
+    parallel = label_encode(labels.copy(), list(labels.columns), n_jobs=2)
+    pd.testing.assert_frame_equal(parallel, serial)
+    assert serial["c0"].tolist() == label_encode(labels.copy(), "c0")["c0"].tolist()
+
+
+def test_preview_panel_samples_caches_and_pages():
+    import ipywidgets as widgets
+    from vistool.wrangle import _PreviewPanel
+
+    data = pd.DataFrame({"A": np.arange(1_000), "B": np.arange(1_000) % 7})
+    calls = []
+
+    def operation(df, state):
+        calls.append(len(df))
+        return filter_data(df, state["condition"])
+
+    condition = widgets.Text(value="B < 5")
+    panel = _PreviewPanel(data, operation, {"condition": condition}, "Apply", 
+                          sample_rows=100, page_size=10, debounce=0)
+    panel.refresh()
+    assert calls == [100]
+    assert panel.page.max == -(-len(panel.result) // 10)
+    panel.page.value = 2
+    assert panel.status.value.startswith("Preview on 100 of 1000 rows: rows 11-")
+
+    condition.value = "B == 4"
+    condition.value = "B < 5"  # cached
+    assert calls == [100, 100]
+
+    full = panel.apply()
+    assert calls[-1] == 1_000
+    pd.testing.assert_frame_equal(full, data.query("B < 5"))
+
+
+def test_result_cache_memory_and_disk_tiers(tmp_path):
+    data = pd.DataFrame({"A": [1.0, None, 3.0, 4.0], "B": ["x", "y", None, "z"]})
+    cache = ResultCache(tmp_path / "results")
+    clean = cache.memoize(clean_data)
+
+    first = clean(data, fill_with="mean")
+    second = clean(data, fill_with="mean")
+    pd.testing.assert_frame_equal(first, second)
+    assert second is not first
+    assert cache.stats()["memory_hits"] == 1 and cache.stats()["misses"] == 1
+
+    # Different arguments or different data are different entries
+    clean(data)
+    changed = data.copy()
+    changed.loc[0, "A"] = 2.0
+    pd.testing.assert_frame_equal(clean(changed, fill_with="mean"), clean_data(changed, fill_with="mean"))
+    assert cache.stats()["misses"] == 3
+
+    # A new cache on the same directory is served from the Parquet tier
+    reloaded = ResultCache(tmp_path / "results").memoize(clean_data)
+    pd.testing.assert_frame_equal(reloaded(data, fill_with="mean"), first)
+    assert reloaded.cache.stats()["disk_hits"] == 1
+
+    # inplace calls are never cached
+    clean(data.copy(), fill_with="mean", inplace=True)
+    assert cache.stats()["misses"] == 3
+
+    cache.clear()
+    assert cache.stats()["disk_entries"] == 0 and cache.stats()["memory_entries"] == 0
+
+
+def test_scaler_methods_and_chunked_fit():
+    rng = np.random.default_rng(3)
+    data = pd.DataFrame({
+        "a": rng.normal(50, 5, 1_000), 
+        "b": rng.integers(0, 100, 1_000), 
+        "c": np.full(1_000, 7.0),
+        "label": "x",
+    })
+    data.loc[::10, "a"] = np.nan
+
+    standard = Scaler("standard").fit_transform(data)
+    assert abs(standard["a"].mean()) < 1e-9 and abs(standard["a"].std(ddof=0) - 1) < 1e-9
+    assert standard["a"].isna().sum() == 100
+    assert (standard["c"] == 0).all()  # constant columns are only centered
+    assert (standard["label"] == "x").all()
+
+    minmax = Scaler("minmax").fit_transform(data)
+    assert minmax["b"].min() == 0 and minmax["b"].max() == 1
+
+    robust = Scaler("robust").fit(data, ["b"])
+    expected = (data["b"] - data["b"].median()) / (data["b"].quantile(0.75) - data["b"].quantile(0.25))
+    pd.testing.assert_series_equal(robust.transform(data, chunksize=64)["b"], expected.astype(float))
+    pd.testing.assert_frame_equal(robust.inverse_transform(robust.transform(data)), data.astype({"b": float}))
+
+    for method in SCALER_METHODS:
+        scaler = Scaler(method).fit(data)
+        pd.testing.assert_frame_equal(scaler.transform(data, chunksize=97), scaler.transform(data))
+
+    for method in ("standard", "minmax"):
+        streamed = Scaler(method)
+        for start in range(0, len(data), 300):
+            streamed.partial_fit(data.iloc[start:start + 300], ["a", "b", "c"])
+        fitted = Scaler(method).fit(data, ["a", "b", "c"])
+        pd.testing.assert_series_equal(streamed.center, fitted.center)
+        pd.testing.assert_series_equal(streamed.scale, fitted.scale)
+    with pytest.raises(ValueError):
+        Scaler("robust").partial_fit(data)
+
+
+def test_one_hot_encoder_outputs_match_get_dummies():
+    data = pd.DataFrame({"city": ["b", "a", None, "c", "a"], "size": ["S", "L", "S", "M", "L"], "n": range(5)})
+    expected = pd.get_dummies(data, columns=["city", "size"], dtype=np.uint8)
+
+    dense = OneHotEncoder(output="dense").fit_transform(data)
+    pd.testing.assert_frame_equal(dense, expected)
+
+    pandas_sparse = OneHotEncoder(output="pandas").fit_transform(data)
+    assert isinstance(pandas_sparse["city_a"].dtype, pd.SparseDtype)
+    dense_again = pandas_sparse.astype({c: np.uint8 for c in pandas_sparse.columns.drop("n")})
+    pd.testing.assert_frame_equal(dense_again, expected)
+
+    encoder = OneHotEncoder().fit(data)
+    matrix = encoder.transform(data)
+    assert matrix.shape == (5, 6) and matrix.nnz == 9
+    assert encoder.feature_names == ["city_a", "city_b", "city_c", "size_L", "size_M", "size_S"]
+    np.testing.assert_array_equal(matrix.toarray(), expected[encoder.feature_names].to_numpy())
+
+    unseen = pd.DataFrame({"city": ["z"], "size": ["S"]})
+    assert encoder.transform(unseen).nnz == 1
+    with pytest.raises(ValueError):
+        OneHotEncoder(handle_unknown="error").fit(data).transform(unseen)
@@ -2,22 +2,104 @@
 Module: combine.py
 Features:
     - Implemented: 
-        1. `merge_datasets`: Merges two datasets on a specified column.
-        2. `concat_datasets`: Concatenates multiple datasets along rows or columns.
+        1. `merge_datasets`: Merges two datasets on a specified column, reusing a 
+            prebuilt `JoinIndex` when possible, and warning about many-to-many 
+            merges.
+        2. `concat_datasets`: Concatenates multiple datasets along rows or columns, 
+            unifying their schemas into preallocated columns and optionally 
+            suffixing overlapping column names.
+        3. `merge_many`: Merges several datasets on one key, choosing the join 
+            order from sampled key statistics and pruning unused columns first.
+        4. `concat_files`: Concatenates CSV and Parquet files into one Parquet 
+            file chunk by chunk, with a schema unified up front.
     - Suggested:
         - Add support for different join methods (inner, outer, etc.) in `merge_datasets`.
-        - Implement a function to handle overlapping column names during concatenation.
 """
 
+import warnings
+import itertools
+import numpy as np
 import pandas as pd
+from collections import Counter
+from vistool.download import infer_csv_dtypes, iter_csv
 
-def merge_datasets(data1: pd.DataFrame, data2: pd.DataFrame, on: str, how: str = "inner") -> pd.DataFrame:
+
+class JoinIndex:
+    """
+    Hash index on a frame's join key, built once and reused by many 
+    `merge_datasets` calls.
+
+    `pd.merge` builds a hash table of the key on every call. When many 
+    frames are merged against the same table (e.g. fact frames against a 
+    dimension table), pass a `JoinIndex` of the table as `data2` instead: 
+    the distinct keys, their hash table and the rows of each key are kept, 
+    so each merge only looks up the other frame's keys. Rebuild the index 
+    after modifying the table.
+
+    Args:
+        data (pd.DataFrame): The frame to index, used as the right side of merges.
+        on (str): The key column.
+
+    Attributes:
+        has_duplicates (bool): Whether any key occurs in more than one row.
+
+    Example:
+        >>> regions = JoinIndex(region_table, "region_id")
+        >>> enriched = [merge_datasets(facts, regions, "region_id", how="left") for facts in frames]
+    """
+
+    def __init__(self, data: pd.DataFrame, on: str):
+        if on not in data.columns:
+            raise ValueError(f"Column '{on}' not found in the dataset.")
+        self.data = data
+        self.on = on
+        codes, uniques = pd.factorize(data[on])
+        self.keys = pd.Index(uniques)
+        self.keys.get_indexer(self.keys[:1])  # builds and caches the hash table
+        # Missing keys get the last code, as pd.merge matches them to each other
+        self.missing_code = len(self.keys) if (codes == -1).any() else -1
+        codes = np.where(codes == -1, len(self.keys), codes)
+        self.order = np.argsort(codes, kind="stable")
+        self.counts = np.bincount(codes, minlength=len(self.keys) + 1)
+        self.starts = np.cumsum(self.counts) - self.counts
+        self.has_duplicates = bool(len(self.keys) < len(data))
+
+    def lookup(self, keys: pd.Series):
+        """
+        Returns, for each of `keys`, where its matching rows start in 
+        `order` and how many there are (0 when absent).
+        """
+        positions = self.keys.get_indexer(keys)
+        if keys.hasnans:
+            positions[keys.isna().to_numpy()] = self.missing_code
+        found = positions >= 0
+        starts = np.zeros(len(positions), dtype=np.int64)
+        counts = np.zeros(len(positions), dtype=np.int64)
+        starts[found] = self.starts[positions[found]]
+        counts[found] = self.counts[positions[found]]
+        return starts, counts
+
+
+def merge_datasets(
+    data1: pd.DataFrame, 
+    data2, 
+    on: str, 
+    how: str = "inner"
+) -> pd.DataFrame:
     """
     Merges two datasets on a specified column.
 
+    With a `JoinIndex` as `data2`, left merges (and inner merges when its 
+    keys are unique) reuse its prebuilt key table instead of hashing the 
+    key again, with the same result as `pd.merge`. All other merges call 
+    `pd.merge`. A warning is issued when both sides repeat keys and the 
+    result outgrows both inputs, since such a many-to-many merge produces 
+    every pairing of their rows.
+
     Args:
         data1 (pd.DataFrame): The first dataset.
-        data2 (pd.DataFrame): The second dataset.
+        data2 (pd.DataFrame or JoinIndex): The second dataset, or a join 
+            index built on it and `on`.
         on (str): The column name to merge on.
         how (str): Type of merge to be performed ('inner', 'outer', 'left', 'right').
 
@@ -26,25 +108,606 @@ def merge_datasets(data1: pd.DataFrame, data2: pd.DataFrame, on: str, how: str =
 
     Example:
         >>> merge_datasets(df1, df2, "id", how="outer")
+        >>> merge_datasets(df1, JoinIndex(df2, "id"), "id", how="left")
     """
-    merged_data = pd.merge(data1, data2, on=on, how=how)
+    index = data2 if isinstance(data2, JoinIndex) else None
+    if index is not None:
+        if index.on != on:
+            raise ValueError(f"The join index is on '{index.on}', not '{on}'.")
+        data2 = index.data
+    _warn_many_to_many(data1, data2, on, index)
+
+    if (
+        index is not None 
+        and (how == "left" or (how == "inner" and not index.has_duplicates))
+        and data1[on].dtype == data2[on].dtype
+    ):
+        starts, counts = index.lookup(data1[on])
+        merged_data = _assemble_merge(data1, data2, on, how, starts, counts, index.order)
+    else:
+        merged_data = pd.merge(data1, data2, on=on, how=how)
     print(f"Datasets merged successfully using {how} join.")
     return merged_data
 
-def concat_datasets(datasets: list[pd.DataFrame], axis: int = 0) -> pd.DataFrame:
+
+def _sorted_numeric_key(keys: pd.Series) -> bool:
+    return (
+        keys.dtype.kind in "iufM" 
+        and not pd.api.types.is_extension_array_dtype(keys.dtype) 
+        and keys.is_monotonic_increasing
+        and not keys.hasnans
+    )
+
+
+def _has_duplicates(keys: pd.Series) -> bool:
+    # Sorted keys only need comparing with their neighbours, not hashing
+    if _sorted_numeric_key(keys):
+        values = keys.to_numpy()
+        return bool((values[1:] == values[:-1]).any())
+    return not keys.is_unique
+
+
+def _assemble_merge(data1, data2, on, how, starts, counts, order) -> pd.DataFrame:
+    """
+    Builds the result of an inner or left merge from, for each left row, the 
+    start and number of its matches among the right rows in `order`.
+
+    Matches are emitted per left row in the right rows' original order, 
+    with pd.merge's column order and '_x'/'_y' suffixes.
+    """
+    if how == "left":
+        unmatched = counts == 0
+        counts = np.where(unmatched, 1, counts)
+    left_rows = np.repeat(np.arange(len(data1)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    right_rows = np.repeat(starts, counts) + offsets
+    if len(order):
+        right_rows = order[np.minimum(right_rows, len(order) - 1)]
+    if how == "left":
+        right_rows[np.repeat(unmatched, counts)] = -1
+
+    overlap = (set(data1.columns) & set(data2.columns)) - {on}
+    columns = {}
+    for column in data1.columns:
+        name = f"{column}_x" if column in overlap else column
+        columns[name] = data1[column].take(left_rows).reset_index(drop=True)
+    for column in data2.columns:
+        if column == on:
+            continue
+        name = f"{column}_y" if column in overlap else column
+        values = data2[column]
+        if pd.api.types.is_extension_array_dtype(values.dtype):
+            values = values.array
+        else:
+            values = values.to_numpy()
+        values = pd.api.extensions.take(values, right_rows, allow_fill=True)
+        columns[name] = pd.Series(values, name=name)
+    return pd.DataFrame(columns)
+
+
+def _warn_many_to_many(data1: pd.DataFrame, data2: pd.DataFrame, on, index) -> None:
+    """
+    Warns when both sides repeat join keys and the matching keys alone 
+    produce more rows than the larger input.
+    """
+    if not isinstance(on, str):
+        return
+    right_duplicates = index.has_duplicates if index is not None else _has_duplicates(data2[on])
+    if not right_duplicates or not _has_duplicates(data1[on]):
+        return
+    counts = pd.concat([
+        data1[on].value_counts(dropna=False).rename("left"),
+        data2[on].value_counts(dropna=False).rename("right"),
+    ], axis=1, join="inner")
+    if not ((counts["left"] > 1) & (counts["right"] > 1)).any():
+        return
+    rows = int((counts["left"] * counts["right"]).sum())
+    if rows <= max(len(data1), len(data2)):
+        return
+    warnings.warn(
+        f"Many-to-many merge on '{on}': keys repeat on both sides, so matching "
+        f"rows alone give {rows} rows from inputs of {len(data1)} and {len(data2)}."
+    )
+
+def merge_many(
+    frames, 
+    on: str, 
+    how: str = "inner", 
+    columns: list = None, 
+    sample_rows: int = 100_000
+) -> pd.DataFrame:
+    """
+    Merges several datasets on one key column, in an order that keeps the 
+    intermediate results small.
+
+    The number of rows and distinct keys of each frame are estimated from 
+    a sample of up to `sample_rows` keys, and the size of a join of two 
+    frames as rows1 * rows2 / max(distinct1, distinct2). Inner merges start 
+    with the pair of frames with the smallest estimated result, then add the 
+    frame that keeps the result smallest. Left merges keep the first frame 
+    as the base and join the frames that repeat keys least first. Outer 
+    merges run in the given order. Before joining, each frame is cut down 
+    to the key and the `columns` it supplies.
+
+    The plan is printed with the estimated and actual rows of each step, 
+    and stored in the result's `attrs["merge_plan"]`. Rows come in the order 
+    the plan produces them; columns follow the order of `frames`. Non-key 
+    columns found in more than one frame get the frame's name as a suffix.
+
+    Args:
+        frames (list or dict): DataFrames to merge, or a dict of {name: DataFrame}.
+        on (str): The key column, present in every frame.
+        how (str): 'inner', 'left' (keep every row of the first frame) or 'outer'.
+        columns (list, optional): Non-key columns to keep. Defaults to all.
+        sample_rows (int): Number of keys sampled per frame for the statistics.
+
+    Returns:
+        pd.DataFrame: The merged dataset.
+
+    Example:
+        >>> merge_many({"orders": orders, "customers": customers, "returns": returns}, 
+                       on="customer_id", columns=["amount", "segment"])
+    """
+    if how not in ("inner", "left", "outer"):
+        raise ValueError("Invalid value for 'how'. Use 'inner', 'left' or 'outer'.")
+    if isinstance(frames, dict):
+        names, frames = list(frames), list(frames.values())
+    else:
+        frames = list(frames)
+        names = [f"frame{i}" for i in range(len(frames))]
+    if len(frames) < 2:
+        raise ValueError("merge_many needs at least two frames.")
+    for name, frame in zip(names, frames):
+        if on not in frame.columns:
+            raise ValueError(f"Column '{on}' not found in frame '{name}'.")
+
+    if columns is not None:
+        available = {c for frame in frames for c in frame.columns}
+        missing = [c for c in columns if c not in available]
+        if missing:
+            raise ValueError(f"Columns {missing} not found in any frame.")
+        frames = [frame[[c for c in frame.columns if c == on or c in columns]] for frame in frames]
+    seen = Counter(c for frame in frames for c in frame.columns if c != on)
+    frames = [
+        frame.rename(columns={c: f"{c}_{name}" for c in frame.columns if c != on and seen[c] > 1})
+        for name, frame in zip(names, frames)
+    ]
+
+    stats = [_key_stats(frame[on], sample_rows) for frame in frames]
+    order = _join_order(stats, how)
+
+    merged, merged_stats, label = frames[order[0]], stats[order[0]], names[order[0]]
+    plan = []
+    for step, i in enumerate(order[1:], start=1):
+        estimate = _estimate_join(merged_stats, stats[i], how)
+        _warn_many_to_many(merged, frames[i], on, None)
+        merged = pd.merge(merged, frames[i], on=on, how=how)
+        plan.append({
+            "step": step, "left": label, "right": names[i], 
+            "estimated_rows": int(estimate[0]), "rows": len(merged),
+        })
+        label = f"({label}, {names[i]})"
+        merged_stats = (len(merged), estimate[1])
+
+    merged = merged[
+        list(frames[0].columns) + [c for frame in frames[1:] for c in frame.columns if c != on]
+    ]
+    merged.attrs["merge_plan"] = plan
+
+    print(f"Join plan for {len(frames)} datasets on '{on}' ({how}):")
+    for entry in plan:
+        print(
+            f"  {entry['step']}. {entry['left']} with {entry['right']}: "
+            f"{entry['estimated_rows']} rows estimated, {entry['rows']} rows"
+        )
+    print(f"Datasets merged successfully using {how} join.")
+    return merged
+
+
+def _key_stats(keys: pd.Series, sample_rows: int):
+    """
+    Returns (rows, estimated distinct keys) of a key column.
+
+    Large columns are sampled and their distinct count is scaled up with 
+    the GEE estimator: keys seen once in the sample stand for 
+    sqrt(rows / sample size) distinct keys each. A sample without repeats 
+    is taken to come from a unique key.
+    """
+    n_rows = len(keys)
+    if n_rows <= sample_rows:
+        return n_rows, max(keys.nunique(dropna=False), 1)
+    counts = keys.sample(n=sample_rows, random_state=0).value_counts(dropna=False)
+    singletons = int((counts == 1).sum())
+    if singletons == len(counts):
+        return n_rows, n_rows  # no repeats in the sample: most likely a unique key
+    distinct = np.sqrt(n_rows / sample_rows) * singletons + (len(counts) - singletons)
+    return n_rows, int(min(max(distinct, len(counts)), n_rows))
+
+
+def _estimate_join(left, right, how):
+    """
+    Estimated (rows, distinct keys) of joining two frames with these stats.
+    """
+    (rows1, distinct1), (rows2, distinct2) = left, right
+    matched = rows1 * rows2 / max(distinct1, distinct2, 1)
+    if how == "inner":
+        return matched, min(distinct1, distinct2)
+    if how == "left":
+        return max(matched, rows1), distinct1
+    return max(matched, rows1, rows2), max(distinct1, distinct2)
+
+
+def _join_order(stats: list, how: str) -> list:
+    """
+    Picks the order in which `merge_many` joins the frames.
+    """
+    if how == "outer":
+        return list(range(len(stats)))
+    if how == "left":
+        # Frames with few rows per key grow the result least
+        return [0] + sorted(range(1, len(stats)), key=lambda i: stats[i][0] / stats[i][1])
+
+    first = min(
+        itertools.combinations(range(len(stats)), 2), 
+        key=lambda pair: _estimate_join(stats[pair[0]], stats[pair[1]], how)[0]
+    )
+    order = list(first)
+    current = _estimate_join(stats[first[0]], stats[first[1]], how)
+    remaining = [i for i in range(len(stats)) if i not in order]
+    while remaining:
+        best = min(remaining, key=lambda i: _estimate_join(current, stats[i], how)[0])
+        current = _estimate_join(current, stats[best], how)
+        order.append(best)
+        remaining.remove(best)
+    return order
+
+
+def concat_datasets(
+    datasets, 
+    axis: int = 0, 
+    overlap: str = "keep"
+) -> pd.DataFrame:
     """
     Concatenates a list of datasets along a specified axis.
 
+    Along rows, columns are matched by name and the schemas are unified 
+    first: the result has the union of the columns, numeric dtypes are 
+    promoted to a common one (integer and boolean columns missing from 
+    some datasets become nullable 'Int64'/'boolean' instead of float or 
+    object), and categorical columns keep their codes under the union of 
+    the categories. Each column is then allocated once and every dataset 
+    is copied into its slice, instead of reindexing each dataset first. 
+    Columns whose dtypes cannot be reconciled become object columns.
+
+    Along columns, names found in more than one dataset are kept as 
+    duplicates, suffixed with the dataset's name, or rejected.
+
     Args:
-        datasets (list[pd.DataFrame]): List of datasets to concatenate.
+        datasets (list or dict): DataFrames to concatenate, or a dict of {name: DataFrame}.
         axis (int): The axis to concatenate along (0 for rows, 1 for columns).
+        overlap (str): For axis=1, what to do with overlapping column names: 
+            'keep', 'suffix' (append '_<name>', with 'frame<i>' names for a 
+            list) or 'error'.
 
     Returns:
         pd.DataFrame: The concatenated dataset.
 
     Example:
         >>> concat_datasets([df1, df2], axis=1)
+        >>> concat_datasets({"left": df1, "right": df2}, axis=1, overlap="suffix")
     """
-    concatenated_data = pd.concat(datasets, axis=axis)
+    if overlap not in ("keep", "suffix", "error"):
+        raise ValueError("Invalid value for 'overlap'. Use 'keep', 'suffix' or 'error'.")
+    if isinstance(datasets, dict):
+        names, datasets = list(datasets), list(datasets.values())
+    else:
+        datasets = list(datasets)
+        names = [f"frame{i}" for i in range(len(datasets))]
+
+    if axis in (1, "columns") and overlap != "keep":
+        seen = Counter(c for data in datasets for c in data.columns)
+        overlapping = sorted({str(c) for c, count in seen.items() if count > 1})
+        if overlapping and overlap == "error":
+            raise ValueError(f"Columns {overlapping} are found in more than one dataset.")
+        datasets = [
+            data.rename(columns={c: f"{c}_{name}" for c in data.columns if seen[c] > 1})
+            for name, data in zip(names, datasets)
+        ]
+
+    if axis in (0, "index") and _can_preallocate(datasets):
+        concatenated_data = _concat_rows(datasets)
+    else:
+        concatenated_data = pd.concat(datasets, axis=axis)
     print(f"Datasets concatenated successfully along axis {axis}.")
-    return concatenated_data
\ No newline at end of file
+    return concatenated_data
+
+
+def concat_files(
+    paths: list, 
+    out_path: str, 
+    chunksize: int = 100_000, 
+    sample_rows: int = 10_000
+) -> None:
+    """
+    Concatenates CSV and Parquet files into one Parquet file, appending 
+    one chunk at a time so only a single chunk is held in memory.
+
+    The schema is unified before any rows are written, with the same rules 
+    as `concat_datasets`: the union of the columns in first-seen order, 
+    promoted numeric dtypes and categorical columns under the union of 
+    their categories. CSV dtypes are inferred from the first `sample_rows` 
+    rows of each file (see `infer_csv_dtypes`); the categories of Parquet 
+    dictionary columns are read from those columns only. Every chunk is 
+    then conformed to the schema, with missing columns filled with nulls. 
+    Files ending in '.parquet' or '.pq' are read as Parquet, others as CSV.
+
+    Requires the optional `pyarrow` package.
+
+    Args:
+        paths (list): Paths of the files to concatenate, in order.
+        out_path (str): Path of the Parquet file to write.
+        chunksize (int): Number of rows per chunk read and written.
+        sample_rows (int): Number of rows sampled to infer each CSV file's dtypes.
+
+    Raises:
+        ValueError: If no paths are given, or an object column holds 
+            values of different types in different files.
+
+    Example:
+        >>> concat_files(sorted(glob.glob("data/sales_*.csv")), "data/sales.parquet")
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("concat_files requires the optional 'pyarrow' package.")
+    paths = list(paths)
+    if not paths:
+        raise ValueError("concat_files needs at least one path.")
+
+    schemas, arrow_types = [], []
+    for path in paths:
+        schema, types = _file_schema(path, sample_rows)
+        schemas.append(schema)
+        arrow_types.append(types)
+    dtypes = _unify_schemas(schemas)
+
+    empty = pd.DataFrame({c: pd.Series(dtype=d) for c, d in dtypes.items()})
+    schema = pa.Schema.from_pandas(empty, preserve_index=False)
+    for column, dtype in dtypes.items():
+        if dtype != object:
+            continue
+        found = {}
+        for types in arrow_types:
+            if column in types:
+                kind = types[column]
+                kind = kind.value_type if pa.types.is_dictionary(kind) else kind
+                found[str(kind)] = kind
+        found.pop("null", None)
+        if len(found) > 1:
+            raise ValueError(
+                f"Column '{column}' holds values of different types in different files: "
+                f"{sorted(found)}."
+            )
+        field = schema.get_field_index(str(column))
+        schema = schema.set(field, pa.field(str(column), next(iter(found.values()), pa.string())))
+
+    n_rows = 0
+    with pq.ParquetWriter(out_path, schema) as writer:
+        for path, file_dtypes in zip(paths, schemas):
+            for chunk in _file_chunks(path, chunksize, file_dtypes):
+                chunk = _conform(chunk, dtypes)
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+                n_rows += len(chunk)
+    print(f"{len(paths)} files concatenated into {out_path}: {n_rows} rows, {len(dtypes)} columns.")
+
+
+def _is_parquet_path(path) -> bool:
+    return str(path).lower().endswith((".parquet", ".pq"))
+
+
+def _file_schema(path, sample_rows: int):
+    """
+    Returns ({column: pandas dtype}, {column: arrow type}) of a file.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if not _is_parquet_path(path):
+        dtypes = {c: pd.api.types.pandas_dtype(d) for c, d in infer_csv_dtypes(path, sample_rows).items()}
+        return dtypes, {c: pa.string() for c, d in dtypes.items() if d == object}
+
+    parquet = pq.ParquetFile(path)
+    arrow_schema = parquet.schema_arrow
+    dtypes = dict(arrow_schema.empty_table().to_pandas().dtypes.items())
+    for column, dtype in dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            chunks = parquet.read(columns=[column]).column(column).chunks
+            categories = pd.Index([], dtype=object)
+            for chunk in chunks:
+                categories = categories.append(pd.Index(chunk.dictionary.to_pandas())).unique()
+            dtypes[column] = pd.CategoricalDtype(categories, ordered=dtype.ordered)
+    return dtypes, {f.name: f.type for f in arrow_schema}
+
+
+def _file_chunks(path, chunksize: int, dtypes: dict):
+    if _is_parquet_path(path):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from iter_csv(path, chunksize=chunksize, dtype=dtypes)
+
+
+def _unify_schemas(schemas: list) -> dict:
+    """
+    Unifies several {column: dtype} schemas into one.
+    """
+    columns = {}
+    for schema in schemas:
+        for column, dtype in schema.items():
+            columns.setdefault(column, []).append(dtype)
+    return {
+        column: _unify_dtype(list(dict.fromkeys(dtypes)), partial=len(dtypes) < len(schemas))
+        for column, dtypes in columns.items()
+    }
+
+
+def _unify_dtype(dtypes: list, partial: bool):
+    """
+    Returns a dtype that holds the values of all `dtypes`, and nulls if 
+    `partial` (the column is missing from some of the inputs).
+    """
+    first = dtypes[0]
+    if all(isinstance(d, pd.CategoricalDtype) for d in dtypes):
+        if all(d == first for d in dtypes):
+            return first
+        categories = first.categories
+        for dtype in dtypes[1:]:
+            categories = categories.append(dtype.categories).unique()
+        return pd.CategoricalDtype(categories)
+
+    if all(_is_numeric(d) for d in dtypes):
+        nullable = partial or any(isinstance(d, pd.api.extensions.ExtensionDtype) for d in dtypes)
+        result = np.result_type(*(getattr(d, "numpy_dtype", d) for d in dtypes))
+        if result.kind == "f":
+            if any(isinstance(d, pd.api.extensions.ExtensionDtype) and d.kind == "f" for d in dtypes):
+                return pd.api.types.pandas_dtype(result.name.capitalize())
+            return result
+        if result.kind in "iu" and nullable:
+            prefix = "Int" if result.kind == "i" else "UInt"
+            return pd.api.types.pandas_dtype(f"{prefix}{result.itemsize * 8}")
+        if result.kind == "b" and nullable:
+            return pd.BooleanDtype()
+        return result
+
+    if all(d == first for d in dtypes):
+        return first
+    for kind in "mM":
+        if all(isinstance(d, np.dtype) and d.kind == kind for d in dtypes):
+            return np.result_type(*dtypes)  # the finest of the units
+    if all(isinstance(d, pd.DatetimeTZDtype) for d in dtypes) and len({str(d.tz) for d in dtypes}) == 1:
+        unit = min((d.unit for d in dtypes), key=lambda u: np.timedelta64(1, u).astype("m8[ns]"))
+        return pd.DatetimeTZDtype(unit=unit, tz=first.tz)
+    # Anything else, e.g. dates with strings or different time zones, is 
+    # kept as objects (Timestamps stay boxed, as in pd.concat)
+    return np.dtype(object)
+
+
+def _is_numeric(dtype) -> bool:
+    return (
+        not isinstance(dtype, pd.CategoricalDtype)
+        and (pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_bool_dtype(dtype))
+        and getattr(dtype, "numpy_dtype", dtype).kind in "biuf"
+    )
+
+
+def _conform(chunk: pd.DataFrame, dtypes: dict) -> pd.DataFrame:
+    """
+    Casts a chunk to a unified schema, adding its missing columns as nulls.
+    """
+    columns = {}
+    for column, dtype in dtypes.items():
+        if column not in chunk.columns:
+            columns[column] = pd.Series(index=chunk.index, dtype=dtype)
+        elif chunk[column].dtype != dtype:
+            columns[column] = chunk[column].astype(dtype)
+        else:
+            columns[column] = chunk[column]
+    return pd.DataFrame(columns, index=chunk.index)
+
+
+def _can_preallocate(datasets: list) -> bool:
+    return len(datasets) > 1 and all(
+        isinstance(data, pd.DataFrame) 
+        and not isinstance(data.columns, pd.MultiIndex) 
+        and data.columns.is_unique
+        for data in datasets
+    )
+
+
+def _concat_rows(datasets: list) -> pd.DataFrame:
+    """
+    Concatenates DataFrames along rows into columns allocated once with 
+    the unified dtypes.
+    """
+    dtypes = _unify_schemas([dict(data.dtypes.items()) for data in datasets])
+    n_rows = sum(len(data) for data in datasets)
+    columns = {column: _allocate_column(dtype, n_rows) for column, dtype in dtypes.items()}
+    start = 0
+    for data in datasets:
+        end = start + len(data)
+        for column, part in data.items():
+            _copy_part(columns[column], dtypes[column], part, start, end)
+        for column in dtypes.keys() - set(data.columns):
+            _copy_part(columns[column], dtypes[column], None, start, end)
+        start = end
+    index = datasets[0].index.append([data.index for data in datasets[1:]])
+    return pd.DataFrame(
+        {column: _finish_column(values, dtypes[column]) for column, values in columns.items()}, 
+        index=index, 
+        copy=False
+    )
+
+
+def _allocate_column(dtype, n_rows: int):
+    if isinstance(dtype, pd.CategoricalDtype):
+        return np.empty(n_rows, dtype=np.int32)  # category codes
+    if isinstance(dtype, np.dtype):
+        return np.empty(n_rows, dtype=dtype)
+    if _is_masked(dtype):
+        return np.empty(n_rows, dtype=dtype.numpy_dtype), np.empty(n_rows, dtype=bool)
+    return []  # other extension dtypes (tz-aware, string, ...) are concatenated by pandas
+
+
+def _is_masked(dtype) -> bool:
+    """
+    Whether `dtype` is a nullable dtype stored as a values array and a mask.
+    """
+    return isinstance(dtype, pd.api.extensions.ExtensionDtype) and issubclass(
+        dtype.construct_array_type(), 
+        (pd.arrays.BooleanArray, pd.arrays.IntegerArray, pd.arrays.FloatingArray)
+    )
+
+
+def _copy_part(values, dtype, part, start: int, end: int) -> None:
+    """
+    Copies one dataset's part of a column (None if it lacks the column) 
+    into the column's rows start:end.
+    """
+    if isinstance(values, list):
+        if part is None:
+            part = pd.Series(index=range(end - start), dtype=dtype)
+        values.append(part.astype(dtype).array)
+    elif isinstance(values, tuple):
+        data, mask = values
+        if part is None:
+            data[start:end] = 0
+            mask[start:end] = True
+        else:
+            mask[start:end] = part.isna().to_numpy()
+            data[start:end] = part.to_numpy(dtype=dtype.numpy_dtype, na_value=dtype.numpy_dtype.type(0))
+    elif isinstance(dtype, pd.CategoricalDtype):
+        if part is None:
+            values[start:end] = -1
+        else:
+            values[start:end] = (part.array if part.dtype == dtype else pd.Categorical(part, dtype=dtype)).codes
+    elif part is None:
+        values[start:end] = np.array("NaT", dtype=dtype) if dtype.kind in "mM" else np.nan
+    elif dtype.kind == "f" and isinstance(part.dtype, pd.api.extensions.ExtensionDtype):
+        values[start:end] = part.to_numpy(dtype=dtype, na_value=np.nan)
+    elif dtype == object:
+        # Boxes datetimes as Timestamps rather than writing their raw integers
+        values[start:end] = part.astype(object).to_numpy()
+    else:
+        values[start:end] = part.to_numpy()
+
+
+def _finish_column(values, dtype):
+    if isinstance(values, list):
+        return pd.concat([pd.Series(part, copy=False) for part in values], ignore_index=True).array
+    if isinstance(values, tuple):
+        return dtype.construct_array_type()(*values)
+    if isinstance(dtype, pd.CategoricalDtype):
+        return pd.Categorical.from_codes(values, dtype=dtype)
+    return values
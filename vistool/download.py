@@ -7,64 +7,772 @@ Features:
         3. load_csv file :  Loads a CSV file into a Pandas DataFrame from local path.
         4. load_excel : Load excel file into a Pandas DataFrame from local path. 
         5. summarize_data:   Summarizes key aspects of the dataset and provides an overview of its structure.
-    - Suggested:
-        - Add support for downloading multiple files simultaneously.
-        - Add retry mechanism in case of failed downloads.
+        6. `download_files`: Downloads many files concurrently over a shared, pooled session.
+        7. Resumable downloads: `download_file` retries with backoff and resumes 
+            partial files using HTTP Range requests.
+        8. `HTTPCache`: On-disk, size-bounded LRU cache with ETag/Last-Modified 
+            revalidation, used by `download_csv(..., cache=...)`.
+        9. Streaming `download_csv(..., stream=True, chunksize=...)`: Parses the 
+            response bytes as they arrive, with gzip/zip decompression.
+        10. `iter_csv`: Reads a local CSV in chunks with a dtype map inferred 
+            once from a head sample (`infer_csv_dtypes`).
+        11. `ColumnarCache`: Opt-in Parquet sidecar cache with column projection 
+            for `load_csv` and `load_excel`.
+        12. `load_excel_sheets`: Loads many sheets of a workbook in parallel 
+            worker processes, optionally through the columnar cache.
+        13. `profile_data`: Builds a structured, serializable `Profile` in one pass 
+            per column, with an optional sampling mode. `summarize_data` renders it.
+        14. `StreamingProfiler` / `profile_chunks`: Mergeable constant-memory profiling 
+            of chunked sources, with HyperLogLog distinct counts.
+        15. `optimize_dtypes`: Downcasts numerics and converts low-cardinality 
+            strings to categories, exposed as `compact=True` on the loaders.
 """
 
+import os
+import copy
+import json
+import time
+import random
+import hashlib
+import shutil
+import tempfile
+import warnings
+import threading
 import requests
+import numpy as np
 import pandas as pd
+from dataclasses import dataclass, asdict
+from io import BytesIO, StringIO
 from pathlib import Path
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 
-def download_file(url: str, save_path: str) -> None:
+RETRY_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+def download_file(
+    url: str, 
+    save_path: str, 
+    session: requests.Session = None,
+    chunk_size: int = 1024 * 1024,
+    retries: int = 3,
+    backoff: float = 0.5
+) -> None:
     """
     Downloads a file from the given URL and saves it to the specified path.
 
+    The body is streamed into `<save_path>.part`, which is renamed to 
+    `save_path` once complete. If the transfer drops, the download is retried 
+    with exponential backoff and jitter, and resumes from the end of the 
+    partial file with an HTTP `Range` request when the server supports it. 
+    A `.part` file left by an earlier interrupted call is resumed as well, 
+    provided the remote file has not changed since (checked with `If-Range`).
+
     Args:
         url (str): The URL of the file to download.
         save_path (str): The path where the file will be saved.
+        session (requests.Session, optional): Session to reuse pooled 
+            connections from. A one-off request is made if not given.
+        chunk_size (int): Number of bytes read and written per chunk.
+        retries (int): Number of extra attempts after a connection error, 
+            an incomplete body or a retryable status (408, 429, 5xx).
+        backoff (float): Base delay in seconds. Attempt n waits a random 
+            time between 0 and `backoff * 2 ** n` seconds.
 
     Returns:
         None
 
+    Raises:
+        requests.RequestException: If the download still fails after all retries.
+
     Example:
         >>> download_file("https://example.com/file.txt", "data/file.txt")
     """
-    response = requests.get(url, stream=True)
-    response.raise_for_status()
-    with open(save_path, "wb") as file:
-        for chunk in response.iter_content(chunk_size=8192):
-            file.write(chunk)
+    getter = session.get if session is not None else requests.get
+    save_path = Path(save_path)
+    part_path = save_path.with_name(save_path.name + ".part")
+
+    for attempt in range(retries + 1):
+        try:
+            _download_part(getter, url, part_path, chunk_size)
+            break
+        except requests.RequestException as e:
+            response = getattr(e, "response", None)
+            retryable = response is None or response.status_code in RETRY_STATUS_CODES
+            if not retryable or attempt == retries:
+                raise
+            time.sleep(random.uniform(0, backoff * 2 ** attempt))
+
+    os.replace(part_path, save_path)
+    _validator_path(part_path).unlink(missing_ok=True)
     print(f"File downloaded successfully: {save_path}")
 
-def download_csv(url: str) -> pd.DataFrame:
+
+def _download_part(getter, url: str, part_path: Path, chunk_size: int) -> None:
+    """
+    Makes one attempt at completing `part_path`, resuming from its current size.
+
+    The validator (strong `ETag` or `Last-Modified`) of the response that 
+    started the partial file is kept in `<part_path>.validator` and sent as 
+    `If-Range` when resuming, so a server whose file has changed replies 
+    with the whole new body instead of a range of it. A partial file 
+    without a validator cannot be checked and is started over.
+    """
+    validator_path = _validator_path(part_path)
+    offset = part_path.stat().st_size if part_path.exists() else 0
+    validator = validator_path.read_text() if validator_path.exists() else None
+    headers = {}
+    if offset and validator:
+        headers = {"Range": f"bytes={offset}-", "If-Range": validator}
+    else:
+        offset = 0
+
+    with getter(url, stream=True, headers=headers) as response:
+        if response.status_code == 416:
+            # The partial file does not match the remote one, start over.
+            part_path.unlink()
+            validator_path.unlink(missing_ok=True)
+            raise requests.ConnectionError(f"Range not satisfiable for {url}, restarting.")
+        response.raise_for_status()
+
+        # A 200 instead of 206 means the server ignored the range request, 
+        # or the file changed since the partial file was started.
+        mode = "ab" if response.status_code == 206 else "wb"
+        if mode == "wb":
+            offset = 0
+            validator = _response_validator(response)
+            if validator:
+                validator_path.write_text(validator)
+            else:
+                validator_path.unlink(missing_ok=True)
+        expected = response.headers.get("Content-Length")
+
+        written = 0
+        with open(part_path, mode) as file:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                file.write(chunk)
+                written += len(chunk)
+
+    if expected is not None and written < int(expected):
+        raise requests.ConnectionError(
+            f"Incomplete download from {url}: {offset + written} bytes received."
+        )
+
+
+def _validator_path(part_path: Path) -> Path:
+    return part_path.with_name(part_path.name + ".validator")
+
+
+def _response_validator(response) -> str:
+    """
+    Returns the response's `If-Range` validator, or None. Weak ETags are 
+    not allowed in `If-Range`.
+    """
+    etag = response.headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return response.headers.get("Last-Modified")
+
+
+def download_files(
+    urls, 
+    dest_dir: str, 
+    max_workers: int = 8,
+    retries: int = 3
+) -> tuple[dict, dict]:
+    """
+    Downloads several files concurrently into a directory.
+
+    All downloads share one `requests.Session` whose connection pool is 
+    sized to `max_workers`, so repeated requests to the same host reuse 
+    open TCP/TLS connections instead of handshaking for every file. A 
+    failed download is recorded and does not stop the rest of the batch.
+
+    Args:
+        urls (list or dict): URLs to download. The file name is taken from 
+            the last part of each URL path. Pass a dict of {url: file_name} 
+            to choose the names yourself.
+        dest_dir (str): Directory the files are saved into. Created if missing.
+        max_workers (int): Maximum number of concurrent downloads.
+        retries (int): Retries per file, see `download_file`.
+
+    Returns:
+        tuple[dict, dict]: A dict of {url: saved Path} for the successful 
+        downloads and a dict of {url: exception} for the failed ones.
+
+    Raises:
+        ValueError: If `max_workers` is not positive or two URLs would be 
+            saved under the same file name.
+
+    Example:
+        >>> downloaded, failed = download_files(
+                ["https://example.com/a.csv", "https://example.com/b.csv"], 
+                "data", max_workers=4
+            )
+    """
+    if max_workers < 1:
+        raise ValueError("'max_workers' must be at least 1.")
+
+    if not isinstance(urls, dict):
+        urls = {url: Path(urlparse(url).path).name for url in urls}
+
+    dest_dir = Path(dest_dir)
+    targets = {}
+    seen = set()
+    for url, name in urls.items():
+        if not name:
+            raise ValueError(f"Cannot derive a file name from URL '{url}'.")
+        if name in seen:
+            raise ValueError(f"More than one URL would be saved as '{name}'.")
+        seen.add(name)
+        targets[url] = dest_dir / name
+    dest_dir.mkdir(parents=True, exist_ok=True)
+
+    downloaded, failed = {}, {}
+    with requests.Session() as session:
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=max_workers, pool_maxsize=max_workers
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    download_file, url, path, session=session, retries=retries
+                ): url
+                for url, path in targets.items()
+            }
+            for future in as_completed(futures):
+                url = futures[future]
+                try:
+                    future.result()
+                    downloaded[url] = targets[url]
+                except Exception as e:
+                    failed[url] = e
+
+    print(f"{len(downloaded)} of {len(targets)} files downloaded successfully.")
+    return downloaded, failed
+
+class HTTPCache:
+    """
+    On-disk cache of HTTP responses keyed by URL, with conditional revalidation.
+
+    Bodies are stored content-addressed (named by their SHA-256 digest) under 
+    `cache_dir`, alongside an `index.json` holding each URL's `ETag` and 
+    `Last-Modified` validators. A cached URL is revalidated with 
+    `If-None-Match` / `If-Modified-Since`, and a `304 Not Modified` reply is 
+    served from disk without transferring the body again. When the stored 
+    bodies exceed `max_bytes`, the least recently used entries are evicted; 
+    the body just fetched is always kept, so a single body larger than 
+    `max_bytes` stays cached until the next fetch stores another.
+
+    Args:
+        cache_dir (str): Directory holding the cached bodies and index.
+        max_bytes (int): Upper bound on the total size of cached bodies.
+
+    Attributes:
+        hits (int): Requests answered from the cache after a 304.
+        misses (int): Requests that transferred the full body.
+
+    Example:
+        >>> cache = HTTPCache("~/.cache/vistool")
+        >>> df = download_csv("https://example.com/data.csv", cache=cache)
+        >>> cache.stats()
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 512 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.blob_dir = self.cache_dir / "blobs"
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.cache_dir / "index.json"
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._index = {}
+        if self.index_path.exists():
+            with open(self.index_path) as f:
+                self._index = json.load(f)
+
+    def fetch(self, url: str, session: requests.Session = None) -> Path:
+        """
+        Returns the path of an up-to-date cached copy of `url`'s body.
+
+        Args:
+            url (str): The URL to fetch.
+            session (requests.Session, optional): Session to send the request with.
+
+        Returns:
+            Path: The cached file holding the response body.
+        """
+        getter = session.get if session is not None else requests.get
+        with self._lock:
+            entry = self._index.get(url)
+        headers = {}
+        if entry and (self.blob_dir / entry["digest"]).exists():
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        with getter(url, stream=True, headers=headers) as response:
+            if response.status_code == 304 and headers:
+                with self._lock:
+                    self.hits += 1
+                    entry["last_access"] = time.time()
+                    self._save_index()
+                return self.blob_dir / entry["digest"]
+
+            response.raise_for_status()
+            digest = hashlib.sha256()
+            size = 0
+            tmp_fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(tmp_fd, "wb") as file:
+                    for chunk in response.iter_content(chunk_size=1024 * 1024):
+                        digest.update(chunk)
+                        file.write(chunk)
+                        size += len(chunk)
+                blob_path = self.blob_dir / digest.hexdigest()
+                os.replace(tmp_name, blob_path)
+            except BaseException:
+                if os.path.exists(tmp_name):
+                    os.remove(tmp_name)
+                raise
+
+            with self._lock:
+                self.misses += 1
+                self._index[url] = {
+                    "digest": digest.hexdigest(),
+                    "size": size,
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                    "last_access": time.time(),
+                }
+                self._evict(keep=url)
+                self._save_index()
+        return blob_path
+
+    def stats(self) -> dict:
+        """
+        Returns the hit/miss counters and the current size of the cache.
+
+        Returns:
+            dict: Keys 'hits', 'misses', 'entries' and 'bytes'.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._index),
+                "bytes": self._total_bytes(),
+            }
+
+    def clear(self) -> None:
+        """
+        Removes every cached body and index entry.
+        """
+        with self._lock:
+            for blob in self.blob_dir.iterdir():
+                blob.unlink()
+            self._index = {}
+            self._save_index()
+
+    def _total_bytes(self) -> int:
+        # Identical bodies from different URLs share one blob
+        sizes = {e["digest"]: e["size"] for e in self._index.values()}
+        return sum(sizes.values())
+
+    def _evict(self, keep: str = None) -> None:
+        # The entry just stored is never evicted, as its path is returned
+        by_age = sorted(
+            (u for u in self._index if u != keep), key=lambda u: self._index[u]["last_access"]
+        )
+        while self._total_bytes() > self.max_bytes and by_age:
+            digest = self._index.pop(by_age.pop(0))["digest"]
+            if not any(e["digest"] == digest for e in self._index.values()):
+                (self.blob_dir / digest).unlink(missing_ok=True)
+
+    def _save_index(self) -> None:
+        tmp_path = self.index_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, self.index_path)
+
+
+COMPRESSION_SUFFIXES = {
+    ".gz": "gzip", ".zip": "zip", ".bz2": "bz2", ".xz": "xz", ".zst": "zstd"
+}
+
+
+def download_csv(
+    url: str, 
+    cache: HTTPCache = None,
+    stream: bool = False,
+    chunksize: int = None,
+    compression: str = "infer"
+):
     """
     Downloads a CSV file from the given URL and loads it into a Pandas DataFrame.
 
+    With `stream=True` the raw response bytes are fed straight into 
+    `pd.read_csv` as they arrive, instead of first decoding the whole body 
+    into a string. Passing `chunksize` implies streaming and returns an 
+    iterator of DataFrames, so peak memory is bounded by the chunk size 
+    rather than by the file size.
+
     Args:
         url (str): The URL of the CSV file.
+        cache (HTTPCache, optional): Cache to revalidate against, so an 
+            unchanged file is read from disk instead of downloaded again.
+        stream (bool): Parse the response while it is being received.
+        chunksize (int, optional): Number of rows per DataFrame yielded.
+        compression (str, optional): 'gzip', 'zip', 'bz2', 'xz', 'zstd' or 
+            None. By default it is inferred from the URL's file extension.
 
     Returns:
-        pd.DataFrame: The loaded DataFrame.
+        pd.DataFrame or Iterator[pd.DataFrame]: The loaded DataFrame, or an 
+        iterator of DataFrames if `chunksize` is given.
 
     Example:
         >>> df = download_csv("https://example.com/data.csv")
+        >>> for chunk in download_csv("https://example.com/big.csv.gz", chunksize=100_000):
+        ...     process(chunk)
     """
+    if compression == "infer":
+        compression = COMPRESSION_SUFFIXES.get(Path(urlparse(url).path).suffix.lower())
+
+    if cache is not None:
+        path = cache.fetch(url)
+        if chunksize:
+            return _iter_csv_chunks(path, chunksize, compression)
+        dataframe = pd.read_csv(path, compression=compression)
+        print("CSV loaded into a DataFrame successfully.")
+        return dataframe
+
+    if stream or chunksize:
+        response = requests.get(url, stream=True)
+        response.raise_for_status()
+        # Undo any gzip/deflate transfer encoding while reading the raw socket
+        response.raw.decode_content = True
+        source = response.raw
+        if compression == "zip":
+            # Zip archives need a seekable file, so spool to disk past 64 MB
+            source = tempfile.SpooledTemporaryFile(max_size=64 * 1024 * 1024)
+            shutil.copyfileobj(response.raw, source, 1024 * 1024)
+            source.seek(0)
+        if chunksize:
+            return _iter_csv_chunks(source, chunksize, compression, response)
+        with response:
+            dataframe = pd.read_csv(source, compression=compression)
+        print("CSV streamed into a DataFrame successfully.")
+        return dataframe
+
     response = requests.get(url)
     response.raise_for_status()
-    from io import StringIO
-    csv_data = StringIO(response.text)
-    dataframe = pd.read_csv(csv_data)
+    if compression:
+        csv_data = BytesIO(response.content)
+    else:
+        csv_data = StringIO(response.text)
+    dataframe = pd.read_csv(csv_data, compression=compression)
     print("CSV downloaded and loaded into a DataFrame successfully.")
     return dataframe
 
 
-def load_csv(file_path: str) -> pd.DataFrame:
+def _iter_csv_chunks(source, chunksize: int, compression: str, response=None):
+    """
+    Yields DataFrames of `chunksize` rows from `source`, closing `response` at the end.
+    """
+    try:
+        n_chunks = 0
+        with pd.read_csv(source, chunksize=chunksize, compression=compression) as reader:
+            for chunk in reader:
+                n_chunks += 1
+                yield chunk
+        print(f"CSV streamed in {n_chunks} chunks successfully.")
+    finally:
+        if response is not None:
+            response.close()
+
+
+class ColumnarCache:
+    """
+    Opt-in Parquet sidecar cache for `load_csv` and `load_excel`.
+
+    After a file is parsed once, the DataFrame is written to a Parquet file 
+    under `cache_dir` and read back from there on later loads, which is much 
+    faster than parsing CSV text or an Excel workbook again and can read 
+    just the columns asked for. A sidecar is reused while the source file's 
+    size and content hash are unchanged; the hash is only recomputed when 
+    the file's size or modification time differ from the recorded ones. When 
+    the sidecars exceed `max_bytes`, the least recently used ones are evicted.
+
+    Requires the optional `pyarrow` package.
+
+    Args:
+        cache_dir (str): Directory holding the Parquet sidecars and their metadata.
+        max_bytes (int): Upper bound on the total size of the sidecars.
+
+    Attributes:
+        hits (int): Loads served from a sidecar.
+        misses (int): Loads that had to parse the source file.
+
+    Example:
+        >>> cache = ColumnarCache("~/.cache/vistool/columnar")
+        >>> df = load_excel("data/titanic3.xls", sheet_name=0, cache=cache)
+        >>> ages = load_excel("data/titanic3.xls", sheet_name=0, cache=cache, columns=["age"])
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 2 * 1024 ** 3):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError("ColumnarCache requires the optional 'pyarrow' package.")
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def read(self, source: str, part: str, columns: list = None):
+        """
+        Returns the cached DataFrame for `part` of `source`, or None if stale or missing.
+
+        Args:
+            source (str): Path of the source file.
+            part (str): Which part of the source, e.g. 'csv' or a sheet name.
+            columns (list, optional): Only read these columns.
+
+        Returns:
+            pd.DataFrame or None: The cached data, or None on a cache miss.
+        """
+        with self._lock:
+            meta = self._valid_meta(Path(source))
+            entry = meta["parts"].get(part) if meta else None
+            if entry is None or not (self.cache_dir / entry["file"]).exists():
+                self.misses += 1
+                return None
+            self.hits += 1
+            entry["last_access"] = time.time()
+            self._save_meta(Path(source), meta)
+        return pd.read_parquet(self.cache_dir / entry["file"], columns=columns)
+
+    def write(self, source: str, part: str, df: pd.DataFrame) -> bool:
+        """
+        Stores `df` as the sidecar for `part` of `source`.
+
+        DataFrames Parquet cannot represent (for example non-string column 
+        names or mixed-type object columns) are skipped with a warning.
+
+        Args:
+            source (str): Path of the source file.
+            part (str): Which part of the source, e.g. 'csv' or a sheet name.
+            df (pd.DataFrame): The parsed data.
+
+        Returns:
+            bool: Whether the sidecar was written.
+        """
+        source = Path(source)
+        with self._lock:
+            # Validate first, so sidecars of a changed file are dropped before writing
+            meta = self._valid_meta(source) or self._new_meta(source)
+
+        file_name = f"{self._key(source)}-{hashlib.sha256(part.encode()).hexdigest()[:16]}.parquet"
+        tmp_path = self.cache_dir / (file_name + ".tmp")
+        try:
+            df.to_parquet(tmp_path)
+        except Exception as e:
+            tmp_path.unlink(missing_ok=True)
+            warnings.warn(f"Could not cache '{source}' ({part}) as Parquet: {e}")
+            return False
+        os.replace(tmp_path, self.cache_dir / file_name)
+
+        with self._lock:
+            meta["parts"][part] = {
+                "file": file_name,
+                "bytes": (self.cache_dir / file_name).stat().st_size,
+                "last_access": time.time(),
+            }
+            self._save_meta(source, meta)
+            self._evict()
+        return True
+
+    def stats(self) -> dict:
+        """
+        Returns the hit/miss counters and the current size of the cache.
+
+        Returns:
+            dict: Keys 'hits', 'misses', 'entries' and 'bytes'.
+        """
+        with self._lock:
+            entries = [e for _, meta in self._all_meta() for e in meta["parts"].values()]
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(entries),
+                "bytes": sum(e["bytes"] for e in entries),
+            }
+
+    def clear(self) -> None:
+        """
+        Removes every sidecar and its metadata.
+        """
+        with self._lock:
+            for path in self.cache_dir.iterdir():
+                if path.suffix in (".parquet", ".json"):
+                    path.unlink()
+
+    def _key(self, source: Path) -> str:
+        return hashlib.sha256(str(source.resolve()).encode()).hexdigest()[:16]
+
+    def _meta_path(self, source: Path) -> Path:
+        return self.cache_dir / f"{self._key(source)}.json"
+
+    def _new_meta(self, source: Path) -> dict:
+        stat = source.stat()
+        return {
+            "source": str(source.resolve()),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": _file_sha256(source),
+            "parts": {},
+        }
+
+    def _valid_meta(self, source: Path):
+        """
+        Loads the metadata for `source`, dropping it if the file has changed.
+        """
+        meta_path = self._meta_path(source)
+        if not meta_path.exists():
+            return None
+        with open(meta_path) as f:
+            meta = json.load(f)
+        stat = source.stat()
+        if stat.st_size == meta["size"] and stat.st_mtime_ns == meta["mtime_ns"]:
+            return meta
+        if stat.st_size == meta["size"] and _file_sha256(source) == meta["sha256"]:
+            # Touched or copied but not modified
+            meta["mtime_ns"] = stat.st_mtime_ns
+            return meta
+        self._drop(meta_path, meta)
+        return None
+
+    def _drop(self, meta_path: Path, meta: dict) -> None:
+        for entry in meta["parts"].values():
+            (self.cache_dir / entry["file"]).unlink(missing_ok=True)
+        meta_path.unlink(missing_ok=True)
+
+    def _save_meta(self, source: Path, meta: dict) -> None:
+        meta_path = self._meta_path(source)
+        tmp_path = meta_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+    def _all_meta(self):
+        for meta_path in self.cache_dir.glob("*.json"):
+            with open(meta_path) as f:
+                yield meta_path, json.load(f)
+
+    def _evict(self) -> None:
+        metas = dict(self._all_meta())
+        entries = sorted(
+            ((e["last_access"], path, part) for path, meta in metas.items() 
+             for part, e in meta["parts"].items())
+        )
+        total = sum(metas[path]["parts"][part]["bytes"] for _, path, part in entries)
+        for _, meta_path, part in entries:
+            if total <= self.max_bytes:
+                break
+            meta = metas[meta_path]
+            entry = meta["parts"].pop(part)
+            (self.cache_dir / entry["file"]).unlink(missing_ok=True)
+            total -= entry["bytes"]
+            with open(meta_path, "w") as f:
+                json.dump(meta, f)
+
+
+def _file_sha256(path: Path) -> str:
+    """
+    Hashes a file in 1 MB blocks.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def optimize_dtypes(df: pd.DataFrame, category_ratio: float = 0.5) -> pd.DataFrame:
+    """
+    Shrinks a DataFrame's memory footprint by choosing smaller dtypes.
+
+    - Integer columns are downcast to the smallest signed int that holds them.
+    - Float columns become float32 only when every value survives the round 
+      trip unchanged, so no precision is lost.
+    - Object columns with few distinct values relative to their length 
+      become `category`.
+
+    Each column is converted with whole-array operations, so the run time 
+    is linear in the size of the data. The memory usage before and after 
+    is printed.
+
+    Args:
+        df (pd.DataFrame): The dataset to compact.
+        category_ratio (float): Object columns whose number of distinct 
+            values is at most this fraction of their length become categorical.
+
+    Returns:
+        pd.DataFrame: A compacted copy of the dataset.
+
+    Example:
+        >>> df = optimize_dtypes(load_excel("data/titanic3.xls", sheet_name=0))
+    """
+    before = df.memory_usage(deep=True).sum()
+    compacted = []
+    for position in range(df.shape[1]):
+        series = df.iloc[:, position]
+        dtype = series.dtype
+        if pd.api.types.is_integer_dtype(dtype) and not pd.api.types.is_extension_array_dtype(dtype):
+            series = pd.to_numeric(series, downcast="integer")
+        elif dtype == np.float64:
+            values = series.to_numpy()
+            as_float32 = values.astype(np.float32)
+            if np.array_equal(as_float32.astype(np.float64), values, equal_nan=True):
+                series = pd.Series(as_float32, index=series.index, name=series.name)
+        elif dtype == object and len(series):
+            if series.nunique(dropna=True) <= category_ratio * len(series):
+                series = series.astype("category")
+        compacted.append(series)
+    result = pd.concat(compacted, axis=1) if compacted else df.copy()
+    result.columns = df.columns
+
+    after = result.memory_usage(deep=True).sum()
+    saved = (1 - after / before) * 100 if before else 0.0
+    print(
+        f"Memory usage reduced from {before / 1024 ** 2:.2f} MB to "
+        f"{after / 1024 ** 2:.2f} MB ({saved:.1f}% smaller)."
+    )
+    return result
+
+
+def load_csv(
+    file_path: str, 
+    cache: ColumnarCache = None, 
+    columns: list = None,
+    compact: bool = False
+) -> pd.DataFrame:
     """
     Loads a CSV file into a Pandas DataFrame.
 
     Parameters:
         file_path (str): The path to the CSV file.
+        cache (ColumnarCache, optional): Sidecar cache to read from, or to 
+            populate after parsing.
+        columns (list, optional): Only return these columns.
+        compact (bool): Shrink the dtypes with `optimize_dtypes`.
 
     Returns:
         pd.DataFrame: A DataFrame containing the CSV data.
@@ -73,19 +781,140 @@ def load_csv(file_path: str) -> pd.DataFrame:
         ValueError: If the file cannot be loaded.
     """
     try:
-        df = pd.read_csv(file_path)
+        if cache is not None:
+            df = cache.read(file_path, "csv", columns=columns)
+            if df is None:
+                df = pd.read_csv(file_path)
+                cache.write(file_path, "csv", df)
+                df = df[columns] if columns is not None else df
+        else:
+            df = pd.read_csv(file_path, usecols=columns)
+        if compact:
+            df = optimize_dtypes(df)
         print(f"File '{file_path}' loaded successfully!")
         return df
     except Exception as e:
         raise ValueError(f"Error loading CSV file: {e}")
 
-def load_excel(file_path: str, sheet_name: str = None) -> pd.DataFrame:
+
+def infer_csv_dtypes(
+    file_path: str, 
+    sample_rows: int = 10_000, 
+    usecols: list = None
+) -> dict:
+    """
+    Infers a dtype for each column of a CSV file from a sample of its first rows.
+
+    Integer and boolean columns map to the nullable 'Int64' and 'boolean' 
+    dtypes, so missing values further down the file do not change the 
+    schema. Floats stay 'float64' and everything else is read as 'object', 
+    which skips per-chunk type inference.
+
+    Args:
+        file_path (str): The path to the CSV file.
+        sample_rows (int): Number of rows from the top of the file to sample.
+        usecols (list, optional): Only infer dtypes for these columns.
+
+    Returns:
+        dict: Mapping of column name to dtype, suitable for `pd.read_csv(dtype=...)`.
+
+    Example:
+        >>> infer_csv_dtypes("data/large.csv", sample_rows=5000)
+        {'id': 'Int64', 'price': 'float64', 'region': 'object'}
+    """
+    sample = pd.read_csv(file_path, nrows=sample_rows, usecols=usecols)
+    dtypes = {}
+    for column, dtype in sample.dtypes.items():
+        if pd.api.types.is_bool_dtype(dtype):
+            dtypes[column] = "boolean"
+        elif pd.api.types.is_integer_dtype(dtype):
+            dtypes[column] = "Int64"
+        elif pd.api.types.is_float_dtype(dtype):
+            dtypes[column] = "float64"
+        else:
+            dtypes[column] = "object"
+    return dtypes
+
+
+def iter_csv(
+    file_path: str, 
+    chunksize: int = 100_000, 
+    usecols: list = None, 
+    sample_rows: int = 10_000,
+    dtype: dict = None
+):
+    """
+    Reads a CSV file as an iterator of DataFrames with one consistent schema.
+
+    The dtypes are inferred once from the first `sample_rows` rows (see 
+    `infer_csv_dtypes`) and applied to every chunk, so each chunk has the 
+    same columns and dtypes and pandas does not re-infer types per chunk. 
+    Only one chunk is held in memory at a time.
+
+    Args:
+        file_path (str): The path to the CSV file.
+        chunksize (int): Number of rows per DataFrame yielded.
+        usecols (list, optional): Only read these columns.
+        sample_rows (int): Number of rows sampled to infer the dtypes.
+        dtype (dict, optional): Dtypes that override the inferred ones.
+
+    Returns:
+        Iterator[pd.DataFrame]: DataFrames of up to `chunksize` rows.
+
+    Raises:
+        ValueError: If the file cannot be loaded, or a later chunk holds 
+            values that do not fit the sampled dtypes.
+
+    Example:
+        >>> for chunk in iter_csv("data/large.csv", chunksize=50_000, usecols=["id", "price"]):
+        ...     process(chunk)
+    """
+    try:
+        dtypes = infer_csv_dtypes(file_path, sample_rows=sample_rows, usecols=usecols)
+    except Exception as e:
+        raise ValueError(f"Error loading CSV file: {e}")
+    dtypes.update(dtype or {})
+    return _iter_typed_chunks(file_path, chunksize, usecols, dtypes, sample_rows)
+
+
+def _iter_typed_chunks(file_path, chunksize, usecols, dtypes, sample_rows):
+    """
+    Yields the chunks for `iter_csv`, explaining dtype mismatches.
+    """
+    with pd.read_csv(file_path, chunksize=chunksize, usecols=usecols, dtype=dtypes) as reader:
+        n_chunks = 0
+        while True:
+            try:
+                chunk = next(reader)
+            except StopIteration:
+                break
+            except (ValueError, TypeError) as e:
+                raise ValueError(
+                    f"Chunk {n_chunks} of '{file_path}' does not match the dtypes "
+                    f"inferred from the first {sample_rows} rows: {e}. "
+                    "Increase 'sample_rows' or pass 'dtype' overrides."
+                )
+            n_chunks += 1
+            yield chunk
+    print(f"File '{file_path}' read in {n_chunks} chunks successfully!")
+
+def load_excel(
+    file_path: str, 
+    sheet_name: str = None, 
+    cache: ColumnarCache = None, 
+    columns: list = None,
+    compact: bool = False
+) -> pd.DataFrame:
     """
     Loads an Excel file into a Pandas DataFrame.
 
     Parameters:
         file_path (str): The path to the Excel file.
         sheet_name (str, optional): The sheet name to load. Loads the first sheet by default.
+        cache (ColumnarCache, optional): Sidecar cache to read from, or to 
+            populate after parsing.
+        columns (list, optional): Only return these columns.
+        compact (bool): Shrink the dtypes with `optimize_dtypes`.
 
     Returns:
         pd.DataFrame: A DataFrame containing the Excel data.
@@ -94,21 +923,655 @@ def load_excel(file_path: str, sheet_name: str = None) -> pd.DataFrame:
         ValueError: If the file cannot be loaded.
     """
     try:
-        df = pd.read_excel(file_path, sheet_name=sheet_name)
+        if cache is not None:
+            df = _load_excel_cached(file_path, sheet_name, cache, columns)
+        else:
+            df = pd.read_excel(file_path, sheet_name=sheet_name, usecols=columns)
+        if compact:
+            if isinstance(df, dict):
+                df = {name: optimize_dtypes(sheet) for name, sheet in df.items()}
+            else:
+                df = optimize_dtypes(df)
         print(f"File '{file_path}' loaded successfully!")
         return df
     except Exception as e:
         raise ValueError(f"Error loading Excel file: {e}")
 
 
-def summarize_data(df):
+def _load_excel_cached(file_path, sheet_name, cache, columns):
+    """
+    Reads sheets through `cache`, parsing the workbook only on a miss.
+
+    With `sheet_name=None` every sheet is returned as a dict, so the list of 
+    sheet names is cached alongside the sheets themselves.
+    """
+    def project(df):
+        return df[columns] if columns is not None else df
+
+    if sheet_name is not None:
+        part = f"sheet:{sheet_name!r}"
+        df = cache.read(file_path, part, columns=columns)
+        if df is None:
+            df = pd.read_excel(file_path, sheet_name=sheet_name)
+            cache.write(file_path, part, df)
+            df = project(df)
+        return df
+
+    names = cache.read(file_path, "sheets")
+    if names is not None:
+        sheets = {
+            name: cache.read(file_path, f"sheet:{name!r}", columns=columns) 
+            for name in names["sheet"]
+        }
+        if all(df is not None for df in sheets.values()):
+            return sheets
+
+    sheets = pd.read_excel(file_path, sheet_name=None)
+    written = [cache.write(file_path, f"sheet:{name!r}", df) for name, df in sheets.items()]
+    if all(written):
+        cache.write(file_path, "sheets", pd.DataFrame({"sheet": list(sheets)}))
+    return {name: project(df) for name, df in sheets.items()}
+
+
+def load_excel_sheets(
+    file_path: str, 
+    sheet_names: list = None, 
+    n_jobs: int = None,
+    usecols=None,
+    nrows=None,
+    cache: ColumnarCache = None
+) -> dict:
+    """
+    Loads several sheets of an Excel file in parallel worker processes.
+
+    The Excel readers are pure Python and CPU-bound, so each sheet is parsed 
+    in its own process. `usecols` and `nrows` cut the parsing work and can be 
+    given per sheet. With a `cache`, sheets that already have a sidecar are 
+    read from it, and the rest are parsed in full once and written to it, 
+    with `usecols` and `nrows` applied to the result.
+
+    Args:
+        file_path (str): The path to the Excel file.
+        sheet_names (list, optional): Sheets to load. Loads all sheets by default.
+        n_jobs (int, optional): Number of worker processes. Defaults to the 
+            number of CPUs, capped at the number of sheets. Use 1 to parse 
+            in the current process.
+        usecols (list or dict, optional): Columns to load, for every sheet or 
+            as a dict of {sheet_name: columns}. Must be column names when 
+            `cache` is used.
+        nrows (int or dict, optional): Number of rows to load, for every 
+            sheet or as a dict of {sheet_name: nrows}.
+        cache (ColumnarCache, optional): Sidecar cache to read from and populate.
+
+    Returns:
+        dict: Mapping of sheet name to DataFrame, in the order requested.
+
+    Raises:
+        ValueError: If the file cannot be loaded.
+
+    Example:
+        >>> sheets = load_excel_sheets("finance.xlsx", ["Q1", "Q2"], usecols={"Q1": ["Total"]})
+    """
+    def per_sheet(option, sheet):
+        return option.get(sheet) if isinstance(option, dict) else option
+
+    try:
+        if sheet_names is None:
+            names = cache.read(file_path, "sheets") if cache is not None else None
+            if names is not None:
+                sheet_names = names["sheet"].tolist()
+            else:
+                with pd.ExcelFile(file_path) as workbook:
+                    sheet_names = workbook.sheet_names
+                if cache is not None:
+                    cache.write(file_path, "sheets", pd.DataFrame({"sheet": sheet_names}))
+
+        sheets = {}
+        if cache is not None:
+            for sheet in sheet_names:
+                sheets[sheet] = cache.read(
+                    file_path, f"sheet:{sheet!r}", columns=per_sheet(usecols, sheet)
+                )
+        to_parse = [sheet for sheet in sheet_names if sheets.get(sheet) is None]
+
+        # Sheets parsed for the cache are read in full, then trimmed below
+        jobs = [
+            (file_path, sheet, 
+             None if cache is not None else per_sheet(usecols, sheet), 
+             None if cache is not None else per_sheet(nrows, sheet))
+            for sheet in to_parse
+        ]
+        if n_jobs is None:
+            n_jobs = os.cpu_count() or 1
+        n_jobs = max(1, min(n_jobs, len(jobs)))
+        if n_jobs == 1:
+            parsed = [_read_sheet(*job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                parsed = list(executor.map(_read_sheet, *zip(*jobs)))
+
+        for sheet, df in zip(to_parse, parsed):
+            if cache is not None:
+                cache.write(file_path, f"sheet:{sheet!r}", df)
+                columns = per_sheet(usecols, sheet)
+                df = df[columns] if columns is not None else df
+            sheets[sheet] = df
+
+        for sheet in sheet_names:
+            rows = per_sheet(nrows, sheet)
+            if cache is not None and rows is not None:
+                sheets[sheet] = sheets[sheet].head(rows)
+
+        print(f"{len(sheet_names)} sheets loaded from '{file_path}' successfully!")
+        return {sheet: sheets[sheet] for sheet in sheet_names}
+    except Exception as e:
+        raise ValueError(f"Error loading Excel file: {e}")
+
+
+def _read_sheet(file_path, sheet, usecols, nrows) -> pd.DataFrame:
+    """
+    Parses one sheet, run inside a worker process by `load_excel_sheets`.
+    """
+    return pd.read_excel(file_path, sheet_name=sheet, usecols=usecols, nrows=nrows)
+
+
+def _is_numeric_column(dtype) -> bool:
+    """
+    Whether a column is summarized as numeric: any int or float dtype, not bool.
+    """
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+
+@dataclass
+class ColumnProfile:
+    """
+    Statistics for one column of a `Profile`.
+
+    `min`, `max`, `mean` and `std` are only set for numeric columns (`min` 
+    and `max` also for datetimes, as ISO strings). On a sampled profile, 
+    `null_count` and `memory_bytes` are scaled up to the full row count, 
+    `mean_error` and `null_error` hold their 95% error bounds, and 
+    `distinct` is the number of distinct values seen in the sample (a lower 
+    bound for the full column).
+    """
+    name: str
+    dtype: str
+    numeric: bool
+    count: int
+    null_count: int
+    distinct: int
+    memory_bytes: int
+    min: object = None
+    max: object = None
+    mean: float = None
+    std: float = None
+    mean_error: float = None
+    null_error: float = None
+
+
+@dataclass
+class Profile:
+    """
+    Structured, serializable summary of a DataFrame, built by `profile_data`.
+
+    Example:
+        >>> profile = profile_data(df)
+        >>> profile.columns["Age"].mean
+        >>> profile.to_json()
+    """
+    n_rows: int
+    n_cols: int
+    columns: dict
+    duplicate_rows: int = None
+    correlation: dict = None
+    sample_rows: int = None
+    approximate: bool = False
+
+    @property
+    def numeric_columns(self) -> list:
+        return [name for name, col in self.columns.items() if col.numeric]
+
+    @property
+    def non_numeric_columns(self) -> list:
+        return [name for name, col in self.columns.items() if not col.numeric]
+
+    @property
+    def missing_values(self) -> int:
+        return sum(col.null_count for col in self.columns.values())
+
+    def categorical_columns(self, max_distinct: int = 10) -> list:
+        """
+        Returns the non-numeric columns with fewer than `max_distinct` distinct values.
+        """
+        return [
+            name for name, col in self.columns.items() 
+            if not col.numeric and col.distinct < max_distinct
+        ]
+
+    def correlation_matrix(self):
+        """
+        Returns the correlation between numeric columns as a DataFrame, or None.
+        """
+        if self.correlation is None:
+            return None
+        return pd.DataFrame(self.correlation, dtype=float)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.to_dict(), **kwargs)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Profile":
+        data = dict(data)
+        data["columns"] = {
+            name: ColumnProfile(**col) for name, col in data["columns"].items()
+        }
+        return cls(**data)
+
+
+def _profile_column(name, series: pd.Series, n_rows: int, numeric: bool) -> ColumnProfile:
+    """
+    Computes all statistics for one column while its data is hot in cache.
+
+    `n_rows` is the full row count; if `series` is a sample of fewer rows, 
+    the extensive statistics are scaled up and error bounds are attached.
+    """
+    n = len(series)
+    mask = series.isna().to_numpy()
+    null_count = int(mask.sum())
+    col = ColumnProfile(
+        name=str(name),
+        dtype=str(series.dtype),
+        numeric=numeric,
+        count=n - null_count,
+        null_count=null_count,
+        distinct=int(series.nunique()),
+        memory_bytes=int(series.memory_usage(deep=True, index=False)),
+    )
+
+    if numeric and col.count:
+        if pd.api.types.is_extension_array_dtype(series.dtype):
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            values = series.to_numpy()
+        values = values[~mask] if null_count else values
+        col.min = values.min().item()
+        col.max = values.max().item()
+        col.mean = float(values.mean(dtype=np.float64))
+        col.std = float(values.std(ddof=1, dtype=np.float64)) if col.count > 1 else 0.0
+    elif pd.api.types.is_datetime64_any_dtype(series.dtype) and col.count:
+        col.min = series.min().isoformat()
+        col.max = series.max().isoformat()
+
+    if n < n_rows:
+        scale = n_rows / n
+        col.null_count = round(null_count * scale)
+        col.count = n_rows - col.null_count
+        col.memory_bytes = round(col.memory_bytes * scale)
+        # Hoeffding bound on the null fraction, scaled to a count
+        col.null_error = float(np.sqrt(np.log(2 / 0.05) / (2 * n)) * n_rows)
+        if col.std is not None and n > 1:
+            # Normal 95% interval with finite population correction
+            fpc = np.sqrt((n_rows - n) / (n_rows - 1))
+            col.mean_error = float(1.96 * col.std / np.sqrt(n) * fpc)
+    return col
+
+
+def profile_data(df: pd.DataFrame, sample=None, random_state: int = 0) -> Profile:
+    """
+    Profiles a DataFrame into a structured, serializable `Profile`.
+
+    Each column is visited once and all of its statistics (null count, 
+    distinct count, memory usage and, for numeric columns, min, max, mean 
+    and standard deviation) are computed from that one vectorized pass, 
+    instead of running separate frame-wide passes per statistic.
+
+    Sampling mode profiles a uniform random sample of rows instead. The 
+    null counts and memory usage are scaled to the full frame and come with 
+    95% error bounds: the mean is within `mean_error` of the true mean 
+    (normal approximation, 1.96 * std / sqrt(n) with a finite population 
+    correction) and the null count is within `null_error` of the true count 
+    (Hoeffding bound, N * sqrt(ln(2 / 0.05) / 2n)). Min, max and distinct 
+    counts describe the sample only, and duplicate rows are not counted.
+
+    Args:
+        df (pd.DataFrame): The dataset to profile.
+        sample (int or float, optional): Number of rows, or fraction of rows 
+            if below 1, to sample. Profiles every row by default.
+        random_state (int): Seed for the row sample.
+
+    Returns:
+        Profile: The dataset profile.
+
+    Example:
+        >>> profile = profile_data(df, sample=100_000)
+        >>> profile.columns["Sales"].mean, profile.columns["Sales"].mean_error
+    """
+    n_rows = len(df)
+    data = df
+    if sample is not None:
+        n = int(round(sample * n_rows)) if sample < 1 else int(sample)
+        if 0 < n < n_rows:
+            data = df.sample(n=n, random_state=random_state)
+
+    columns = {}
+    for name in data.columns:
+        series = data[name]
+        numeric = _is_numeric_column(series.dtype)
+        columns[str(name)] = _profile_column(name, series, n_rows, numeric)
+
+    numeric_cols = [name for name in data.columns if columns[str(name)].numeric]
+    correlation = None
+    if numeric_cols:
+        corr = data[numeric_cols].corr()
+        correlation = {
+            str(c): {str(r): (None if pd.isna(v) else float(v)) for r, v in corr[c].items()}
+            for c in corr.columns
+        }
+
+    sampled = len(data) < n_rows
+    return Profile(
+        n_rows=n_rows,
+        n_cols=df.shape[1],
+        columns=columns,
+        duplicate_rows=None if sampled else int(df.duplicated().sum()),
+        correlation=correlation,
+        sample_rows=len(data) if sampled else None,
+    )
+
+
+class HyperLogLog:
+    """
+    Mergeable approximate distinct counter.
+
+    Values are hashed with `pd.util.hash_pandas_object` (a fixed key, so 
+    sketches built in different processes agree) and folded into 2 ** p 
+    registers. The relative standard error is about 1.04 / sqrt(2 ** p), 
+    0.8% for the default p=14, using 2 ** p bytes of memory.
+
+    Args:
+        p (int): Precision, between 4 and 18.
+    """
+
+    def __init__(self, p: int = 14):
+        if not 4 <= p <= 18:
+            raise ValueError("'p' must be between 4 and 18.")
+        self.p = p
+        self.registers = np.zeros(2 ** p, dtype=np.uint8)
+
+    def update(self, values: pd.Series) -> None:
+        """
+        Adds the non-null values of a Series to the sketch.
+        """
+        values = values.dropna()
+        if values.empty:
+            return
+        hashes = pd.util.hash_pandas_object(values, index=False).to_numpy()
+        index = (hashes >> np.uint64(64 - self.p)).astype(np.intp)
+        rest = hashes & np.uint64((1 << (64 - self.p)) - 1)
+        # The remaining bits fit in a float64 exactly, so frexp gives their bit length
+        bit_length = np.frexp(rest.astype(np.float64))[1]
+        rank = (64 - self.p - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """
+        Folds another sketch of the same precision into this one.
+        """
+        if other.p != self.p:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precision.")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self) -> int:
+        """
+        Returns the estimated number of distinct values.
+        """
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(int)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate for small cardinalities
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+
+class StreamingProfiler:
+    """
+    Builds a `Profile` from a stream of DataFrame chunks in constant memory.
+
+    Feed it chunks one at a time, e.g. from `iter_csv` or 
+    `download_csv(..., chunksize=...)`. Null counts, min/max and memory 
+    usage are exact. Means and variances use streaming moments, the 
+    correlation matrix is built from a pairwise streaming covariance 
+    accumulator (matching `DataFrame.corr`'s pairwise-complete handling of 
+    missing values), and distinct counts are estimated with HyperLogLog. 
+    Duplicate rows are not counted.
+
+    Profilers over different parts of a dataset, e.g. in separate worker 
+    processes, can be combined with `merge`, so one linear scan of the 
+    data is enough however it is split.
+
+    Args:
+        hll_precision (int): HyperLogLog precision for the distinct counts.
+
+    Example:
+        >>> profiler = StreamingProfiler()
+        >>> for chunk in iter_csv("data/large.csv", chunksize=100_000):
+        ...     profiler.update(chunk)
+        >>> summarize_data(profiler.result())
+    """
+
+    def __init__(self, hll_precision: int = 14):
+        self.hll_precision = hll_precision
+        self.n_rows = 0
+        self.columns = None
+        self.numeric = []
+        self._stats = {}
+        self._shift = None
+        self._pair = None
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """
+        Adds one chunk of rows to the profile.
+
+        Raises:
+            ValueError: If the chunk's columns differ from the first chunk's.
+        """
+        if self.columns is None:
+            self._start([str(c) for c in chunk.columns], chunk.dtypes)
+        elif [str(c) for c in chunk.columns] != self.columns:
+            raise ValueError("All chunks must have the same columns in the same order.")
+        self.n_rows += len(chunk)
+
+        for name, series in zip(self.columns, (chunk[c] for c in chunk.columns)):
+            stats = self._stats[name]
+            mask = series.isna().to_numpy()
+            stats["null_count"] += int(mask.sum())
+            stats["memory_bytes"] += int(series.memory_usage(deep=True, index=False))
+            stats["hll"].update(series)
+            if name in self.numeric:
+                values = series.to_numpy(dtype=np.float64, na_value=np.nan)[~mask]
+                self._update_moments(stats, values)
+            elif pd.api.types.is_datetime64_any_dtype(series.dtype) and not mask.all():
+                low, high = series.min(), series.max()
+                stats["min"] = low if stats["min"] is None else min(stats["min"], low)
+                stats["max"] = high if stats["max"] is None else max(stats["max"], high)
+
+        if self.numeric:
+            block = chunk[[c for c in chunk.columns if str(c) in self.numeric]]
+            x = block.to_numpy(dtype=np.float64, na_value=np.nan)
+            if self._shift is None:
+                # Sums are taken around a fixed shift to limit cancellation
+                self._shift = np.nan_to_num(np.nanmean(x, axis=0)) if len(x) else np.zeros(x.shape[1])
+            present = ~np.isnan(x)
+            y = np.where(present, x - self._shift, 0.0)
+            m = present.astype(np.float64)
+            self._pair["n"] += m.T @ m
+            self._pair["s"] += y.T @ m
+            self._pair["ss"] += (y * y).T @ m
+            self._pair["sxy"] += y.T @ y
+
+    def merge(self, other: "StreamingProfiler") -> None:
+        """
+        Folds a profiler built over other rows of the same dataset into this one.
+        """
+        if other.columns is None:
+            return
+        if self.columns is None:
+            self.__dict__.update(copy.deepcopy(other.__dict__))
+            return
+        if other.columns != self.columns:
+            raise ValueError("Cannot merge profiles of datasets with different columns.")
+        self.n_rows += other.n_rows
+
+        for name in self.columns:
+            stats, theirs = self._stats[name], other._stats[name]
+            stats["null_count"] += theirs["null_count"]
+            stats["memory_bytes"] += theirs["memory_bytes"]
+            stats["hll"].merge(theirs["hll"])
+            if name in self.numeric:
+                self._merge_moments(stats, theirs)
+            elif theirs["min"] is not None:
+                stats["min"] = theirs["min"] if stats["min"] is None else min(stats["min"], theirs["min"])
+                stats["max"] = theirs["max"] if stats["max"] is None else max(stats["max"], theirs["max"])
+
+        if self.numeric:
+            # Re-express the other side's sums around this profiler's shift
+            d = self._shift - other._shift
+            n, s = other._pair["n"], other._pair["s"]
+            self._pair["n"] += n
+            self._pair["s"] += s - d[:, None] * n
+            self._pair["ss"] += other._pair["ss"] - 2 * d[:, None] * s + (d ** 2)[:, None] * n
+            self._pair["sxy"] += (
+                other._pair["sxy"] - s * d[None, :] - d[:, None] * s.T + np.outer(d, d) * n
+            )
+
+    def result(self) -> Profile:
+        """
+        Returns the profile of all rows seen so far.
+        """
+        if self.columns is None:
+            raise ValueError("No chunks have been profiled yet.")
+        columns = {}
+        for name in self.columns:
+            stats = self._stats[name]
+            count = self.n_rows - stats["null_count"]
+            col = ColumnProfile(
+                name=name,
+                dtype=stats["dtype"],
+                numeric=name in self.numeric,
+                count=count,
+                null_count=stats["null_count"],
+                distinct=stats["hll"].count(),
+                memory_bytes=stats["memory_bytes"],
+            )
+            if name in self.numeric and stats["n"]:
+                col.min = stats["min"]
+                col.max = stats["max"]
+                col.mean = stats["mean"]
+                col.std = float(np.sqrt(stats["m2"] / (stats["n"] - 1))) if stats["n"] > 1 else 0.0
+            elif stats["min"] is not None:
+                col.min = stats["min"].isoformat()
+                col.max = stats["max"].isoformat()
+            columns[name] = col
+
+        correlation = None
+        if self.numeric:
+            n, s, ss, sxy = (self._pair[k] for k in ("n", "s", "ss", "sxy"))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                cov = n * sxy - s * s.T
+                var_i = n * ss - s * s
+                corr = cov / np.sqrt(var_i * var_i.T)
+            corr[n < 2] = np.nan
+            correlation = {
+                c: {r: (None if np.isnan(corr[i, j]) else float(np.clip(corr[i, j], -1, 1))) 
+                    for i, r in enumerate(self.numeric)}
+                for j, c in enumerate(self.numeric)
+            }
+
+        return Profile(
+            n_rows=self.n_rows,
+            n_cols=len(self.columns),
+            columns=columns,
+            duplicate_rows=None,
+            correlation=correlation,
+            approximate=True,
+        )
+
+    def _start(self, columns: list, dtypes: pd.Series) -> None:
+        self.columns = columns
+        self.numeric = [name for name, dtype in zip(columns, dtypes) if _is_numeric_column(dtype)]
+        for name, dtype in zip(columns, dtypes):
+            self._stats[name] = {
+                "dtype": str(dtype), "null_count": 0, "memory_bytes": 0,
+                "hll": HyperLogLog(self.hll_precision),
+                "n": 0, "mean": 0.0, "m2": 0.0, "min": None, "max": None,
+            }
+        k = len(self.numeric)
+        self._pair = {key: np.zeros((k, k)) for key in ("n", "s", "ss", "sxy")}
+
+    @staticmethod
+    def _update_moments(stats: dict, values: np.ndarray) -> None:
+        if not len(values):
+            return
+        chunk = {
+            "n": len(values), 
+            "mean": float(values.mean()), 
+            "m2": float(((values - values.mean()) ** 2).sum()),
+            "min": float(values.min()), 
+            "max": float(values.max()),
+        }
+        StreamingProfiler._merge_moments(stats, chunk)
+
+    @staticmethod
+    def _merge_moments(stats: dict, other: dict) -> None:
+        """
+        Chan et al.'s parallel update of count, mean and sum of squared deviations.
+        """
+        if not other["n"]:
+            return
+        n = stats["n"] + other["n"]
+        delta = other["mean"] - stats["mean"]
+        stats["mean"] += delta * other["n"] / n
+        stats["m2"] += other["m2"] + delta ** 2 * stats["n"] * other["n"] / n
+        stats["n"] = n
+        stats["min"] = other["min"] if stats["min"] is None else min(stats["min"], other["min"])
+        stats["max"] = other["max"] if stats["max"] is None else max(stats["max"], other["max"])
+
+
+def profile_chunks(chunks, hll_precision: int = 14) -> Profile:
+    """
+    Profiles an iterator of DataFrame chunks with a `StreamingProfiler`.
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): Chunks of one dataset, e.g. from `iter_csv`.
+        hll_precision (int): HyperLogLog precision for the distinct counts.
+
+    Returns:
+        Profile: The approximate profile of all chunks.
+
+    Example:
+        >>> summarize_data(profile_chunks(iter_csv("data/large.csv")))
+    """
+    profiler = StreamingProfiler(hll_precision=hll_precision)
+    for chunk in chunks:
+        profiler.update(chunk)
+    return profiler.result()
+
+
+def summarize_data(df, sample=None):
     """
     Summarizes key aspects of the dataset and provides an overview of its structure.
 
     Parameters:
     ----------
-    df : pandas.DataFrame
-        The dataset to be summarized.
+    df : pandas.DataFrame or Profile
+        The dataset to be summarized, or a profile of it from `profile_data`.
+    sample : int or float, optional
+        Summarize a random sample of rows, see `profile_data`.
 
     Prints:
     -------
@@ -118,7 +1581,7 @@ def summarize_data(df):
     - Count of duplicate rows
     - Categorical columns (non-numeric columns with fewer unique values)
     - Correlation matrix for numeric columns (if available)
-    
+
     Example:
     --------
     data = {
@@ -131,38 +1594,36 @@ def summarize_data(df):
     
     summarize_data_overview(df)
     """
-    
-    # 1. Shape of the dataset (rows, columns)
-    shape = df.shape
-    rows, cols = shape[0], shape[1]
-
-    # 2. Numeric and Non-Numeric Columns
-    numeric_cols = df.select_dtypes(include=['float64', 'int64']).columns
-    non_numeric_cols = df.select_dtypes(exclude=['float64', 'int64']).columns
-
-    # 3. Missing values per column
-    missing_values = df.isnull().sum().sum()
-
-    # 4. Duplicate rows
-    duplicate_count = df.duplicated().sum()
+    profile = df if isinstance(df, Profile) else profile_data(df, sample=sample)
 
-    # 5. Categorical columns (non-numeric with fewer unique values)
-    categorical_cols = df.select_dtypes(exclude=['float64', 'int64']).nunique()
-    categorical_cols = categorical_cols[categorical_cols < 10].index  # Adjust threshold as needed
+    numeric_cols = profile.numeric_columns
+    non_numeric_cols = profile.non_numeric_columns
+    categorical_cols = profile.categorical_columns()  # Adjust threshold as needed
+    correlation_matrix = profile.correlation_matrix()
 
-    # 6. Correlation summary for numerical columns
-    correlation_matrix = df[numeric_cols].corr() if len(numeric_cols) > 0 else None
+    if profile.approximate:
+        sample_note = "\n    Streamed profile: distinct counts are approximate"
+        missing_values = profile.missing_values
+        duplicates = "not counted on a streamed profile"
+    elif profile.sample_rows is None:
+        sample_note = ""
+        missing_values = profile.missing_values
+        duplicates = f"{profile.duplicate_rows} duplicate rows"
+    else:
+        sample_note = f"\n    Estimated from a random sample of {profile.sample_rows} rows"
+        missing_values = f"~{profile.missing_values}"
+        duplicates = "not counted on a sample"
 
     # Summary
     summary = f"""
     --- Data Overview ---
-    Shape: {rows} rows, {cols} columns
+    Shape: {profile.n_rows} rows, {profile.n_cols} columns{sample_note}
 
     Numeric Columns: {len(numeric_cols)} columns (e.g., {', '.join(numeric_cols[:3])}...)
     Non-Numeric Columns: {len(non_numeric_cols)} columns (e.g., {', '.join(non_numeric_cols[:3])}...)
 
     Missing Values: {missing_values} missing values in total
-    Duplicate Rows: {duplicate_count} duplicate rows
+    Duplicate Rows: {duplicates}
 
     Categorical Columns: {len(categorical_cols)} columns (e.g., {', '.join(categorical_cols[:3])}...)
 
@@ -3,20 +3,31 @@ Module: visualize.py
 Features:
     - Implemented: 
         1. `plot_histogram`: Plots a histogram of a column.
-        2. `plot_scatter`: Creates a scatter plot of two columns.
+        2. `plot_scatter`: Creates a scatter plot of two columns, switching 
+            to a log-scaled density image for large datasets.
         3. `plot_correlation_matrix`: Plots a heatmap of correlations between 
             numeric columns.
         4. `plot_line`: Plots a line chart for time-series data.
         5. `plot_overlay`: Overlays multiple columns with different plot types.
+        6. `downsample_line`: Reduces a long series to the points that shape 
+            its line (min/max per pixel bucket or LTTB); used by `plot_line` 
+            and `plot_overlay` above a point threshold.
+        7. `density_grid`: Counts points on a 2D grid chunk by chunk; used 
+            by the density mode of `plot_scatter`.
     - Suggested:
         - Add support for time-series visualisations.
 """
 
 import matplotlib.pyplot as plt
+import matplotlib.colors as mcolors
 import seaborn as sns
+import numpy as np
 import pandas as pd
 
 
+MARKER_MAX_POINTS = 500  # lines with more points are drawn without markers
+
+
 def plot_histogram(
     data: pd.DataFrame, 
     column: str, 
@@ -63,27 +74,71 @@ def plot_scatter(
     data: pd.DataFrame, 
     x_column: str, 
     y_column: str, 
-    save_path: str = None
+    save_path: str = None,
+    mode: str = "auto",
+    max_points: int = 200_000,
+    bins: tuple = None
 ) -> None:
     """
     Creates a scatter plot between two columns.
 
+    Drawing markers costs time for every row, so in density mode the 
+    points are instead counted on a grid with `density_grid` and drawn as 
+    a single image, with a logarithmic colour scale of the points per 
+    cell. Its cost and memory grow with the grid size, not the number of 
+    rows. 'auto' switches to density mode when both columns are numeric 
+    and the dataset has more than `max_points` rows.
+
     Args:
         data (pd.DataFrame): The input dataset.
         x_column (str): The column for the x-axis.
         y_column (str): The column for the y-axis.
         save_path (str): File path to save the plot (optional).
+        mode (str): 'auto', 'points' or 'density'.
+        max_points (int): Number of rows above which 'auto' uses density mode.
+        bins (tuple, optional): Grid size (x bins, y bins) of density mode. 
+            Defaults to one cell per 2x2 pixels of the figure.
 
     Example:
         >>> plot_scatter(data, "age", "income", save_path="scatter.png")
+        >>> plot_scatter(trips, "distance", "fare", mode="density", bins=(400, 300))
     """    
     if x_column not in data.columns:
         raise ValueError(f"Column '{x_column}' not found in the dataset.")
     elif y_column not in data.columns:
         raise ValueError(f"Column '{y_column}' not found in the dataset.")
+    if mode not in ("auto", "points", "density"):
+        raise ValueError("Invalid value for 'mode'. Use 'auto', 'points' or 'density'.")
+
+    numeric = all(
+        pd.api.types.is_numeric_dtype(data[c]) and not pd.api.types.is_bool_dtype(data[c])
+        for c in (x_column, y_column)
+    )
+    if mode == "density" and not numeric:
+        raise ValueError("Density mode needs numeric x and y columns.")
     
     plt.figure(figsize=(16, 10))
-    plt.scatter(data[x_column], data[y_column])
+    if mode == "density" or (mode == "auto" and numeric and len(data) > max_points):
+        if bins is None:
+            figure = plt.gcf()
+            bins = (
+                int(figure.get_figwidth() * figure.get_dpi()) // 2, 
+                int(figure.get_figheight() * figure.get_dpi()) // 2
+            )
+        counts, x_edges, y_edges = density_grid(data[x_column], data[y_column], bins)
+        image = plt.imshow(
+            np.ma.masked_equal(counts.T, 0), 
+            origin="lower", 
+            extent=(x_edges[0], x_edges[-1], y_edges[0], y_edges[-1]), 
+            aspect="auto", 
+            interpolation="nearest", 
+            norm=mcolors.LogNorm(vmin=1, vmax=max(int(counts.max()), 1)), 
+            cmap="viridis"
+        )
+        plt.colorbar(image, label="Points per cell")
+        print(f"Density mode: {int(counts.sum())} points counted on a {bins[0]}x{bins[1]} grid.")
+    else:
+        plt.scatter(data[x_column], data[y_column])
     plt.title(f"Scatter Plot of {x_column} vs. {y_column}")
     plt.xlabel(x_column)
     plt.ylabel(y_column)
@@ -160,19 +215,30 @@ def plot_line(
     data: pd.DataFrame, 
     x_column: str, 
     y_column: str, 
-    save_path: str = None
+    save_path: str = None,
+    downsample: str = "minmax",
+    max_points: int = None
 ) -> None:
     """
     Creates a line plot for time-series or sequential data.
 
+    Series longer than `max_points` are reduced with `downsample_line` 
+    before plotting, so the rendering time does not grow with the length 
+    of the series; the reduction is printed. Lines with more than 
+    `MARKER_MAX_POINTS` points are drawn without per-point markers.
+
     Args:
         data (pd.DataFrame): The input dataset.
         x_column (str): The column for the x-axis (time or sequence).
         y_column (str): The column for the y-axis (values).
         save_path (str): File path to save the plot (optional).
+        downsample (str): 'minmax', 'lttb', or None to plot every point.
+        max_points (int, optional): Point threshold and target of the 
+            downsampling. Defaults to two points per horizontal pixel.
 
     Example:
         >>> plot_line(data, "date", "price", save_path="line_chart.png")
+        >>> plot_line(telemetry, "timestamp", "voltage", downsample="lttb", max_points=2000)
     """
     if x_column not in data.columns or y_column not in data.columns:
         raise ValueError(
@@ -180,7 +246,8 @@ def plot_line(
         )
     
     plt.figure(figsize=(16, 10))
-    plt.plot(data[x_column], data[y_column], marker='o')
+    x, y = _reduce_line(data[x_column], data[y_column], y_column, downsample, max_points)
+    plt.plot(x, y, marker='o' if len(y) <= MARKER_MAX_POINTS else None)
     plt.title(f"Line Plot of {y_column} over {x_column}")
     plt.xlabel(x_column)
     plt.ylabel(y_column)
@@ -209,11 +276,15 @@ def plot_overlay(
     line_colours = None,  
     bar_colours = None,  
     save_path: str = None,
-    title: str = "Overlay Plot"
+    title: str = "Overlay Plot",
+    downsample: str = "minmax",
+    max_points: int = None
 ) -> None:
     """
     Plots multiple columns with specified plot types on a single graph.
 
+    Line columns are downsampled like in `plot_line`.
+
     Args:
         data (pd.DataFrame): The input dataset.
         columns (list): List of column names to plot.
@@ -221,6 +292,10 @@ def plot_overlay(
             to the columns.
         save_path (str): File path to save the plot (optional).
         title (str): Title of the plot (default is "Overlay Plot").
+        downsample (str): 'minmax', 'lttb', or None to plot every point of 
+            the line columns.
+        max_points (int, optional): Point threshold and target of the 
+            downsampling. Defaults to two points per horizontal pixel.
 
     Example:
         >>> plot_overlay(
@@ -245,11 +320,12 @@ def plot_overlay(
             raise ValueError(f"Column '{col}' not found in the dataset.")
         
         if plot_type.lower() == "line":
+            x, y = _reduce_line(data.index, data[col], col, downsample, max_points)
             plt.plot(
-                data.index, 
-                data[col], 
+                x, 
+                y, 
                 label=f"{col} (Line)", 
-                marker='o', 
+                marker='o' if len(y) <= MARKER_MAX_POINTS else None, 
                 color=line_colours[i % len(line_colours)]  
             )
         elif plot_type.lower() == "bar":
@@ -278,3 +354,214 @@ def plot_overlay(
         plt.show()
 
     plt.close()
+
+
+def downsample_line(
+    x, 
+    y, 
+    max_points: int, 
+    method: str = "minmax"
+) -> tuple:
+    """
+    Reduces a line to at most `max_points` points that keep its shape.
+
+    'minmax' splits the series into `max_points / 2` equal buckets of 
+    consecutive points (one per horizontal pixel when `max_points` is 
+    twice the plot width) and keeps the lowest and highest point of each, 
+    so spikes and the envelope of the line survive. 'lttb' (Largest 
+    Triangle Three Buckets) keeps the point of each bucket that forms the 
+    largest triangle with the previous kept point and the next bucket's 
+    average, which follows the visual trend more smoothly. The first and 
+    last points are always kept; series that are already short enough are 
+    returned unchanged. Missing values are skipped.
+
+    Args:
+        x (array-like): The x values (numeric, datetime or labels), in plot order.
+        y (array-like): The numeric y values.
+        max_points (int): The maximum number of points to keep (at least 3).
+        method (str): 'minmax' or 'lttb'.
+
+    Returns:
+        tuple: (x, y) of the kept points, of the same types as the inputs.
+
+    Example:
+        >>> x, y = downsample_line(data["timestamp"], data["voltage"], 3200)
+    """
+    if method not in ("minmax", "lttb"):
+        raise ValueError("Invalid value for 'method'. Use 'minmax' or 'lttb'.")
+    if max_points < 3:
+        raise ValueError("'max_points' must be at least 3.")
+    values = pd.Series(y, copy=False).to_numpy(dtype=float, na_value=np.nan)
+    if len(values) != len(x):
+        raise ValueError("'x' and 'y' must have the same length.")
+    if len(values) <= max_points:
+        return x, y
+
+    if method == "minmax":
+        keep = _minmax_indices(values, max_points)
+    else:
+        keep = _lttb_indices(_numeric_positions(x), values, max_points)
+    return _take(x, keep), _take(y, keep)
+
+
+def _reduce_line(x, y, label: str, method: str, max_points: int):
+    """
+    Downsamples a line for plotting if it has more than `max_points` 
+    points, and reports the reduction.
+    """
+    if max_points is None:
+        figure = plt.gcf()
+        max_points = 2 * int(figure.get_figwidth() * figure.get_dpi())
+    if method is None or len(y) <= max_points or not pd.api.types.is_numeric_dtype(y):
+        return x, y
+    reduced_x, reduced_y = downsample_line(x, y, max_points, method)
+    print(f"Downsampled '{label}' from {len(y)} to {len(reduced_y)} points ({method}).")
+    return reduced_x, reduced_y
+
+
+def _minmax_indices(values: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Positions of the lowest and highest value of each bucket, plus the 
+    first and last position, in order.
+    """
+    n_points = len(values)
+    size = -(-n_points // max(max_points // 2 - 1, 1))
+    n_buckets = -(-n_points // size)
+    blocks = np.full(n_buckets * size, np.nan)
+    blocks[:n_points] = values
+    blocks = blocks.reshape(n_buckets, size)
+    missing = np.isnan(blocks)
+    offsets = np.arange(n_buckets) * size
+    lowest = np.where(missing, np.inf, blocks).argmin(axis=1) + offsets
+    highest = np.where(missing, -np.inf, blocks).argmax(axis=1) + offsets
+    keep = np.unique(np.concatenate([[0, n_points - 1], lowest, highest]))
+    return keep[keep < n_points]
+
+
+def _lttb_indices(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Positions kept by Largest Triangle Three Buckets.
+    """
+    n_points = len(y)
+    valid = ~np.isnan(y)
+    edges = np.linspace(1, n_points - 1, max_points - 1).astype(np.int64)
+
+    # Average point of every bucket, ignoring missing values
+    counts = np.add.reduceat(valid[1:-1], edges[:-1] - 1).astype(float)
+    mean_x = np.add.reduceat(np.where(valid, x, 0)[1:-1], edges[:-1] - 1) / np.maximum(counts, 1)
+    mean_y = np.add.reduceat(np.where(valid, y, 0)[1:-1], edges[:-1] - 1) / np.maximum(counts, 1)
+    mean_x = np.append(mean_x[1:], x[-1])
+    mean_y = np.append(mean_y[1:], y[-1])
+
+    keep = np.empty(max_points, dtype=np.int64)
+    keep[0], keep[-1] = 0, n_points - 1
+    previous = 0
+    for i in range(max_points - 2):
+        start, end = edges[i], edges[i + 1]
+        area = np.abs(
+            (x[previous] - mean_x[i]) * (y[start:end] - y[previous]) 
+            - (x[previous] - x[start:end]) * (mean_y[i] - y[previous])
+        )
+        previous = start + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        keep[i + 1] = previous
+    return keep
+
+
+def _numeric_positions(x) -> np.ndarray:
+    """
+    The x values as floats for geometry: datetimes as nanoseconds, 
+    non-numeric labels as their positions.
+    """
+    x = pd.Series(x) if not isinstance(x, (pd.Series, pd.Index)) else x
+    if pd.api.types.is_datetime64_any_dtype(x) or pd.api.types.is_timedelta64_dtype(x):
+        return x.to_numpy().view(np.int64).astype(float)
+    if pd.api.types.is_numeric_dtype(x) and not pd.api.types.is_bool_dtype(x):
+        return x.to_numpy(dtype=float, na_value=np.nan)
+    return np.arange(len(x), dtype=float)
+
+
+def _take(values, positions: np.ndarray):
+    if isinstance(values, pd.Series):
+        return values.iloc[positions]
+    if isinstance(values, pd.Index):
+        return values[positions]
+    return np.asarray(values)[positions]
+
+
+def density_grid(
+    x, 
+    y, 
+    bins: tuple = (800, 500), 
+    range: tuple = None, 
+    chunksize: int = 1_000_000
+) -> tuple:
+    """
+    Counts points on a 2D grid of equal cells, like `np.histogram2d`.
+
+    The points are processed `chunksize` at a time: each chunk's cell 
+    numbers are computed directly from the grid's bounds and counted with 
+    `np.bincount` into one grid, so the memory used is bounded by the 
+    chunk and grid sizes rather than by the number of points. Points with 
+    missing coordinates or outside `range` are skipped. Grids computed with 
+    the same `bins` and `range` (e.g. for different files) can be summed.
+
+    Args:
+        x (array-like): The numeric x values.
+        y (array-like): The numeric y values.
+        bins (tuple): Number of cells along x and y.
+        range (tuple, optional): ((x_min, x_max), (y_min, y_max)) of the 
+            grid. Defaults to the bounds of the data.
+        chunksize (int): Number of points binned at a time.
+
+    Returns:
+        tuple: (counts, x_edges, y_edges), where counts[i, j] is the number 
+            of points in the cell between x_edges[i:i + 2] and y_edges[j:j + 2].
+
+    Example:
+        >>> counts, x_edges, y_edges = density_grid(data["distance"], data["fare"], bins=(400, 300))
+    """
+    x = pd.Series(x, copy=False).to_numpy(dtype=float, na_value=np.nan)
+    y = pd.Series(y, copy=False).to_numpy(dtype=float, na_value=np.nan)
+    if len(x) != len(y):
+        raise ValueError("'x' and 'y' must have the same length.")
+    n_x, n_y = int(bins[0]), int(bins[1])
+    if n_x < 1 or n_y < 1:
+        raise ValueError("'bins' must be positive.")
+
+    if range is None:
+        range = tuple(_bounds(values, chunksize) for values in (x, y))
+    (x_min, x_max), (y_min, y_max) = range
+    x_edges = np.linspace(x_min, x_max, n_x + 1)
+    y_edges = np.linspace(y_min, y_max, n_y + 1)
+    x_scale = n_x / (x_max - x_min) if x_max > x_min else 0.0
+    y_scale = n_y / (y_max - y_min) if y_max > y_min else 0.0
+
+    counts = np.zeros(n_x * n_y, dtype=np.int64)
+    for start in np.arange(0, len(x), chunksize):
+        chunk_x, chunk_y = x[start:start + chunksize], y[start:start + chunksize]
+        inside = (
+            (chunk_x >= x_min) & (chunk_x <= x_max) 
+            & (chunk_y >= y_min) & (chunk_y <= y_max)
+        )
+        # The upper bounds belong to the last cells, as in np.histogram2d
+        cell_x = np.minimum(((chunk_x[inside] - x_min) * x_scale).astype(np.int64), n_x - 1)
+        cell_y = np.minimum(((chunk_y[inside] - y_min) * y_scale).astype(np.int64), n_y - 1)
+        counts += np.bincount(cell_x * n_y + cell_y, minlength=n_x * n_y)
+    return counts.reshape(n_x, n_y), x_edges, y_edges
+
+
+def _bounds(values: np.ndarray, chunksize: int) -> tuple:
+    """
+    (min, max) of the non-missing values, widened if they are all equal.
+    """
+    low, high = np.inf, -np.inf
+    for start in np.arange(0, len(values), chunksize):
+        chunk = values[start:start + chunksize]
+        if np.isnan(chunk).all():
+            continue
+        low, high = min(low, np.nanmin(chunk)), max(high, np.nanmax(chunk))
+    if low > high:
+        return 0.0, 1.0
+    if low == high:
+        return low - 0.5, high + 0.5
+    return float(low), float(high)
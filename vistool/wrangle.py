@@ -3,18 +3,51 @@ Module: wrangle.py
 Features:
     - Implemented: 
         1. `clean_data`: Cleans the dataset by dropping NaN values 
-            or filling with mean.
-        2. `filter_data`: Filters rows based on a condition.
+            or filling with mean (row-wise also median or forward fill). 
+            Column-wise work can be split across processes with `n_jobs`.
+        2. `filter_data`: Filters rows based on a condition, with cached compiled 
+            predicates and optional secondary indexes (`create_index`).
         3. `rename_columns`: Renames columns in the dataset.
-        4. `label_encode`: Perform label encoding on a categorical column using Pandas and NumPy.
+        4. `label_encode`: Perform label encoding on a categorical column using Pandas and NumPy, 
+            optionally with a fitted `LabelEncoder` that keeps codes consistent across frames.
+        5. `Pipeline`: Lazily chains the steps above and optimizes the plan 
+            (filter pushdown, column pruning, rename merging) before running it. 
+            `Pipeline.scan` runs it chunk by chunk over a CSV or Parquet file 
+            and `sink_parquet` writes the result incrementally.
+        6. `ResultCache`: Opt-in memoization of wrangle and combine functions, 
+            keyed by a content fingerprint of the input frames and the arguments.
+        7. `Scaler` and `OneHotEncoder`: Standard, min-max and robust feature 
+            scaling, and one-hot encoding to sparse outputs.
     - Suggested:
         - Continue devel on interactive dashboard.
-        - Implement feature scaling and encoding.
 """
 
+import io
+import os
+import sys
+import ast
+import copy
+import json
+import time
+import hashlib
+import inspect
+import threading
+import contextlib
+import weakref
+import operator
+import warnings
+import functools
+import numpy as np
 import pandas as pd
 import ipywidgets as widgets
-from IPython.display import display, clear_output
+from pathlib import Path
+from collections import OrderedDict
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor
+from IPython.display import display
+from vistool.combine import merge_datasets
+from vistool.download import infer_csv_dtypes, iter_csv
 
 
 
@@ -22,21 +55,47 @@ def clean_data(
     data: pd.DataFrame, 
     remove_columns: list = None, 
     fill_with: str = None, 
-    apply_to: str = "columns"
+    apply_to: str = "columns",
+    preserve_dtypes: bool = False,
+    decimals: int = None,
+    inplace: bool = False,
+    n_jobs: int = None
 ) -> pd.DataFrame:
     """
     Cleans the dataset by either:
         - Dropping all rows with NaN values in specific columns.
         - Filling NaN values with the column mean for numeric columns.
 
+    By default every numeric column is then cast to float and rounded to one 
+    decimal place. With `preserve_dtypes=True` that step is skipped: integer 
+    columns stay integers and only the columns that actually held NaN 
+    values are rewritten, while untouched columns share memory with the 
+    input. Rounding is then opt-in through `decimals`.
+
     Args:
         data (pd.DataFrame): The input dataset.
         remove_columns (list, optional): Columns to drop rows with NaN values.
-        fill_with (str, optional): Strategy to fill NaN values. Options: 
+        fill_with (str or dict, optional): Strategy to fill NaN values. Options: 
             'mean' or 'average'. If selected, NaN values are replaced with 
-            the column mean.
+            the column mean. With `apply_to='rows'`, 'median' and 'ffill' 
+            (carry the previous value in the row forward) are also available. 
+            With `apply_to='columns'` a dict of {column: value} fills each 
+            column with the given value instead, e.g. means computed over 
+            a whole dataset that is cleaned in chunks.
         apply_to (str, optional): Specifies whether to apply the operation to 
             'columns' or 'rows'. Default is 'columns'.
+        preserve_dtypes (bool, optional): Keep each column's dtype instead of 
+            casting numeric columns to float. Integer columns filled with a 
+            mean receive the mean rounded to the nearest integer.
+        decimals (int, optional): Number of decimal places to round float 
+            columns to. Defaults to 1, or to no rounding when 
+            `preserve_dtypes` is set.
+        inplace (bool, optional): Modify `data` itself rather than a new 
+            DataFrame. It is still returned.
+        n_jobs (int, optional): Number of worker processes for the column 
+            mean fill, float cast and rounding, which are split into blocks 
+            of columns. The values are passed to the workers in shared 
+            memory. Use -1 for one per CPU. Defaults to the current process.
 
     Returns:
         pd.DataFrame: The cleaned dataset.
@@ -44,65 +103,614 @@ def clean_data(
     Example:
         >>> clean_data(data, remove_columns=['A'], apply_to='columns')
         >>> clean_data(data, fill_with='mean', apply_to='rows')
+        >>> clean_data(data, fill_with='mean', preserve_dtypes=True, inplace=True)
+        >>> clean_data(wide_data, fill_with='mean', n_jobs=-1)
     """
+    if apply_to not in ("columns", "rows"):
+        raise ValueError("Invalid value for 'apply_to'. Use 'columns' or 'rows'.")
+    if apply_to == "rows" and isinstance(fill_with, dict):
+        raise ValueError("A dict of fill values needs apply_to='columns'.")
+
+    if not inplace:
+        # Columns are only ever replaced below, never written into, so a 
+        # shallow copy is enough to leave the input untouched
+        data = data.copy(deep=False)
+    n_workers = _n_workers(n_jobs, len(data.columns))
+    column_fills = None
+
     if apply_to == "columns":
         if remove_columns:
             # Drop rows with NaN in specific columns
-            data = data.dropna(subset=remove_columns).reset_index(drop=True)
+            data.dropna(subset=remove_columns, inplace=True)
+            data.reset_index(drop=True, inplace=True)
             print(f"Rows with NaN in columns {remove_columns} were dropped.")
                    
-        elif fill_with == "mean" or fill_with == "average":
-            # Fill NaN values with column mean
-            data = data.fillna(data.mean(numeric_only=True))
-            print(f"NaN values filled with column mean.")
+        elif isinstance(fill_with, dict) or fill_with in ("mean", "average"):
+            # Fill NaN values with column mean, only touching columns with NaN
+            if n_workers > 1:
+                # Filled by the workers, which compute the means of their 
+                # columns; they only take numeric columns, so dict values 
+                # for the other columns are filled here
+                column_fills = fill_with if isinstance(fill_with, dict) else "mean"
+                fills = {
+                    c: v for c, v in fill_with.items() 
+                    if c in data.columns and not _is_block_numeric(data[c].dtype)
+                } if isinstance(fill_with, dict) else {}
+            elif isinstance(fill_with, dict):
+                fills = {c: v for c, v in fill_with.items() if c in data.columns}
+            else:
+                fills = data.mean(numeric_only=True).to_dict()
+            for column, mean in fills.items():
+                series = data[column]
+                if series.hasnans:
+                    if pd.api.types.is_integer_dtype(series.dtype):
+                        mean = round(mean)
+                    data[column] = series.fillna(mean)
+            if isinstance(fill_with, dict):
+                print(f"NaN values filled with the given column values.")
+            else:
+                print(f"NaN values filled with column mean.")
         
         else:
             # Default behavior: Drop rows with any NaN values in the columns
-            data = data.dropna().reset_index(drop=True)
+            data.dropna(inplace=True)
+            data.reset_index(drop=True, inplace=True)
             print("Rows with any NaN values were dropped.")
     
     elif apply_to == "rows":
-        if fill_with == "mean" or fill_with == "average":
-            # Fill NaN values row-wise using the row mean
-            data = data.apply(lambda row: row.fillna(row.mean()), axis=1)
-            print(f"NaN values filled with row mean.")
+        if fill_with in ROW_FILL_STRATEGIES:
+            # Fill NaN values row-wise across the numeric columns
+            _fill_rows(data, fill_with)
+            print(f"NaN values filled with row {ROW_FILL_STRATEGIES[fill_with]}.")
         else:
             # Default behavior: Drop rows that contain NaN values
-            data = data.dropna(axis=0).reset_index(drop=True)
+            data.dropna(axis=0, inplace=True)
+            data.reset_index(drop=True, inplace=True)
             print("Rows with any NaN values were dropped.")
+
+    if n_workers > 1:
+        _clean_columns_parallel(data, column_fills, preserve_dtypes, decimals, n_workers)
+    elif not preserve_dtypes:
+        # Ensure all numeric columns are floats and round to one decimal place
+        numeric_cols = data.select_dtypes(include=['number']).columns
+        data[numeric_cols] = data[numeric_cols].astype(float).round(
+            1 if decimals is None else decimals
+        )
+    elif decimals is not None:
+        for column in data.select_dtypes(include=['floating']).columns:
+            data[column] = data[column].round(decimals)
     
-    else:
-        raise ValueError("Invalid value for 'apply_to'. Use 'columns' or 'rows'.")
+    return data
+
+
+ROW_FILL_STRATEGIES = {
+    "mean": "mean", "average": "mean", "median": "median", "ffill": "forward fill"
+}
+
 
-    # Ensure all numeric columns are floats and round to one decimal place
+def _fill_rows(data: pd.DataFrame, strategy: str) -> pd.DataFrame:
+    """
+    Fills NaN values in place from other values in the same row, as 
+    whole-array operations.
+
+    The numeric columns are taken as one 2D float array, so the fill is a 
+    handful of NumPy calls instead of building a Series per row. Only the 
+    columns that held NaN values are replaced. Rows without any values are 
+    left as NaN.
+    """
     numeric_cols = data.select_dtypes(include=['number']).columns
-    data[numeric_cols] = data[numeric_cols].astype(float).round(1)
-    
+    values = data[numeric_cols].to_numpy(dtype=float, na_value=np.nan)
+    missing = np.isnan(values)
+    if not missing.any():
+        return data
+
+    if strategy == "ffill":
+        # Index of the last non-missing column at or before each position
+        positions = np.where(missing, 0, np.arange(values.shape[1]))
+        np.maximum.accumulate(positions, axis=1, out=positions)
+        filled = values[np.arange(values.shape[0])[:, None], positions]
+    else:
+        reduce = np.nanmedian if strategy == "median" else np.nanmean
+        with warnings.catch_warnings():
+            # All-NaN rows give NaN, as the row-by-row version did
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            row_fill = reduce(values, axis=1)
+        filled = np.where(missing, row_fill[:, None], values)
+
+    for i in np.flatnonzero(missing.any(axis=0)):
+        data[numeric_cols[i]] = filled[:, i]
     return data
 
 
+def _n_workers(n_jobs: int, n_tasks: int) -> int:
+    """
+    Number of worker processes for `n_jobs` (None: none, -1: one per CPU).
+    """
+    if n_jobs is None:
+        return 1
+    if n_jobs < 0:
+        n_jobs = os.cpu_count() or 1
+    return max(1, min(n_jobs, n_tasks))
+
+
+def _clean_columns_parallel(
+    data: pd.DataFrame, fills, preserve_dtypes: bool, decimals: int, n_workers: int
+) -> None:
+    """
+    Fills, casts and rounds numeric columns of `data` in place, with blocks 
+    of columns processed by worker processes.
+
+    The columns are copied once into a column-major float array in shared 
+    memory, which every worker maps, so only the block bounds and per-column 
+    settings are pickled. `fills` is 'mean', a dict of fill values, or None. 
+    In `preserve_dtypes` mode only float64 columns go to the workers, and the 
+    few other columns that need filling or rounding are done here.
+    """
+    # Read from dtypes, as select_dtypes would copy the selected columns
+    numeric = pd.Index([c for c, dtype in data.dtypes.items() if _is_block_numeric(dtype)])
+    if not preserve_dtypes:
+        columns = numeric
+        decimals = 1 if decimals is None else decimals
+    else:
+        columns = pd.Index([
+            c for c in numeric 
+            if data[c].dtype == np.float64 
+            and (decimals is not None or (_fills_column(fills, c) and data[c].hasnans))
+        ])
+        for column in numeric.difference(columns, sort=False):
+            series = data[column]
+            if _fills_column(fills, column) and series.hasnans:
+                value = series.mean() if fills == "mean" else fills[column]
+                if pd.api.types.is_integer_dtype(series.dtype):
+                    value = round(value)
+                data[column] = series = series.fillna(value)
+            if decimals is not None and pd.api.types.is_float_dtype(series.dtype):
+                data[column] = series.round(decimals)
+    if len(columns) == 0:
+        return
+
+    n_rows, n_cols = len(data), len(columns)
+    fill_values = np.full(n_cols, np.nan)
+    if isinstance(fills, dict):
+        for j, column in enumerate(columns):
+            if column in fills:
+                fill_values[j] = fills[column]
+    compute_mean = np.full(n_cols, fills == "mean")
+    is_int = np.array([pd.api.types.is_integer_dtype(data[c].dtype) for c in columns])
+
+    shm = shared_memory.SharedMemory(create=True, size=max(n_rows * n_cols * 8, 1))
+    try:
+        values = np.ndarray((n_rows, n_cols), dtype=float, buffer=shm.buf, order="F")
+        for j, column in enumerate(columns):
+            series = data[column]
+            if series.dtype == np.float64:
+                values[:, j] = series.to_numpy()
+            else:
+                values[:, j] = series.to_numpy(dtype=float, na_value=np.nan)
+
+        bounds = np.linspace(0, n_cols, min(n_workers, n_cols) + 1).astype(int)
+        blocks = [
+            (shm.name, (n_rows, n_cols), start, stop, fill_values[start:stop], 
+             compute_mean[start:stop], is_int[start:stop], decimals)
+            for start, stop in zip(bounds[:-1], bounds[1:])
+        ]
+        with ProcessPoolExecutor(max_workers=len(blocks)) as executor:
+            list(executor.map(_clean_block, *zip(*blocks)))
+
+        # Column-major, so this is a single block without reordering
+        cleaned = pd.DataFrame(values.copy(order="F"), index=data.index, columns=columns)
+        del values
+    finally:
+        shm.close()
+        shm.unlink()
+    data[columns] = cleaned
+
+
+def _is_block_numeric(dtype) -> bool:
+    """
+    Whether `_clean_columns_parallel` sends columns of this dtype to the workers.
+    """
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+
+def _fills_column(fills, column) -> bool:
+    return fills == "mean" or (isinstance(fills, dict) and column in fills)
+
+
+def _clean_block(name, shape, start, stop, fill_values, compute_mean, is_int, decimals):
+    """
+    Fills and rounds columns `start:stop` of the shared array, in a worker process.
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        values = np.ndarray(shape, dtype=float, buffer=shm.buf, order="F")
+        block = values[:, start:stop]
+        for j in range(block.shape[1]):
+            column = block[:, j]
+            missing = np.isnan(column)
+            if not missing.any():
+                continue
+            if compute_mean[j]:
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore", category=RuntimeWarning)
+                    value = np.nanmean(column)
+            else:
+                value = fill_values[j]
+            if is_int[j]:
+                value = np.round(value)
+            column[missing] = value
+        if decimals is not None:
+            np.round(block, decimals, out=block)
+        del values, block, column
+    finally:
+        shm.close()
+
+
 def filter_data(
     data: pd.DataFrame, 
-    condition: str
+    condition: str,
+    engine: str = None
 ) -> pd.DataFrame:
     """
     Filters the dataset based on a specified condition.
 
+    Simple conditions (comparisons of columns with constants, `in` / 
+    `not in` lists, combined with and/or/not) are parsed once per condition 
+    string and cached, and use any index built on the columns with 
+    `create_index`, so a selective filter on an indexed column does not 
+    scan the whole column. Anything else is passed to `DataFrame.query`.
+
     Args:
         data (pd.DataFrame): The input dataset.
         condition (str): A valid pandas query string to filter the data.
+        engine (str, optional): Engine for `DataFrame.query`, e.g. 'numexpr' 
+            or 'python', used for conditions the cached evaluator does not handle.
 
     Returns:
         pd.DataFrame: The filtered dataset.
 
     Example:
         >>> filter_data(data, "age > 30")
+        >>> create_index(data, "age")
+        >>> filter_data(data, "age > 30 and sex == 'female'")
     """
-    filtered_data = data.query(condition)
+    filtered_data = _filter_compiled(data, condition)
+    if filtered_data is None:
+        if engine is None:
+            filtered_data = data.query(condition)
+        else:
+            filtered_data = data.query(condition, engine=engine)
     print("Data filtered successfully.")
     return filtered_data
 
 
+COMPARE_OPS = {
+    ast.Eq: "==", ast.NotEq: "!=", ast.Lt: "<", ast.LtE: "<=", 
+    ast.Gt: ">", ast.GtE: ">=", ast.In: "in", ast.NotIn: "not in",
+}
+FLIPPED_OPS = {"<": ">", "<=": ">=", ">": "<", ">=": "<=", "==": "==", "!=": "!="}
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_condition(condition: str):
+    """
+    Parses a query string into a predicate tree, or None if it is not a 
+    simple comparison predicate. Results are cached per condition string.
+
+    Nodes are ("and", [nodes]), ("or", [nodes]), ("not", node) and 
+    ("cmp", column, op, value).
+    """
+    try:
+        tree = ast.parse(condition.strip(), mode="eval").body
+    except SyntaxError:
+        return None
+
+    def constant(node):
+        if isinstance(node, ast.Constant) and not isinstance(node.value, bool):
+            return node.value
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            value = constant(node.operand)
+            if isinstance(value, (int, float)):
+                return -value
+        if isinstance(node, (ast.List, ast.Tuple)):
+            return tuple(constant(item) for item in node.elts)
+        raise ValueError("Not a constant")
+
+    def build(node):
+        if isinstance(node, ast.BoolOp):
+            kind = "and" if isinstance(node.op, ast.And) else "or"
+            return (kind, [build(value) for value in node.values])
+        if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.BitAnd, ast.BitOr)):
+            kind = "and" if isinstance(node.op, ast.BitAnd) else "or"
+            return (kind, [build(node.left), build(node.right)])
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.Not, ast.Invert)):
+            return ("not", build(node.operand))
+        if isinstance(node, ast.Compare):
+            terms = []
+            left = node.left
+            for op, right in zip(node.ops, node.comparators):
+                symbol = COMPARE_OPS[type(op)]
+                if isinstance(left, ast.Name):
+                    column, value = left.id, constant(right)
+                elif isinstance(right, ast.Name) and symbol in FLIPPED_OPS:
+                    column, value, symbol = right.id, constant(left), FLIPPED_OPS[symbol]
+                else:
+                    raise ValueError("Unsupported comparison")
+                if isinstance(value, tuple) != (symbol in ("in", "not in")):
+                    raise ValueError("Lists are only supported with 'in'")
+                terms.append(("cmp", column, symbol, value))
+                left = right
+            return terms[0] if len(terms) == 1 else ("and", terms)
+        raise ValueError("Unsupported expression")
+
+    try:
+        return build(tree)
+    except (ValueError, KeyError):
+        return None
+
+
+def _filter_compiled(data: pd.DataFrame, condition: str):
+    """
+    Filters with the cached predicate tree, or returns None to fall back to query.
+    """
+    tree = _compile_condition(condition)
+    if tree is None or not _tree_columns(tree) <= set(data.columns):
+        return None
+    indexes = _live_indexes(data)
+    try:
+        result = _evaluate(tree, data, indexes)
+    except TypeError:
+        return None
+    if result is None:
+        return None
+    kind, rows = result
+    return data.iloc[rows] if kind == "positions" else data[rows]
+
+
+def _tree_columns(tree) -> set:
+    if tree[0] == "cmp":
+        return {tree[1]}
+    if tree[0] == "not":
+        return _tree_columns(tree[1])
+    return set().union(*(_tree_columns(child) for child in tree[1]))
+
+
+def _evaluate(tree, data: pd.DataFrame, indexes: dict):
+    """
+    Evaluates a predicate tree to ("positions", sorted row positions) when 
+    indexes can answer it, else to ("mask", boolean array). Returns None 
+    if a comparison does not give a plain boolean result.
+    """
+    kind = tree[0]
+    if kind == "cmp":
+        index = indexes.get(tree[1])
+        positions = index.lookup(tree[2], tree[3]) if index is not None else None
+        if positions is not None:
+            return "positions", positions
+        mask = _compare(data[tree[1]], tree[2], tree[3])
+        return None if mask is None else ("mask", mask)
+
+    if kind == "and":
+        # Intersect what the indexes can answer, then scan only those rows
+        indexed, rest = [], []
+        for child in tree[1]:
+            index = indexes.get(child[1]) if child[0] == "cmp" else None
+            positions = index.lookup(child[2], child[3]) if index is not None else None
+            if positions is not None:
+                indexed.append(positions)
+            else:
+                rest.append(child)
+        if indexed:
+            candidates = functools.reduce(np.intersect1d, indexed)
+            if rest:
+                sub_result = _evaluate(("and", rest), data.iloc[candidates], {})
+                if sub_result is None:
+                    return None
+                candidates = candidates[sub_result[1]]
+            return "positions", candidates
+        masks = [_evaluate(child, data, indexes) for child in rest]
+        if any(m is None for m in masks):
+            return None
+        return "mask", functools.reduce(np.logical_and, [_as_mask(m, len(data)) for m in masks])
+
+    if kind == "or":
+        results = [_evaluate(child, data, indexes) for child in tree[1]]
+        if any(r is None for r in results):
+            return None
+        if all(r[0] == "positions" for r in results):
+            return "positions", functools.reduce(np.union1d, [r[1] for r in results])
+        return "mask", functools.reduce(np.logical_or, [_as_mask(r, len(data)) for r in results])
+
+    result = _evaluate(tree[1], data, {})
+    return None if result is None else ("mask", ~result[1])
+
+
+def _as_mask(result, n_rows: int) -> np.ndarray:
+    if result[0] == "mask":
+        return result[1]
+    mask = np.zeros(n_rows, dtype=bool)
+    mask[result[1]] = True
+    return mask
+
+
+def _compare(series: pd.Series, op: str, value):
+    if op == "in":
+        result = series.isin(value)
+    elif op == "not in":
+        result = ~series.isin(value)
+    else:
+        result = {
+            "==": operator.eq, "!=": operator.ne, "<": operator.lt, 
+            "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+        }[op](series, value)
+    if result.dtype != bool:
+        return None  # e.g. nullable columns with missing values
+    return result.to_numpy()
+
+
+@dataclass
+class _ColumnIndex:
+    """
+    Secondary index on one column, built by `create_index`.
+
+    'sorted' indexes keep the non-null values in sorted order with their row 
+    positions, for range and equality lookups by binary search. 'bitmap' 
+    indexes keep the sorted row positions of each distinct value, for 
+    equality and `in` lookups.
+    """
+    kind: str
+    source: object
+    sorted_values: np.ndarray = None
+    order: np.ndarray = None
+    postings: dict = None
+
+    def lookup(self, op: str, value):
+        """
+        Returns the sorted positions of matching rows, or None if this index 
+        cannot answer the comparison.
+        """
+        if self.kind == "bitmap":
+            empty = np.array([], dtype=np.intp)
+            if op == "==":
+                return self.postings.get(value, empty)
+            if op == "in":
+                hits = [self.postings[v] for v in set(value) if v in self.postings]
+                return np.sort(np.concatenate(hits)) if hits else empty
+            return None
+
+        if op not in ("==", "<", "<=", ">", ">=") or not _is_number(value):
+            return None
+        values = self.sorted_values
+        lo, hi = 0, len(values)
+        if op in ("==", ">="):
+            lo = np.searchsorted(values, value, side="left")
+        elif op == ">":
+            lo = np.searchsorted(values, value, side="right")
+        if op in ("==", "<="):
+            hi = np.searchsorted(values, value, side="right")
+        elif op == "<":
+            hi = np.searchsorted(values, value, side="left")
+        return np.sort(self.order[lo:hi])
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float, np.number)) and not isinstance(value, bool)
+
+
+def _column_values(series: pd.Series):
+    """
+    The object holding a column's data, used to notice when it is replaced.
+    """
+    if pd.api.types.is_extension_array_dtype(series.dtype):
+        return series.array
+    return series.to_numpy()
+
+
+def _same_values(source, current) -> bool:
+    """
+    Whether `current` (from `_column_values`) is still the data an index was 
+    built from. Under copy-on-write `to_numpy` returns a new read-only view 
+    on every call, so NumPy data is compared by memory location, which the 
+    index's reference to `source` keeps from being reused.
+    """
+    if isinstance(source, np.ndarray) and isinstance(current, np.ndarray):
+        return (
+            source.__array_interface__["data"][0] == current.__array_interface__["data"][0]
+            and source.shape == current.shape 
+            and source.strides == current.strides 
+            and source.dtype == current.dtype
+        )
+    return source is current
+
+
+# Indexes per DataFrame, keyed by id() since DataFrames are not hashable. 
+# Entries are removed when their DataFrame is garbage collected.
+_INDEXES = {}
+
+
+def create_index(data: pd.DataFrame, column: str, kind: str = "auto") -> None:
+    """
+    Builds a secondary index on a column that `filter_data` then uses automatically.
+
+    A 'sorted' index answers range and equality comparisons on numeric 
+    columns by binary search. A 'bitmap' index keeps the rows of each 
+    distinct value and answers `==` and `in` comparisons, which suits 
+    categorical columns. Lookups only touch the matching rows, so repeated 
+    selective filters run in time proportional to the result rather than 
+    the column length.
+
+    An index is dropped when the column is replaced. Call `create_index` 
+    again after changing values in place (e.g. with `.loc`).
+
+    Args:
+        data (pd.DataFrame): The dataset to index.
+        column (str): The column to index.
+        kind (str): 'sorted', 'bitmap' or 'auto', which picks 'sorted' for 
+            numeric columns and 'bitmap' for everything else.
+
+    Raises:
+        ValueError: If the column does not exist or the kind does not fit it.
+
+    Example:
+        >>> create_index(data, "age")
+        >>> create_index(data, "region", kind="bitmap")
+        >>> filter_data(data, "age >= 65 and region in ['North', 'East']")
+    """
+    if column not in data.columns:
+        raise ValueError(f"Column '{column}' not found in the dataset.")
+    series = data[column]
+    numeric = pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype)
+    if kind == "auto":
+        kind = "sorted" if numeric else "bitmap"
+
+    if kind == "sorted":
+        if not numeric:
+            raise ValueError(f"A sorted index needs a numeric column, '{column}' is {series.dtype}.")
+        values = series.to_numpy(dtype=float, na_value=np.nan)
+        order = np.argsort(values, kind="stable")
+        order = order[~np.isnan(values[order])]
+        index = _ColumnIndex(kind, _column_values(series), sorted_values=values[order], order=order)
+    elif kind == "bitmap":
+        codes, uniques = pd.factorize(series)
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        postings = {
+            value: order[bounds[i]:bounds[i + 1]] for i, value in enumerate(uniques)
+        }
+        index = _ColumnIndex(kind, _column_values(series), postings=postings)
+    else:
+        raise ValueError("Invalid value for 'kind'. Use 'sorted', 'bitmap' or 'auto'.")
+
+    key = id(data)
+    if key not in _INDEXES:
+        weakref.finalize(data, _INDEXES.pop, key, None)
+        _INDEXES[key] = {}
+    _INDEXES[key][column] = index
+    print(f"{kind.capitalize()} index created on column: {column}")
+
+
+def drop_index(data: pd.DataFrame, column: str = None) -> None:
+    """
+    Removes the index on `column`, or every index on `data` if no column is given.
+    """
+    indexes = _INDEXES.get(id(data), {})
+    if column is None:
+        indexes.clear()
+    else:
+        indexes.pop(column, None)
+
+
+def _live_indexes(data: pd.DataFrame) -> dict:
+    """
+    Returns the indexes on `data`, dropping any whose column was replaced.
+    """
+    indexes = _INDEXES.get(id(data), {})
+    for column in list(indexes):
+        if column not in data.columns or not _same_values(indexes[column].source, _column_values(data[column])):
+            del indexes[column]
+    return indexes
+
+
 def rename_columns(
     data: pd.DataFrame, 
     columns_mapping: dict
@@ -125,29 +733,1464 @@ def rename_columns(
     print("Columns renamed successfully.")
     return renamed_data
 
-def label_encode(data, column):
+def label_encode(data, column, encoder: "LabelEncoder" = None, n_jobs: int = None):
     """
     Perform label encoding on a categorical column using Pandas and NumPy.
 
     Args:
         data (pd.DataFrame): The dataset containing the categorical column.
-        column (str): The name of the column to encode.
+        column (str or list): The name of the column to encode, or a list of 
+            columns to encode at once.
+        encoder (LabelEncoder): A fitted encoder to take the codes from, so 
+            that separate frames (chunks, daily files) get the same codes. 
+            By default the codes follow the sorted values of this frame.
+        n_jobs (int, optional): Number of worker processes that encode blocks 
+            of the columns. Use -1 for one per CPU. Defaults to the current 
+            process.
 
     Returns:
         pd.DataFrame: The dataset with the encoded column.
     """
-    if column not in data.columns:
-        raise ValueError(f"Column '{column}' not found in the dataset.")
+    columns = [column] if isinstance(column, str) else list(column)
+    for name in columns:
+        if name not in data.columns:
+            raise ValueError(f"Column '{name}' not found in the dataset.")
 
-    # Label Encoding: Convert categories to integer labels
-    data[column] = data[column].astype('category').cat.codes
-    print(f"Label encoding applied to column: {column}")
+    n_workers = _n_workers(n_jobs, len(columns))
+    if n_workers == 1:
+        encoded = _encode_block(data[columns], encoder)
+    else:
+        # Object columns cannot be placed in shared memory, so each worker 
+        # is sent its block of columns
+        bounds = np.linspace(0, len(columns), n_workers + 1).astype(int)
+        blocks = [data[columns[start:stop]] for start, stop in zip(bounds[:-1], bounds[1:])]
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            encoded = pd.concat(executor.map(_encode_block, blocks, [encoder] * n_workers), axis=1)
+    for name in columns:
+        data[name] = encoded[name]
+    if isinstance(column, str):
+        print(f"Label encoding applied to column: {column}")
+    else:
+        print(f"Label encoding applied to columns: {columns}")
     return data
 
+
+def _encode_block(block: pd.DataFrame, encoder: "LabelEncoder" = None) -> pd.DataFrame:
+    """
+    Returns the codes of every column in `block`, possibly in a worker process.
+    """
+    if encoder is not None:
+        return encoder.transform(block, list(block.columns))
+    # Label Encoding: Convert categories to integer labels
+    return pd.DataFrame({
+        name: block[name].astype('category').cat.codes for name in block.columns
+    }, index=block.index)
+
+
+def _code_dtype(n_categories: int):
+    """
+    Returns the smallest signed integer dtype holding codes -1..n_categories-1.
+    """
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+class LabelEncoder:
+    """
+    Label encoder that keeps its vocabulary, so every frame it transforms 
+    gets the same codes.
+
+    Codes follow the sorted categories seen by `fit`, matching `label_encode`, 
+    and are stored in the smallest integer dtype that fits (int8 up to 127 
+    categories, then int16, ...). Missing values are encoded as -1. Values 
+    not in the vocabulary raise a ValueError, or are encoded as -1 with 
+    `handle_unknown="missing"`. `partial_fit` adds new categories at the end, 
+    keeping the codes already handed out.
+
+    Args:
+        handle_unknown (str): 'error' or 'missing'.
+
+    Example:
+        >>> encoder = LabelEncoder().fit(train, ["Color", "Size"])
+        >>> encoder.save("encoder.json")
+        >>> for chunk in chunks:
+        ...     encoded = LabelEncoder.load("encoder.json").transform(chunk)
+    """
+
+    def __init__(self, handle_unknown: str = "error"):
+        if handle_unknown not in ("error", "missing"):
+            raise ValueError("handle_unknown must be 'error' or 'missing'.")
+        self.handle_unknown = handle_unknown
+        self.vocabulary = {}
+
+    def __repr__(self):
+        return f"LabelEncoder(columns={list(self.vocabulary)})"
+
+    def fit(self, data: pd.DataFrame, columns: list = None) -> "LabelEncoder":
+        """
+        Learns the categories of `columns` (default: all non-numeric columns), 
+        replacing any previous vocabulary.
+        """
+        self.vocabulary = {}
+        return self.partial_fit(data, columns)
+
+    def partial_fit(self, data: pd.DataFrame, columns: list = None) -> "LabelEncoder":
+        """
+        Adds the categories of `columns` not seen yet, e.g. from the next chunk.
+        """
+        for column in self._columns(data, columns, fitted=False):
+            categories = data[column].astype("category").cat.categories
+            known = self.vocabulary.get(column)
+            if known is None:
+                self.vocabulary[column] = categories
+            else:
+                self.vocabulary[column] = known.append(categories.difference(known, sort=None))
+        return self
+
+    def transform(self, data: pd.DataFrame, columns: list = None) -> pd.DataFrame:
+        """
+        Returns a copy of `data` with `columns` (default: every fitted column 
+        present in `data`) replaced by their codes. `data` is not modified.
+        """
+        columns = self._columns(data, columns, fitted=True)
+        encoded = data.copy(deep=False)
+        for column in columns:
+            categories = self.vocabulary[column]
+            codes = pd.Categorical(data[column], categories=categories).codes
+            unseen = (codes == -1) & data[column].notna().to_numpy()
+            if unseen.any() and self.handle_unknown == "error":
+                values = pd.unique(data[column][unseen])[:5].tolist()
+                raise ValueError(f"Column '{column}' has values not seen during fit: {values}")
+            encoded[column] = codes.astype(_code_dtype(len(categories)), copy=False)
+        return encoded
+
+    def fit_transform(self, data: pd.DataFrame, columns: list = None) -> pd.DataFrame:
+        return self.fit(data, columns).transform(data, columns)
+
+    def inverse_transform(self, data: pd.DataFrame, columns: list = None) -> pd.DataFrame:
+        """
+        Maps codes back to categories; -1 becomes NaN.
+        """
+        columns = self._columns(data, columns, fitted=True)
+        decoded = data.copy(deep=False)
+        for column in columns:
+            decoded[column] = pd.Categorical.from_codes(
+                data[column].to_numpy(), categories=self.vocabulary[column]
+            ).astype(object)
+        return decoded
+
+    def to_dict(self) -> dict:
+        return {
+            "handle_unknown": self.handle_unknown,
+            "vocabulary": {c: cats.tolist() for c, cats in self.vocabulary.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LabelEncoder":
+        encoder = cls(data.get("handle_unknown", "error"))
+        encoder.vocabulary = {c: pd.Index(cats) for c, cats in data["vocabulary"].items()}
+        return encoder
+
+    def save(self, path: str) -> None:
+        """
+        Writes the encoder as compact JSON. Categories must be strings, 
+        numbers or booleans.
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, separators=(",", ":"))
+        print(f"Label encoder saved to {path}")
+
+    @classmethod
+    def load(cls, path: str) -> "LabelEncoder":
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def _columns(self, data: pd.DataFrame, columns, fitted: bool) -> list:
+        if columns is None:
+            if fitted:
+                return [c for c in self.vocabulary if c in data.columns]
+            return [c for c in data.columns if not _is_numeric(data[c])]
+        columns = [columns] if isinstance(columns, str) else list(columns)
+        for column in columns:
+            if column not in data.columns:
+                raise ValueError(f"Column '{column}' not found in the dataset.")
+            if fitted and column not in self.vocabulary:
+                raise ValueError(f"Column '{column}' was not fitted.")
+        return columns
+
+
+SCALER_METHODS = ("standard", "minmax", "robust")
+
+
+class Scaler:
+    """
+    Feature scaler fitted once and applied to any number of frames or chunks.
+
+    - 'standard': subtract the mean, divide by the standard deviation.
+    - 'minmax': map the minimum to 0 and the maximum to 1.
+    - 'robust': subtract the median, divide by the interquartile range, 
+      so outliers have little influence.
+
+    Statistics ignore NaN values, which stay NaN. Columns with zero spread 
+    are only centered. All columns are processed together as one 2D array, 
+    `chunksize` rows at a time, so the temporary memory is bounded by the 
+    chunk rather than the frame.
+
+    Args:
+        method (str): 'standard', 'minmax' or 'robust'.
+
+    Example:
+        >>> scaler = Scaler("robust").fit(train, ["age", "fare"])
+        >>> scaled = scaler.transform(test, chunksize=100_000)
+        >>> for chunk in iter_csv("data/large.csv"):
+        ...     scaled_chunk = scaler.transform(chunk)
+    """
+
+    def __init__(self, method: str = "standard"):
+        if method not in SCALER_METHODS:
+            raise ValueError(f"Invalid scaling method '{method}'. Use one of {SCALER_METHODS}.")
+        self.method = method
+        self.center = None
+        self.scale = None
+        self._moments = None
+
+    def fit(self, data: pd.DataFrame, columns: list = None) -> "Scaler":
+        """
+        Computes the statistics of `columns` (default: all numeric columns).
+        """
+        self._moments = None
+        columns = _numeric_columns(data, columns)
+        values = data[columns].to_numpy(dtype=float, na_value=np.nan)
+        with warnings.catch_warnings():
+            # All-NaN columns give NaN statistics
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            if self.method == "standard":
+                center, scale = np.nanmean(values, axis=0), np.nanstd(values, axis=0)
+            elif self.method == "minmax":
+                center = np.nanmin(values, axis=0)
+                scale = np.nanmax(values, axis=0) - center
+            else:
+                q1, center, q3 = np.nanpercentile(values, [25, 50, 75], axis=0)
+                scale = q3 - q1
+        self._set(columns, center, scale)
+        return self
+
+    def partial_fit(self, data: pd.DataFrame, columns: list = None) -> "Scaler":
+        """
+        Updates the statistics with another chunk, for data too large to fit 
+        at once. Not available for 'robust', whose quantiles need all values.
+        """
+        if self.method == "robust":
+            raise ValueError("Robust scaling needs all values at once; use fit().")
+        columns = _numeric_columns(data, columns if self._moments is None else self._moments[0])
+        values = data[columns].to_numpy(dtype=float, na_value=np.nan)
+        count = np.sum(~np.isnan(values), axis=0)
+        with warnings.catch_warnings():
+            # All-NaN columns give NaN statistics
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            if self.method == "standard":
+                mean = np.nan_to_num(np.nanmean(values, axis=0))
+                moments = (count, mean, np.nansum((values - mean) ** 2, axis=0))
+            else:
+                moments = (count, np.nanmin(values, axis=0), np.nanmax(values, axis=0))
+        if self._moments is not None:
+            (n_a, a1, a2), (n_b, b1, b2) = self._moments[1], moments
+            if self.method == "standard":
+                # Chan et al.'s pairwise update of the mean and the sum of squares
+                n = n_a + n_b
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    weight = np.where(n > 0, n_b / n, 0.0)
+                delta = b1 - a1
+                moments = (n, a1 + delta * weight, a2 + b2 + delta ** 2 * n_a * weight)
+            else:
+                moments = (n_a + n_b, np.fmin(a1, b1), np.fmax(a2, b2))
+        self._moments = (columns, moments)
+
+        count, a, b = moments
+        if self.method == "standard":
+            with np.errstate(invalid="ignore", divide="ignore"):
+                center = np.where(count > 0, a, np.nan)
+                scale = np.sqrt(b / count)
+        else:
+            center, scale = a, b - a
+        self._set(columns, center, scale)
+        return self
+
+    def transform(self, data: pd.DataFrame, chunksize: int = 1_000_000) -> pd.DataFrame:
+        """
+        Returns a copy of `data` with the fitted columns scaled to float64.
+        """
+        self._check_fitted(data)
+        columns = list(self.center.index)
+        center, scale = self.center.to_numpy(), self.scale.to_numpy()
+        scaled = np.empty((len(data), len(columns)))
+        for start in range(0, len(data), chunksize):
+            # Rows first, so only the chunk's rows of the columns are copied
+            block = data.iloc[start:start + chunksize][columns].to_numpy(dtype=float, na_value=np.nan)
+            np.subtract(block, center, out=scaled[start:start + chunksize])
+            scaled[start:start + chunksize] /= scale
+        return self._replace(data, columns, scaled)
+
+    def fit_transform(self, data: pd.DataFrame, columns: list = None) -> pd.DataFrame:
+        return self.fit(data, columns).transform(data)
+
+    def inverse_transform(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Maps scaled values back to the original units.
+        """
+        self._check_fitted(data)
+        columns = list(self.center.index)
+        values = data[columns].to_numpy(dtype=float, na_value=np.nan)
+        return self._replace(data, columns, values * self.scale.to_numpy() + self.center.to_numpy())
+
+    def to_dict(self) -> dict:
+        return {
+            "method": self.method,
+            "center": self.center.to_dict() if self.center is not None else None,
+            "scale": self.scale.to_dict() if self.scale is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Scaler":
+        scaler = cls(data["method"])
+        if data.get("center") is not None:
+            scaler.center = pd.Series(data["center"], dtype=float)
+            scaler.scale = pd.Series(data["scale"], dtype=float)
+        return scaler
+
+    def _set(self, columns, center, scale) -> None:
+        # Constant columns are centered only, instead of dividing by zero
+        scale = np.where((scale == 0) | np.isnan(scale), 1.0, scale)
+        self.center = pd.Series(center, index=columns, dtype=float)
+        self.scale = pd.Series(scale, index=columns, dtype=float)
+
+    def _check_fitted(self, data: pd.DataFrame) -> None:
+        if self.center is None:
+            raise ValueError("The scaler has not been fitted.")
+        missing = [c for c in self.center.index if c not in data.columns]
+        if missing:
+            raise ValueError(f"Columns {missing} not found in the dataset.")
+
+    @staticmethod
+    def _replace(data: pd.DataFrame, columns: list, values: np.ndarray) -> pd.DataFrame:
+        result = data.copy(deep=False)
+        result[columns] = pd.DataFrame(values, index=data.index, columns=columns)
+        return result
+
+
+def _numeric_columns(data: pd.DataFrame, columns: list = None) -> list:
+    """
+    Checks `columns`, or returns all numeric non-bool columns of `data`.
+    """
+    if columns is None:
+        return [
+            c for c, dtype in data.dtypes.items()
+            if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+        ]
+    columns = [columns] if isinstance(columns, str) else list(columns)
+    for column in columns:
+        if column not in data.columns:
+            raise ValueError(f"Column '{column}' not found in the dataset.")
+    return columns
+
+
+class OneHotEncoder:
+    """
+    One-hot encoder with sparse outputs for high-cardinality columns.
+
+    A dense dummy matrix needs one byte per row for every category of every 
+    column. The sparse outputs only store the single 1 each row has per 
+    column, so their size grows with the number of rows and columns but 
+    not with the number of categories.
+
+    Missing values, and with `handle_unknown="ignore"` categories not seen 
+    during fit, become all-zero rows.
+
+    Args:
+        output (str): 'sparse' for a SciPy CSR matrix (requires the optional 
+            `scipy` package), 'pandas' for a DataFrame whose dummy columns 
+            use `pd.SparseDtype`, or 'dense' for ordinary uint8 dummy columns.
+        handle_unknown (str): 'ignore' or 'error'.
+
+    Attributes:
+        categories (dict): The categories of each fitted column.
+        feature_names (list): Names of the output columns, '<column>_<category>'.
+
+    Example:
+        >>> encoder = OneHotEncoder(output="sparse").fit(train, ["city", "device"])
+        >>> matrix = encoder.transform(test)
+        >>> encoder.feature_names[:3]
+        ['city_Aberdeen', 'city_Bath', 'city_Belfast']
+    """
+
+    def __init__(self, output: str = "sparse", handle_unknown: str = "ignore"):
+        if output not in ("sparse", "pandas", "dense"):
+            raise ValueError("output must be 'sparse', 'pandas' or 'dense'.")
+        if handle_unknown not in ("ignore", "error"):
+            raise ValueError("handle_unknown must be 'ignore' or 'error'.")
+        self.output = output
+        self.handle_unknown = handle_unknown
+        self.categories = {}
+
+    @property
+    def feature_names(self) -> list:
+        return [f"{column}_{value}" for column, cats in self.categories.items() for value in cats]
+
+    def fit(self, data: pd.DataFrame, columns: list = None) -> "OneHotEncoder":
+        """
+        Learns the categories of `columns` (default: all non-numeric columns).
+        """
+        if columns is None:
+            columns = [c for c in data.columns if not _is_numeric(data[c])]
+        columns = [columns] if isinstance(columns, str) else list(columns)
+        self.categories = {}
+        for column in columns:
+            if column not in data.columns:
+                raise ValueError(f"Column '{column}' not found in the dataset.")
+            self.categories[column] = data[column].astype("category").cat.categories
+        return self
+
+    def transform(self, data: pd.DataFrame):
+        """
+        Encodes the fitted columns of `data`.
+
+        Returns:
+            scipy.sparse.csr_matrix with `output='sparse'`, with one column per 
+            entry of `feature_names`; otherwise a DataFrame in which the fitted 
+            columns are replaced by their dummy columns.
+        """
+        if not self.categories:
+            raise ValueError("The encoder has not been fitted.")
+        # Column index of each row's 1 for every fitted column, -1 for none
+        n_rows, offset, positions = len(data), 0, []
+        for column, cats in self.categories.items():
+            if column not in data.columns:
+                raise ValueError(f"Column '{column}' not found in the dataset.")
+            codes = pd.Categorical(data[column], categories=cats).codes.astype(np.int64)
+            if self.handle_unknown == "error":
+                unseen = (codes == -1) & data[column].notna().to_numpy()
+                if unseen.any():
+                    values = pd.unique(data[column][unseen])[:5].tolist()
+                    raise ValueError(f"Column '{column}' has values not seen during fit: {values}")
+            positions.append(np.where(codes >= 0, codes + offset, -1))
+            offset += len(cats)
+
+        if self.output == "dense":
+            dummies = np.zeros((n_rows, offset), dtype=np.uint8)
+            rows = np.arange(n_rows)
+            for columns_at in positions:
+                hit = columns_at >= 0
+                dummies[rows[hit], columns_at[hit]] = 1
+            encoded = pd.DataFrame(dummies, index=data.index, columns=self.feature_names)
+        else:
+            try:
+                from scipy import sparse
+            except ImportError:
+                raise ImportError("Sparse one-hot output requires the optional 'scipy' package.")
+            columns_at = np.stack(positions, axis=1).ravel() if positions else np.empty(0, np.int64)
+            rows = np.repeat(np.arange(n_rows), len(positions))
+            hit = columns_at >= 0
+            matrix = sparse.csr_matrix(
+                (np.ones(hit.sum(), dtype=np.uint8), (rows[hit], columns_at[hit])), 
+                shape=(n_rows, offset)
+            )
+            if self.output == "sparse":
+                return matrix
+            encoded = pd.DataFrame.sparse.from_spmatrix(
+                matrix, index=data.index, columns=self.feature_names
+            )
+
+        rest = data.drop(columns=list(self.categories))
+        return pd.concat([rest, encoded], axis=1)
+
+    def fit_transform(self, data: pd.DataFrame, columns: list = None):
+        return self.fit(data, columns).transform(data)
+
+
+# Node types allowed in a filter condition that is moved to another point 
+# in a pipeline. Calls and attribute access (e.g. "A > A.mean()") may look at 
+# other rows, so conditions using them are left where they are.
+ROW_LOCAL_NODES = (
+    ast.Expression, ast.BoolOp, ast.BinOp, ast.UnaryOp, ast.Compare, ast.Name, 
+    ast.Load, ast.Constant, ast.List, ast.Tuple, ast.boolop, ast.operator, 
+    ast.unaryop, ast.cmpop,
+)
+
+
+@dataclass
+class _Step:
+    """
+    One recorded pipeline step. `prefilter` holds a filter condition fused 
+    into a drop or merge step by the optimizer.
+    """
+    kind: str
+    args: dict
+    prefilter: str = None
+    right_columns: list = None
+
+
+def _condition_columns(condition: str):
+    """
+    Returns (names referenced, row_local) for a filter condition, or 
+    (None, False) if it cannot be analysed.
+    """
+    try:
+        tree = ast.parse(condition, mode="eval")
+    except SyntaxError:
+        return None, False
+    names = {node.id for node in ast.walk(tree) if isinstance(node, ast.Name)}
+    row_local = all(isinstance(node, ROW_LOCAL_NODES) for node in ast.walk(tree))
+    return names, row_local
+
+
+class Pipeline:
+    """
+    Lazy chain of wrangle steps that is optimized and run on `collect()`.
+
+    Each method records a step and returns the pipeline, so calls can be 
+    chained. Nothing runs until `collect()`, which first rewrites the plan:
+
+    - Filters are moved ahead of renames and row-wise cleaning they do not 
+      depend on, and fused into the nearest drop-NaN cleaning or inner/left 
+      merge, so those steps only process the rows that survive the filter. 
+      The original index labels are restored, so the result is unchanged.
+    - Columns that no later step or the final `select` uses are dropped 
+      from the input and from merged frames before any work is done.
+    - Adjacent renames are merged into one.
+
+    Filters are only moved when their condition is row-wise (comparisons 
+    and arithmetic on columns, no method calls) and does not read columns 
+    the skipped steps change.
+
+    A pipeline created with `Pipeline.scan` reads its input in chunks and 
+    runs the steps on one chunk at a time, so memory use follows the chunk 
+    size rather than the file size. Steps that need the whole dataset get 
+    an extra pass over the file first: column-mean cleaning computes the 
+    global means, and `label_encode` without an encoder collects every 
+    category, so the result matches running on the whole file at once.
+
+    Args:
+        data (pd.DataFrame): The input dataset.
+
+    Example:
+        >>> result = (
+                Pipeline(data)
+                .clean(remove_columns=["age"])
+                .merge(regions, on="region_id")
+                .filter("age > 30")
+                .rename({"age": "years"})
+                .select(["years", "region_name"])
+                .collect()
+            )
+    """
+
+    def __init__(self, data: pd.DataFrame):
+        self.data = data
+        self.steps = []
+        self.source = None
+        self.chunksize = None
+
+    @classmethod
+    def scan(cls, source: str, chunksize: int = 100_000) -> "Pipeline":
+        """
+        Creates a pipeline that reads `source` chunk by chunk instead of 
+        holding it in memory.
+
+        Args:
+            source (str): Path to a CSV file (read with `iter_csv`, so the 
+                dtypes are inferred once) or a '.parquet' file.
+            chunksize (int): Number of rows per chunk.
+
+        Returns:
+            Pipeline: A pipeline whose `data` is an empty frame with the 
+            columns and dtypes of `source`.
+
+        Example:
+            >>> (
+                    Pipeline.scan("data/large.csv", chunksize=200_000)
+                    .clean(fill_with="mean")
+                    .filter("age > 30")
+                    .label_encode("region")
+                    .sink_parquet("data/clean.parquet")
+                )
+        """
+        if _is_parquet(source):
+            import pyarrow.parquet as pq
+            schema = pq.read_schema(source).empty_table().to_pandas()
+        else:
+            dtypes = infer_csv_dtypes(source)
+            schema = pd.DataFrame({c: pd.Series(dtype=d) for c, d in dtypes.items()})
+        pipeline = cls(schema)
+        pipeline.source = source
+        pipeline.chunksize = chunksize
+        return pipeline
+
+    def clean(self, **kwargs) -> "Pipeline":
+        """
+        Adds a `clean_data` step; takes the same keyword arguments.
+        """
+        kwargs.pop("inplace", None)
+        return self._add("clean", kwargs)
+
+    def filter(self, condition: str) -> "Pipeline":
+        """
+        Adds a `filter_data` step.
+        """
+        return self._add("filter", {"condition": condition})
+
+    def rename(self, columns_mapping: dict) -> "Pipeline":
+        """
+        Adds a `rename_columns` step.
+        """
+        return self._add("rename", {"columns_mapping": dict(columns_mapping)})
+
+    def label_encode(self, column, encoder: LabelEncoder = None) -> "Pipeline":
+        """
+        Adds a `label_encode` step for one column or a list of columns.
+        """
+        return self._add("label_encode", {"column": column, "encoder": encoder})
+
+    def merge(self, other: pd.DataFrame, on: str, how: str = "inner") -> "Pipeline":
+        """
+        Adds a `merge_datasets` step with this pipeline's data on the left.
+        """
+        return self._add("merge", {"other": other, "on": on, "how": how})
+
+    def select(self, columns: list) -> "Pipeline":
+        """
+        Adds a step keeping only `columns`, in that order.
+        """
+        return self._add("select", {"columns": list(columns)})
+
+    def collect(self, optimize: bool = True) -> pd.DataFrame:
+        """
+        Runs the pipeline.
+
+        Args:
+            optimize (bool): Rewrite the plan before running it. With False 
+                the steps run exactly as recorded.
+
+        Returns:
+            pd.DataFrame: The result of the last step.
+        """
+        if self.source is not None:
+            source_columns, steps = self._chunked_plan(optimize)
+            chunks = [self._run_chunk(steps, chunk) for chunk in self._chunks(source_columns)]
+            if not chunks:
+                return self._run_chunk(steps, self.data)
+            return pd.concat(chunks, ignore_index=True)
+
+        source_columns, steps = self._plan() if optimize else (None, self.steps)
+        data = self.data
+        if source_columns is not None:
+            data = data[source_columns]
+            print(f"Pipeline input pruned to {len(source_columns)} columns.")
+        for step in steps:
+            data = self._run(step, data)
+        return data
+
+    def sink_parquet(self, out_path: str, optimize: bool = True) -> None:
+        """
+        Runs a pipeline created with `Pipeline.scan` and writes the result 
+        to a Parquet file one chunk at a time.
+
+        Args:
+            out_path (str): Path of the Parquet file to write.
+            optimize (bool): Rewrite the plan before running it.
+
+        Raises:
+            ValueError: If the pipeline was not created with `scan`, a step 
+                cannot run chunk by chunk, or chunks produce different schemas.
+        """
+        if self.source is None:
+            raise ValueError("sink_parquet needs a pipeline created with Pipeline.scan.")
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("sink_parquet requires the optional 'pyarrow' package.")
+
+        source_columns, steps = self._chunked_plan(optimize)
+        writer, n_rows, n_chunks = None, 0, 0
+        try:
+            for chunk in self._chunks(source_columns):
+                table = pa.Table.from_pandas(self._run_chunk(steps, chunk), preserve_index=False)
+                n_chunks += 1
+                if writer is None:
+                    if table.num_rows == 0:
+                        continue  # its types may be unknown, e.g. all-null columns
+                    writer = pq.ParquetWriter(out_path, table.schema)
+                elif not table.schema.equals(writer.schema):
+                    try:
+                        table = table.cast(writer.schema)
+                    except (pa.ArrowInvalid, pa.ArrowNotImplementedError, ValueError) as e:
+                        raise ValueError(f"Chunk {n_chunks - 1} does not match the output schema: {e}")
+                writer.write_table(table)
+                n_rows += table.num_rows
+        finally:
+            if writer is not None:
+                writer.close()
+        if writer is None:
+            empty = self._run_chunk(steps, self.data)
+            pq.write_table(pa.Table.from_pandas(empty, preserve_index=False), out_path)
+        print(f"Pipeline output written to {out_path}: {n_rows} rows from {n_chunks} chunks.")
+
+    def explain(self) -> str:
+        """
+        Describes the optimized plan, one step per line.
+        """
+        source_columns, steps = self._plan()
+        lines = []
+        if source_columns is not None:
+            lines.append(f"read columns {source_columns}")
+        for step in steps:
+            args = {k: v for k, v in step.args.items() if k != "other"}
+            line = f"{step.kind} {args}"
+            if step.prefilter is not None:
+                line += f" on rows where {step.prefilter!r}"
+            if step.right_columns is not None:
+                line += f" with right columns {step.right_columns}"
+            lines.append(line)
+        return "\n".join(lines)
+
+    def _add(self, kind: str, args: dict) -> "Pipeline":
+        self.steps.append(_Step(kind, args))
+        return self
+
+    # Planning
+
+    def _schemas(self, steps: list) -> list:
+        """
+        Returns, for each step, a dict of {column: is_numeric} before it, 
+        followed by the output schema.
+        """
+        schema = {c: _is_numeric(self.data[c]) for c in self.data.columns}
+        schemas = [schema]
+        for step in steps:
+            if step.kind == "rename":
+                mapping = step.args["columns_mapping"]
+                schema = {mapping.get(c, c): numeric for c, numeric in schema.items()}
+            elif step.kind == "label_encode":
+                schema = dict(schema, **{c: True for c in _as_list(step.args["column"])})
+            elif step.kind == "merge":
+                other = step.args["other"]
+                right = {c: _is_numeric(other[c]) for c in other.columns}
+                schema = _merged_schema(schema, right, step.args["on"])
+            elif step.kind == "select":
+                schema = {c: schema.get(c, False) for c in step.args["columns"]}
+            schemas.append(schema)
+        return schemas
+
+    def _plan(self):
+        steps = [_Step(s.kind, dict(s.args)) for s in self.steps]
+        steps = self._push_filters(steps)
+        steps = self._merge_renames(steps)
+        source_columns = self._prune(steps)
+        return source_columns, steps
+
+    def _push_filters(self, steps: list) -> list:
+        i = 0
+        while i < len(steps):
+            if steps[i].kind != "filter":
+                i += 1
+                continue
+            condition = steps[i].args["condition"]
+            names, row_local = _condition_columns(condition)
+            position, fused = i, False
+            while row_local and position > 0:
+                schema = self._schemas(steps)[position - 1]
+                if not names <= set(schema):
+                    break  # e.g. the index or a local variable
+                action = _filter_action(steps[position - 1], names, schema)
+                if action == "swap":
+                    steps[position - 1], steps[position] = steps[position], steps[position - 1]
+                    position -= 1
+                    continue
+                if action == "fuse":
+                    steps[position - 1].prefilter = condition
+                    del steps[position]
+                    fused = True
+                break
+            # The steps the filter moved past were already visited
+            i = i if fused else i + 1
+        return steps
+
+    def _merge_renames(self, steps: list) -> list:
+        merged = []
+        for step in steps:
+            if step.kind == "rename" and merged and merged[-1].kind == "rename":
+                # Compose the two mappings column by column
+                before = self._schemas(merged[:-1])[-1]
+                first = merged[-1].args["columns_mapping"]
+                second = step.args["columns_mapping"]
+                combined = {}
+                for column in before:
+                    middle = first.get(column, column)
+                    final = second.get(middle, middle)
+                    if final != column:
+                        combined[column] = final
+                merged[-1] = _Step("rename", {"columns_mapping": combined})
+            else:
+                merged.append(step)
+        return merged
+
+    def _prune(self, steps: list):
+        """
+        Works backwards from the output to find the columns each step needs. 
+        Sets `right_columns` on merges and returns the input columns to read, 
+        or None when every column is needed.
+        """
+        schemas = self._schemas(steps)
+        required = set(schemas[-1])
+        for step, before in zip(reversed(steps), reversed(schemas[:-1])):
+            required = _required_before(step, before, required)
+        if set(self.data.columns) <= required:
+            return None
+        return [c for c in self.data.columns if c in required]
+
+    # Chunked execution
+
+    def _chunks(self, columns: list = None):
+        if _is_parquet(self.source):
+            import pyarrow.parquet as pq
+            batches = pq.ParquetFile(self.source).iter_batches(
+                batch_size=self.chunksize, columns=columns
+            )
+            for batch in batches:
+                yield batch.to_pandas()
+        else:
+            yield from iter_csv(self.source, chunksize=self.chunksize, usecols=columns)
+
+    def _chunked_plan(self, optimize: bool):
+        """
+        Plans the steps for chunked execution, replacing the steps that need 
+        the whole dataset with ones that use statistics from a pass over it.
+        """
+        if optimize:
+            source_columns, steps = self._plan()
+        else:
+            source_columns = None
+            steps = [_Step(s.kind, dict(s.args)) for s in self.steps]
+        for i, step in enumerate(steps):
+            if step.kind == "filter":
+                names, row_local = _condition_columns(step.args["condition"])
+                if not row_local:
+                    raise ValueError(
+                        f"Filter {step.args['condition']!r} is not row-wise and cannot run on chunks."
+                    )
+            elif step.kind == "merge" and step.args["how"] not in ("inner", "left"):
+                raise ValueError("Only inner and left merges can run on chunks.")
+            elif step.kind == "clean" and _is_mean_clean(step.args):
+                # First pass: global column means of the data reaching this step
+                sums, counts = pd.Series(dtype=float), pd.Series(dtype=float)
+                for chunk in self._chunks(source_columns):
+                    numeric = self._run_chunk(steps[:i], chunk).select_dtypes(include=["number"])
+                    sums = sums.add(numeric.sum().astype(float), fill_value=0)
+                    counts = counts.add(numeric.count(), fill_value=0)
+                step.args["fill_with"] = (sums / counts).to_dict()
+            elif step.kind == "label_encode" and step.args.get("encoder") is None:
+                # First pass: every category, sorted as `label_encode` sorts them
+                columns = _as_list(step.args["column"])
+                encoder = LabelEncoder()
+                for chunk in self._chunks(source_columns):
+                    encoder.partial_fit(self._run_chunk(steps[:i], chunk), columns)
+                if all(c in encoder.vocabulary for c in columns):
+                    for column in columns:
+                        encoder.vocabulary[column] = encoder.vocabulary[column].sort_values()
+                    step.args["encoder"] = encoder
+        return source_columns, steps
+
+    def _run_chunk(self, steps: list, chunk: pd.DataFrame) -> pd.DataFrame:
+        # The per-step messages would be repeated for every chunk
+        with contextlib.redirect_stdout(io.StringIO()):
+            for step in steps:
+                chunk = self._run(step, chunk)
+        return chunk
+
+    def _run(self, step: _Step, data: pd.DataFrame) -> pd.DataFrame:
+        args = step.args
+        if step.kind == "filter":
+            return filter_data(data, args["condition"])
+        if step.kind == "rename":
+            return rename_columns(data, args["columns_mapping"])
+        if step.kind == "label_encode":
+            # label_encode writes into its input, which may be the caller's frame
+            return label_encode(data.copy(deep=False), args["column"], args["encoder"])
+        if step.kind == "select":
+            return data[args["columns"]]
+        if step.kind == "clean":
+            if step.prefilter is None:
+                return clean_data(data, **args)
+            return _clean_prefiltered(data, args, step.prefilter)
+        if step.kind == "merge":
+            other = args["other"]
+            if step.right_columns is not None:
+                other = other[step.right_columns]
+            if step.prefilter is None:
+                return merge_datasets(data, other, args["on"], args["how"])
+            return _merge_prefiltered(data, other, args["on"], args["how"], step.prefilter)
+        raise ValueError(f"Unknown pipeline step '{step.kind}'.")
+
+
+def _is_numeric(series: pd.Series) -> bool:
+    return pd.api.types.is_numeric_dtype(series.dtype)
+
+
+def _as_list(column) -> list:
+    return [column] if isinstance(column, str) else list(column)
+
+
+def _merged_schema(left: dict, right: dict, on: str) -> dict:
+    """
+    Column names of `pd.merge(left, right, on=on)`, with its default suffixes.
+    """
+    overlap = (set(left) & set(right)) - {on}
+    schema = {(c + "_x" if c in overlap else c): n for c, n in left.items()}
+    schema.update({(c + "_y" if c in overlap else c): n for c, n in right.items() if c != on})
+    return schema
+
+
+def _is_parquet(path) -> bool:
+    return str(path).lower().endswith((".parquet", ".pq"))
+
+
+def _is_mean_clean(args: dict) -> bool:
+    """
+    Whether a clean step fills NaN values with the means of its columns.
+    """
+    return (
+        args.get("apply_to", "columns") == "columns" 
+        and not args.get("remove_columns") 
+        and args.get("fill_with") in ("mean", "average")
+    )
+
+
+def _is_drop_clean(args: dict) -> bool:
+    """
+    Whether a clean step only drops rows (and possibly casts), rather than filling.
+    """
+    fill_with = args.get("fill_with")
+    if args.get("apply_to", "columns") == "columns":
+        fills = isinstance(fill_with, dict) or fill_with in ("mean", "average")
+        return bool(args.get("remove_columns")) or not fills
+    return isinstance(fill_with, dict) or fill_with not in ROW_FILL_STRATEGIES
+
+
+def _filter_action(prev: _Step, names: set, schema: dict) -> str:
+    """
+    Decides whether a filter reading `names` can be swapped ahead of `prev`, 
+    fused into it, or must stay after it.
+    """
+    numeric = {c for c, is_numeric in schema.items() if is_numeric}
+    if prev.kind == "rename":
+        mapping = prev.args["columns_mapping"]
+        touched = set(mapping) | set(mapping.values())
+        return "swap" if not names & touched else "stay"
+    if prev.kind == "clean" and prev.prefilter is None:
+        args = prev.args
+        values_kept = args.get("preserve_dtypes") and args.get("decimals") is None
+        if _is_drop_clean(args):
+            return "fuse" if values_kept or not names & numeric else "stay"
+        if args.get("apply_to") == "rows":
+            # Row fills only change numeric values within each row
+            return "swap" if not names & numeric else "stay"
+        return "stay"
+    if prev.kind == "merge" and prev.prefilter is None:
+        on, how = prev.args["on"], prev.args["how"]
+        other = prev.args["other"]
+        overlap = (set(schema) & set(other.columns)) - {on}
+        if how in ("inner", "left") and isinstance(on, str) and not names & overlap:
+            return "fuse"
+    return "stay"
+
+
+def _required_before(step: _Step, before: dict, required: set) -> set:
+    """
+    Columns needed before `step` so that `required` is available after it.
+    """
+    kind, args = step.kind, step.args
+    if step.prefilter is not None:
+        names, _ = _condition_columns(step.prefilter)
+        required = required | (names & set(before))
+    if kind == "select":
+        return set(args["columns"])
+    if kind == "filter":
+        names, _ = _condition_columns(args["condition"])
+        return set(before) if names is None else required | (names & set(before))
+    if kind == "rename":
+        mapping = args["columns_mapping"]
+        return {c for c in before if mapping.get(c, c) in required}
+    if kind == "label_encode":
+        return required | set(_as_list(args["column"]))
+    if kind == "clean":
+        if args.get("apply_to", "columns") == "columns":
+            if args.get("remove_columns"):
+                return required | set(args["remove_columns"])
+            if args.get("fill_with") in ("mean", "average"):
+                return required & set(before)
+        # Dropping on any NaN, or filling across a row, reads every column
+        return set(before)
+    if kind == "merge":
+        on, other = args["on"], args["other"]
+        # Overlapping columns are kept on both sides even when unused, as 
+        # dropping one would change which names pd.merge suffixes
+        overlap = (set(before) & set(other.columns)) - {on}
+        step.right_columns = [c for c in other.columns if c == on or c in overlap or c in required]
+        if len(step.right_columns) == len(other.columns):
+            step.right_columns = None
+        return {c for c in before if c == on or c in overlap or c in required}
+    return set(before)
+
+
+def _clean_prefiltered(data: pd.DataFrame, args: dict, condition: str) -> pd.DataFrame:
+    """
+    Runs a drop-NaN `clean_data` step fused with the filter that followed it.
+
+    The rows are selected once, and the index labels the unfused steps 
+    would have produced (positions among the rows the clean keeps) are 
+    restored.
+    """
+    mask = data.eval(condition).to_numpy(dtype=bool)
+    subset = args.get("remove_columns") if args.get("apply_to", "columns") == "columns" else None
+    keep = (data[subset] if subset else data).notna().all(axis=1).to_numpy()
+    rows = mask & keep
+    print("Data filtered successfully.")
+    cleaned = clean_data(data[rows], **args)
+    cleaned.index = pd.Index((np.cumsum(keep) - 1)[rows])
+    return cleaned
+
+
+def _merge_prefiltered(
+    data: pd.DataFrame, other: pd.DataFrame, on: str, how: str, condition: str
+) -> pd.DataFrame:
+    """
+    Runs an inner or left `merge_datasets` step on only the left rows that 
+    pass the filter which followed it.
+
+    pd.merge may interleave the rows of different left rows (e.g. when both 
+    sides repeat keys), so the order and index labels of the unfused merge 
+    are taken from a merge of the key columns alone, tagged with the left 
+    and right row positions, and the fused result is put in that order.
+    """
+    left_pos = _unused_name("__left_pos", data, other)
+    right_pos = _unused_name("__right_pos", data, other)
+    positions = np.arange(len(data))
+    full = pd.merge(
+        data[[on]].assign(**{left_pos: positions}), 
+        other[[on]].assign(**{right_pos: np.arange(len(other))}), 
+        on=on, how=how
+    )
+    mask = data.eval(condition).to_numpy(dtype=bool)
+    print("Data filtered successfully.")
+    merged = merge_datasets(
+        data[mask].assign(**{left_pos: positions[mask]}), 
+        other.assign(**{right_pos: np.arange(len(other))}), 
+        on, how
+    )
+
+    def row_codes(frame):
+        # Unique per output row: unmatched left rows have no right position
+        right = frame[right_pos].fillna(-1).to_numpy(dtype=np.int64) + 1
+        return frame[left_pos].to_numpy(dtype=np.int64) * (len(other) + 1) + right
+
+    labels = pd.Index(row_codes(full)).get_indexer(row_codes(merged))
+    order = np.argsort(labels, kind="stable")
+    merged = merged.iloc[order].drop(columns=[left_pos, right_pos])
+    merged.index = pd.Index(labels[order])
+    return merged
+
+
+def _unused_name(base: str, *frames) -> str:
+    name = base
+    while any(name in frame.columns for frame in frames):
+        name += "_"
+    return name
+
+
+class ResultCache:
+    """
+    Opt-in memoization for functions that take and return DataFrames, such 
+    as `clean_data`, `filter_data` and `merge_datasets`.
+
+    Calls are keyed by the function, its arguments and a fingerprint of 
+    each DataFrame or Series argument: its shape, columns, dtypes and 
+    `pd.util.hash_pandas_object` of `sample_blocks` evenly spaced blocks of 
+    `block_rows` rows (the whole frame if it is smaller). Fingerprinting is 
+    therefore fast on large frames, but an edit confined to rows outside 
+    the sampled blocks is not noticed; use `sample_blocks=None` to hash 
+    every row.
+
+    Results are kept in memory up to `max_memory_bytes`, least recently 
+    used first out. With a `cache_dir`, DataFrame results are also written 
+    there as Parquet, up to `max_disk_bytes`, so later sessions and 
+    scheduled jobs reuse them. Callers always receive a copy.
+
+    Only memoize functions that do not modify their inputs: calls with 
+    `inplace=True` are run uncached, and `label_encode`, which writes into 
+    its input, should not be memoized.
+
+    Args:
+        cache_dir (str, optional): Directory for the Parquet tier. Requires 
+            the optional `pyarrow` package.
+        max_memory_bytes (int): Upper bound on the in-memory results.
+        max_disk_bytes (int): Upper bound on the Parquet files.
+        sample_blocks (int, optional): Blocks hashed per DataFrame argument.
+        block_rows (int): Rows per hashed block.
+
+    Attributes:
+        memory_hits (int): Calls served from memory.
+        disk_hits (int): Calls served from the Parquet tier.
+        misses (int): Calls that ran the function.
+
+    Example:
+        >>> cache = ResultCache("~/.cache/vistool/results")
+        >>> clean = cache.memoize(clean_data)
+        >>> cleaned = clean(data, fill_with="mean")  # runs clean_data
+        >>> cleaned = clean(data, fill_with="mean")  # served from memory
+        >>> cache.stats()
+    """
+
+    def __init__(
+        self, 
+        cache_dir: str = None, 
+        max_memory_bytes: int = 512 * 1024 ** 2, 
+        max_disk_bytes: int = 2 * 1024 ** 3,
+        sample_blocks: int = 16,
+        block_rows: int = 1024
+    ):
+        self.cache_dir = None
+        if cache_dir is not None:
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise ImportError("ResultCache's Parquet tier requires the optional 'pyarrow' package.")
+            self.cache_dir = Path(cache_dir).expanduser()
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.sample_blocks = sample_blocks
+        self.block_rows = block_rows
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+    def memoize(self, func):
+        """
+        Wraps `func` so that repeated calls with the same inputs return the 
+        cached result. Can be used as a decorator.
+        """
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            if bound.arguments.get("inplace"):
+                return func(*args, **kwargs)
+            try:
+                key = self.key(func, bound.arguments)
+            except TypeError:
+                # An argument that cannot be fingerprinted reliably
+                return func(*args, **kwargs)
+            found, result = self.get(key)
+            if not found:
+                result = func(*args, **kwargs)
+                self.put(key, result)
+            return copy.deepcopy(result)
+
+        wrapper.cache = self
+        return wrapper
+
+    def key(self, func, arguments: dict) -> str:
+        """
+        Returns the cache key of a call of `func` with the named `arguments`.
+        """
+        digest = hashlib.sha256(f"{func.__module__}.{func.__qualname__}".encode())
+        digest.update(repr(self._normalize(arguments)).encode())
+        return digest.hexdigest()
+
+    def get(self, key: str):
+        """
+        Returns (True, result) for a cached key, or (False, None).
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return True, self._memory[key][0]
+            index = self._load_index()
+            entry = index.get(key)
+            if entry is None or not (self.cache_dir / f"{key}.parquet").exists():
+                self.misses += 1
+                return False, None
+            entry["last_access"] = time.time()
+            self._save_index(index)
+            self.disk_hits += 1
+        result = pd.read_parquet(self.cache_dir / f"{key}.parquet")
+        with self._lock:
+            self._remember(key, result)
+        return True, result
+
+    def put(self, key: str, result) -> None:
+        """
+        Stores `result` in memory and, for DataFrames, in the Parquet tier.
+        """
+        with self._lock:
+            self._remember(key, result)
+        if self.cache_dir is None or not isinstance(result, pd.DataFrame):
+            return
+
+        tmp_path = self.cache_dir / f"{key}.parquet.tmp"
+        try:
+            result.to_parquet(tmp_path)
+        except Exception as e:
+            tmp_path.unlink(missing_ok=True)
+            warnings.warn(f"Could not cache result as Parquet: {e}")
+            return
+        os.replace(tmp_path, self.cache_dir / f"{key}.parquet")
+        with self._lock:
+            index = self._load_index()
+            index[key] = {
+                "bytes": (self.cache_dir / f"{key}.parquet").stat().st_size,
+                "last_access": time.time(),
+            }
+            self._evict_disk(index)
+            self._save_index(index)
+
+    def stats(self) -> dict:
+        """
+        Returns the hit/miss counters and the size of both tiers.
+
+        Returns:
+            dict: Keys 'hits', 'memory_hits', 'disk_hits', 'misses', 
+            'memory_entries', 'memory_bytes', 'disk_entries' and 'disk_bytes'.
+        """
+        with self._lock:
+            index = self._load_index()
+            return {
+                "hits": self.memory_hits + self.disk_hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_entries": len(index),
+                "disk_bytes": sum(e["bytes"] for e in index.values()),
+            }
+
+    def clear(self) -> None:
+        """
+        Removes every cached result from memory and disk.
+        """
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            if self.cache_dir is not None:
+                for path in self.cache_dir.iterdir():
+                    if path.suffix in (".parquet", ".json"):
+                        path.unlink()
+
+    def _normalize(self, value):
+        """
+        Replaces frames by their fingerprints and containers by tuples, so 
+        the repr of the result identifies the arguments.
+        """
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            return ("frame", _fingerprint(value, self.sample_blocks, self.block_rows))
+        if isinstance(value, dict):
+            return ("dict", tuple(sorted(
+                ((repr(k), self._normalize(v)) for k, v in value.items())
+            )))
+        if isinstance(value, (list, tuple)):
+            return (type(value).__name__, tuple(self._normalize(v) for v in value))
+        if value is None or isinstance(value, (str, bytes, int, float, complex, np.generic)):
+            return value
+        if isinstance(value, Path):
+            return str(value)
+        if hasattr(value, "to_dict"):
+            # e.g. a fitted LabelEncoder
+            return (type(value).__name__, self._normalize(value.to_dict()))
+        raise TypeError(f"Cannot fingerprint an argument of type {type(value).__name__}.")
+
+    def _remember(self, key: str, result) -> None:
+        size = _result_bytes(result)
+        if key in self._memory:
+            self._memory_bytes -= self._memory.pop(key)[1]
+        if size > self.max_memory_bytes:
+            return
+        self._memory[key] = (result, size)
+        self._memory_bytes += size
+        while self._memory_bytes > self.max_memory_bytes:
+            _, (_, evicted) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted
+
+    def _load_index(self) -> dict:
+        if self.cache_dir is None:
+            return {}
+        index_path = self.cache_dir / "index.json"
+        if not index_path.exists():
+            return {}
+        with open(index_path) as f:
+            return json.load(f)
+
+    def _save_index(self, index: dict) -> None:
+        index_path = self.cache_dir / "index.json"
+        tmp_path = index_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, index_path)
+
+    def _evict_disk(self, index: dict) -> None:
+        total = sum(e["bytes"] for e in index.values())
+        for key in sorted(index, key=lambda k: index[k]["last_access"]):
+            if total <= self.max_disk_bytes:
+                break
+            total -= index.pop(key)["bytes"]
+            (self.cache_dir / f"{key}.parquet").unlink(missing_ok=True)
+
+
+def _fingerprint(obj, sample_blocks: int = 16, block_rows: int = 1024) -> str:
+    """
+    Hashes a DataFrame's or Series' shape, labels and dtypes, and the values 
+    of `sample_blocks` evenly spaced row blocks (all rows when None).
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(obj, pd.DataFrame):
+        schema = (obj.shape, list(obj.columns), [str(d) for d in obj.dtypes])
+    else:
+        schema = (obj.shape, obj.name, str(obj.dtype))
+    digest.update(repr((type(obj).__name__, schema, type(obj.index).__name__)).encode())
+
+    n_rows = len(obj)
+    if sample_blocks is None or n_rows <= sample_blocks * block_rows:
+        blocks = [obj]
+    else:
+        starts = np.linspace(0, n_rows - block_rows, sample_blocks).astype(int)
+        blocks = [obj.iloc[start:start + block_rows] for start in starts]
+    for block in blocks:
+        digest.update(pd.util.hash_pandas_object(block, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _result_bytes(result) -> int:
+    if isinstance(result, (pd.DataFrame, pd.Series)):
+        return int(np.sum(result.memory_usage(index=True)))
+    if isinstance(result, (list, tuple)):
+        return sum(_result_bytes(item) for item in result)
+    return sys.getsizeof(result)
+
+
 # INTERACTIVE FUNCTIONS - COULD CONTINUE TO DEVELOP
 # The below functions were if we had more time, to continue on developing our 
 # interactive dashboard. This could be developed upon further
-def clean_data_interactive(data: pd.DataFrame):
+class _PreviewPanel:
+    """
+    Preview area shared by the interactive functions.
+
+    Changes to the controls are debounced, then the operation runs on a 
+    fixed random sample of `sample_rows` rows and only one page of the 
+    result is rendered. Previews are cached by the controls' values, so 
+    returning to an earlier setting is instant. The operation only runs on 
+    the whole dataset when the apply button is clicked.
+    """
+
+    def __init__(
+        self, data, operation, controls: dict, apply_label: str, 
+        sample_rows: int = 10_000, page_size: int = 20, debounce: float = 0.3
+    ):
+        self.data = data
+        self.operation = operation
+        self.controls = controls
+        self.page_size = page_size
+        self.debounce = debounce
+        if len(data) > sample_rows:
+            self.sample = data.sample(n=sample_rows, random_state=0).sort_index()
+        else:
+            self.sample = data.copy(deep=False)
+        self.result, self.label = None, ""
+        self._timer = None
+        self._preview = functools.lru_cache(maxsize=32)(self._compute)
+
+        self.status = widgets.Label()
+        self.page = widgets.BoundedIntText(value=1, min=1, max=1, description='Page:')
+        self.output = widgets.Output()
+        self.apply_button = widgets.Button(description=apply_label)
+        for control in controls.values():
+            control.observe(self._schedule, names='value')
+        self.page.observe(lambda change: self._render(), names='value')
+        self.apply_button.on_click(self.apply)
+
+    def show(self):
+        display(*self.controls.values(), self.apply_button, self.status, self.page, self.output)
+        self.refresh()
+
+    def state(self) -> tuple:
+        return tuple((name, control.value) for name, control in self.controls.items())
+
+    def refresh(self):
+        """
+        Shows the preview for the current values of the controls.
+        """
+        try:
+            result = self._preview(self.state())
+        except Exception as e:
+            self.status.value = f"Preview unavailable: {e}"
+            return
+        self._set_result(result, f"Preview on {len(self.sample)} of {len(self.data)} rows")
+
+    def apply(self, b=None):
+        """
+        Runs the operation on the whole dataset and shows the result.
+        """
+        with contextlib.redirect_stdout(io.StringIO()) as messages:
+            result = self.operation(self.data, dict(self.state()))
+        message = messages.getvalue().strip().replace("\n", " ")
+        self._set_result(result, f"{message} Applied to all {len(self.data)} rows")
+        return result
+
+    def _schedule(self, change=None):
+        if self._timer is not None:
+            self._timer.cancel()
+        if self.debounce:
+            self._timer = threading.Timer(self.debounce, self.refresh)
+            self._timer.start()
+        else:
+            self.refresh()
+
+    def _compute(self, state: tuple):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return self.operation(self.sample, dict(state))
+
+    def _set_result(self, result, label):
+        self.result, self.label = result, label
+        self.page.max = max(1, -(-len(result) // self.page_size))
+        if self.page.value == 1:
+            self._render()
+        else:
+            self.page.value = 1  # renders through the observer
+
+    def _render(self):
+        if self.result is None:
+            return
+        start = (self.page.value - 1) * self.page_size
+        rows = self.result.iloc[start:start + self.page_size]
+        self.status.value = (
+            f"{self.label}: rows {min(start + 1, len(self.result))}-{start + len(rows)} "
+            f"of {len(self.result)}"
+        )
+        # append_display_data also works from the debounce timer thread
+        self.output.clear_output(wait=True)
+        self.output.append_display_data(rows)
+
+
+def clean_data_interactive(
+    data: pd.DataFrame, sample_rows: int = 10_000, page_size: int = 20, debounce: float = 0.3
+):
     """
     Interactive function for cleaning a DataFrame using widgets.
 
@@ -155,9 +2198,14 @@ def clean_data_interactive(data: pd.DataFrame):
     - Allows users to select columns to remove.
     - Offers the option to fill NaN values with mean or average.
     - Provides control over whether operations are applied to columns or rows.
+    - Previews each setting on a sample of rows, one page at a time; 
+      previews are cached, and the full dataset is only cleaned on "Apply".
 
     Parameters:
     - data (pd.DataFrame): The input dataset.
+    - sample_rows (int): Number of sampled rows the previews run on.
+    - page_size (int): Number of rows shown per page.
+    - debounce (float): Seconds to wait after a change before previewing.
 
     Example:
     ```python
@@ -167,6 +2215,7 @@ def clean_data_interactive(data: pd.DataFrame):
     - Choose columns to remove using the dropdown.
     - Select "mean" or "average" to fill NaN values.
     - Specify whether to apply cleaning to columns or rows.
+    - Click the "Apply Cleaning" button to clean the whole dataset.
     """
     remove_columns = widgets.SelectMultiple(
         options=data.columns.tolist(),
@@ -181,31 +2230,38 @@ def clean_data_interactive(data: pd.DataFrame):
         description='Apply To:',
     )
 
-    def apply_cleaning(b):
-        clear_output(wait=True)
-        updated_data = clean_data(
-            data,
-            remove_columns=list(remove_columns.value),
-            fill_with=fill_with.value if fill_with.value != 'None' else None,
-            apply_to=apply_to.value
+    def apply_cleaning(df, state):
+        return clean_data(
+            df,
+            remove_columns=list(state['remove_columns']),
+            fill_with=state['fill_with'] if state['fill_with'] != 'None' else None,
+            apply_to=state['apply_to']
         )
-        display(updated_data)
 
-    button = widgets.Button(description="Apply Cleaning")
-    button.on_click(apply_cleaning)
-    display(remove_columns, fill_with, apply_to, button)
+    _PreviewPanel(
+        data, apply_cleaning, 
+        {'remove_columns': remove_columns, 'fill_with': fill_with, 'apply_to': apply_to},
+        "Apply Cleaning", sample_rows, page_size, debounce
+    ).show()
 
 
 
-def filter_data_interactive(data: pd.DataFrame):
+def filter_data_interactive(
+    data: pd.DataFrame, sample_rows: int = 10_000, page_size: int = 20, debounce: float = 0.3
+):
     """
     Interactive function for filtering a DataFrame using widgets.
 
     Features:
     - Allows users to specify a condition to filter rows.
+    - Previews the condition on a sample of rows while typing, one page at 
+      a time; the full dataset is only filtered on "Apply".
 
     Parameters:
     - data (pd.DataFrame): The input dataset.
+    - sample_rows (int): Number of sampled rows the previews run on.
+    - page_size (int): Number of rows shown per page.
+    - debounce (float): Seconds to wait after a change before previewing.
 
     Example:
     ```python
@@ -213,32 +2269,39 @@ def filter_data_interactive(data: pd.DataFrame):
     ```
     Usage:
     - Enter a filter condition (e.g., "Age > 30").
-    - Click the "Apply Filter" button to view the filtered dataset.
+    - Click the "Apply Filter" button to filter the whole dataset.
     """
     condition = widgets.Text(
         placeholder='Enter condition (e.g., Age > 30)',
         description='Condition:',
     )
 
-    def apply_filter(b):
-        clear_output(wait=True)
-        updated_data = filter_data(data, condition.value)
-        display(updated_data)
+    def apply_filter(df, state):
+        if not state['condition'].strip():
+            return df
+        return filter_data(df, state['condition'])
 
-    button = widgets.Button(description="Apply Filter")
-    button.on_click(apply_filter)
-    display(condition, button)      
+    _PreviewPanel(
+        data, apply_filter, {'condition': condition}, 
+        "Apply Filter", sample_rows, page_size, debounce
+    ).show()
 
 
-def rename_columns_interactive(data: pd.DataFrame):
+def rename_columns_interactive(
+    data: pd.DataFrame, sample_rows: int = 10_000, page_size: int = 20, debounce: float = 0.3
+):
     """
     Interactive function for renaming columns in a DataFrame using widgets.
 
     Features:
     - Allows users to map old column names to new ones.
+    - Previews the mapping on a sample of rows, one page at a time.
 
     Parameters:
     - data (pd.DataFrame): The input dataset.
+    - sample_rows (int): Number of sampled rows the previews run on.
+    - page_size (int): Number of rows shown per page.
+    - debounce (float): Seconds to wait after a change before previewing.
 
     Example:
     ```python
@@ -253,26 +2316,33 @@ def rename_columns_interactive(data: pd.DataFrame):
         description='Mappings:',
     )
 
-    def apply_rename(b):
-        clear_output(wait=True)
-        mappings = dict(item.split(':') for item in column_mapping.value.split(','))
-        updated_data = rename_columns(data, mappings)
-        display(updated_data)
+    def apply_rename(df, state):
+        if not state['column_mapping'].strip():
+            return df
+        mappings = dict(item.split(':') for item in state['column_mapping'].split(','))
+        return rename_columns(df, mappings)
 
-    button = widgets.Button(description="Apply Rename")
-    button.on_click(apply_rename)
-    display(column_mapping, button)      
+    _PreviewPanel(
+        data, apply_rename, {'column_mapping': column_mapping}, 
+        "Apply Rename", sample_rows, page_size, debounce
+    ).show()
 
 
-def label_encode_interactive(data: pd.DataFrame):
+def label_encode_interactive(
+    data: pd.DataFrame, sample_rows: int = 10_000, page_size: int = 20, debounce: float = 0.3
+):
     """
     Interactive function for label encoding a column in a DataFrame using widgets.
 
     Features:
     - Allows users to select a column to encode as numeric labels.
+    - Previews the encoding on a sample of rows, one page at a time.
 
     Parameters:
     - data (pd.DataFrame): The input dataset.
+    - sample_rows (int): Number of sampled rows the previews run on.
+    - page_size (int): Number of rows shown per page.
+    - debounce (float): Seconds to wait after a change before previewing.
 
     Example:
     ```python
@@ -280,21 +2350,19 @@ def label_encode_interactive(data: pd.DataFrame):
     ```
     Usage:
     - Select a categorical column from the dropdown.
-    - Click the "Apply Encoding" button to view the encoded dataset.
+    - Click the "Apply Encoding" button to encode the column in the whole dataset.
     """
     column = widgets.Dropdown(
         options=data.columns.tolist(),
         description='Column:',
     )
 
-    def apply_encoding(b):
-        clear_output(wait=True)
-        updated_data = label_encode(data, column.value)
-        display(updated_data)
-
-    button = widgets.Button(description="Apply Encoding")
-    button.on_click(apply_encoding)
-    display(column, button)    
-
-
+    def apply_encoding(df, state):
+        if df is not data:
+            df = df.copy(deep=False)  # previews must not write into the sample
+        return label_encode(df, state['column'])
 
+    _PreviewPanel(
+        data, apply_encoding, {'column': column}, 
+        "Apply Encoding", sample_rows, page_size, debounce
+    ).show()